@@ -8,15 +8,41 @@ class Settings(BaseSettings):
     # Grocy Configuration
     grocy_url: str = "https://groceries.bironfamily.net"
     grocy_api_key: str = ""
+    grocy_max_connections: int = 20  # Pooled HTTP connections to Grocy
+    grocy_max_keepalive_connections: int = 10
+    grocy_keepalive_expiry: float = 30.0  # Seconds an idle connection is kept
+    grocy_http2: bool = False  # Requires the h2 package (pip install httpx[http2])
+    grocy_master_data_ttl: float = 60.0  # Seconds before cached products/locations/units are revalidated
+    grocy_stock_sync_interval: float = 15.0  # Seconds between checks for Grocy stock changes
+    grocy_write_concurrency: int = 4  # Max concurrent Grocy writes for batch endpoints
+    grocy_connect_timeout: float = 5.0  # Seconds to establish a Grocy connection
+    grocy_read_timeout: float = 10.0  # Seconds per Grocy GET attempt
+    grocy_write_timeout: float = 30.0  # Seconds per Grocy write
+    grocy_retry_attempts: int = 2  # Extra attempts for failed Grocy GETs
+    grocy_retry_backoff: float = 0.25  # Base seconds for jittered exponential backoff
+    grocy_breaker_failure_threshold: int = 5  # Consecutive failures before failing fast
+    grocy_breaker_reset_timeout: float = 30.0  # Seconds before retrying an unavailable Grocy
     
     # LLM Configuration
     llm_api_url: str = "https://openrouter.ai/api/v1"
     llm_api_key: str = ""
     llm_model: str = "google/gemini-2.0-flash-exp:free"
+    llm_max_connections: int = 10  # Pooled HTTP connections to the LLM API
+    llm_max_keepalive_connections: int = 5
+    llm_keepalive_expiry: float = 60.0  # Seconds an idle connection is kept
+    llm_request_timeout: float = 120.0  # Seconds per LLM API request
+    llm_full_catalog_limit: int = 200  # Larger product catalogs are pre-filtered for prompts
+    llm_candidates_per_line: int = 5  # Products offered to the LLM per input line (0 lists all)
+    llm_local_matching: bool = True  # Resolve lines that exactly name a product without the LLM
     
     # Application Settings
     max_recipe_history: int = 1000
+    max_recipe_age_days: int = 0  # 0 keeps recipes regardless of age
+    retention_interval_minutes: int = 60  # How often background retention runs
+    retention_batch_size: int = 200  # Recipes deleted per retention transaction
     database_path: str = "../data/recipes.db"
+    database_reader_pool_size: int = 4  # Pooled read-only SQLite connections
+    recipe_compression: bool = False  # Store new recipe bodies zlib-compressed
     recipe_export_path: str = "../data/recipes"
     unit_preference: str = "metric"  # "metric" or "imperial"
     
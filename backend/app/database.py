@@ -1,21 +1,220 @@
 import aiosqlite
+import asyncio
+import base64
+import binascii
+import hashlib
 import json
-from typing import List, Optional, Dict, Any
+import re
+import sqlite3
+import zlib
+from contextlib import asynccontextmanager, closing
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from .config import settings
+from .utils.recipe_compression import (
+    train_dictionary,
+    compress_recipe_text,
+    decompress_recipe_text
+)
+
+
+# Pragmas applied to every pooled connection
+CONNECTION_PRAGMAS = [
+    "PRAGMA synchronous = NORMAL",      # Safe with WAL, avoids an fsync per commit
+    "PRAGMA cache_size = -16000",       # ~16 MB page cache per connection
+    "PRAGMA mmap_size = 268435456",     # Memory-map up to 256 MB of the file
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA foreign_keys = ON",
+]
+
+# Plain recipe text whether the row is stored compressed or not; recipe_inflate
+# is registered on every pooled connection, so this is only for app queries,
+# never for triggers or views
+def recipe_text_sql(table: str) -> str:
+    return (
+        f"CASE WHEN {table}.recipe_blob IS NULL THEN {table}.recipe_text "
+        f"ELSE recipe_inflate({table}.recipe_blob) END"
+    )
+
+
+# Tokenizer of the recipes_fts index
+FTS_TOKENIZE = "porter unicode61 remove_diacritics 2"
+
+
+def fts_snippets(texts: Dict[int, str], fts_query: str) -> Dict[int, str]:
+    """
+    Highlighted search snippets for texts that are not in recipes_fts content
+    
+    Compressed recipes have an empty recipe_text, so snippet() can't read
+    them. Their decompressed text is matched in a scratch in-memory index
+    with the same tokenizer, giving the same snippets as snippet() would.
+    """
+    if not texts:
+        return {}
+    with closing(sqlite3.connect(":memory:")) as conn:
+        conn.execute(f"CREATE VIRTUAL TABLE scratch USING fts5(recipe_text, tokenize='{FTS_TOKENIZE}')")
+        conn.executemany("INSERT INTO scratch(rowid, recipe_text) VALUES (?, ?)", texts.items())
+        rows = conn.execute("""
+            SELECT rowid, snippet(scratch, 0, '<mark>', '</mark>', '…', 16)
+            FROM scratch WHERE scratch MATCH ?
+        """, (fts_query,))
+        return dict(rows.fetchall())
+
+
+# Columns needed to list recipes in history; excludes the full recipe body and
+# the inventory snapshot, which are only loaded by get_recipe()
+RECIPE_SUMMARY_COLUMNS = """
+    recipes.id, recipes.created_at, recipes.cuisine, recipes.time_minutes,
+    recipes.effort_level, recipes.dish_preference, recipes.calories_per_serving,
+    recipes.used_external_ingredients, recipes.prioritize_expiring,
+    recipes.active_profiles, recipes.llm_model,
+    substr(""" + recipe_text_sql("recipes") + """, 1, 300) AS recipe_preview
+"""
+
 
 class Database:
-    """SQLite database handler for Elzar"""
+    """
+    SQLite database handler for Elzar
+    
+    Holds one long-lived writer connection plus a small pool of reader
+    connections. The database runs in WAL mode so readers never block
+    behind the writer. Connections are opened by init_db() (called from the
+    app lifespan) or lazily on first use, and released by close().
     
-    def __init__(self, db_path: str):
+    With compress_recipes enabled, new recipe bodies are stored as
+    zlib blobs (recipe_blob) using the latest trained dictionary; reads
+    decompress them transparently.
+    """
+    
+    def __init__(
+        self,
+        db_path: str,
+        reader_pool_size: int = 4,
+        compress_recipes: bool = False
+    ):
         self.db_path = db_path
+        self.reader_pool_size = max(1, reader_pool_size)
+        self.compress_recipes = compress_recipes
+        self._dictionaries: Dict[int, bytes] = {}
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: Optional[asyncio.Queue] = None
+        self._reader_conns: List[aiosqlite.Connection] = []
+        self._write_lock = asyncio.Lock()
+        self._connect_lock = asyncio.Lock()
         # Ensure the directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     
+    async def _open_connection(self, read_only: bool = False) -> aiosqlite.Connection:
+        """Open a connection with the tuned pragmas applied"""
+        conn = await aiosqlite.connect(self.db_path)
+        conn.row_factory = aiosqlite.Row
+        await conn.create_function("recipe_inflate", 1, self._inflate, deterministic=True)
+        pragmas = CONNECTION_PRAGMAS + (["PRAGMA query_only = ON"] if read_only else [])
+        for pragma in pragmas:
+            # Close each cursor so no pragma statement keeps a lock open
+            async with conn.execute(pragma):
+                pass
+        return conn
+    
+    async def connect(self):
+        """Open the writer connection and the reader pool (idempotent)"""
+        if self._writer is not None:
+            return
+        
+        async with self._connect_lock:
+            if self._writer is not None:
+                return
+            
+            writer = await self._open_connection()
+            # WAL is persisted in the file, but set it on every start in case
+            # the database was created by an older version
+            async with writer.execute("PRAGMA journal_mode = WAL"):
+                pass
+            
+            readers: asyncio.Queue = asyncio.Queue()
+            for _ in range(self.reader_pool_size):
+                conn = await self._open_connection(read_only=True)
+                self._reader_conns.append(conn)
+                readers.put_nowait(conn)
+            
+            self._readers = readers
+            self._writer = writer
+    
+    async def close(self):
+        """Close all pooled connections"""
+        async with self._connect_lock:
+            for conn in self._reader_conns:
+                await conn.close()
+            self._reader_conns = []
+            self._readers = None
+            
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
+    
+    @asynccontextmanager
+    async def _read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a reader connection from the pool"""
+        await self.connect()
+        readers = self._readers
+        conn = await readers.get()
+        try:
+            yield conn
+        finally:
+            readers.put_nowait(conn)
+    
+    @asynccontextmanager
+    async def _write(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Use the writer connection; commits on success, rolls back on error"""
+        await self.connect()
+        async with self._write_lock:
+            try:
+                yield self._writer
+                await self._writer.commit()
+            except BaseException:
+                await self._writer.rollback()
+                raise
+    
+    def _inflate(self, blob: Optional[bytes]) -> Optional[str]:
+        """
+        SQL function recipe_inflate(): decompress a recipe_blob
+        
+        A blob may reference a dictionary trained by another process (the
+        compression CLI) after startup; the dictionaries are then re-read
+        once before giving up.
+        """
+        if blob is None:
+            return None
+        try:
+            return decompress_recipe_text(blob, self._dictionaries)
+        except KeyError:
+            self._reload_dictionaries()
+            return decompress_recipe_text(blob, self._dictionaries)
+    
+    def _reload_dictionaries(self):
+        """
+        Re-read compression dictionaries on a short-lived connection
+        
+        Synchronous because it also runs inside the recipe_inflate() SQL
+        function. WAL lets it read while the pooled writer holds a transaction.
+        """
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            rows = conn.execute("SELECT id, dictionary FROM compression_dictionaries")
+            self._dictionaries = dict(rows.fetchall())
+    
+    def _inflate_rows(self, rows: List[Dict[str, Any]]):
+        """Replace recipe_text with the decompressed body on compressed rows"""
+        for row in rows:
+            blob = row.pop("recipe_blob", None)
+            if blob is not None:
+                row["recipe_text"] = self._inflate(blob)
+    
     async def init_db(self):
         """Initialize database with required tables"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
             # Recipes table
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS recipes (
@@ -32,7 +231,9 @@ class Database:
                     active_profiles TEXT,
                     grocy_inventory_snapshot TEXT,
                     user_prompt TEXT,
-                    llm_model TEXT
+                    llm_model TEXT,
+                    inventory_snapshot_hash TEXT,
+                    recipe_blob BLOB
                 )
             """)
             
@@ -57,9 +258,12 @@ class Database:
             """)
             
             # Create indexes
+            # (created_at, id) serves both ordering and keyset pagination;
+            # it supersedes the old single-column created_at index
+            await db.execute("DROP INDEX IF EXISTS idx_recipes_created_at")
             await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_recipes_created_at 
-                ON recipes(created_at DESC)
+                CREATE INDEX IF NOT EXISTS idx_recipes_created_at_id 
+                ON recipes(created_at DESC, id DESC)
             """)
             await db.execute("""
                 CREATE INDEX IF NOT EXISTS idx_recipes_cuisine 
@@ -78,21 +282,539 @@ class Database:
                 ON dietary_profiles(name)
             """)
             
-            await db.commit()
+            # Optional compressed storage for recipe bodies
+            await self._migrate_recipe_compression(db)
+            
+            # Full-text search index over recipe bodies
+            await self._migrate_recipes_fts(db)
+            
+            # Recipe <-> dietary profile links
+            await self._migrate_recipe_profiles(db)
+            
+            # Trigger-maintained recipe counters
+            await self._migrate_recipe_counts(db)
+            
+            # Deduplicated, compressed inventory snapshots
+            await self._migrate_inventory_snapshots(db)
+            
+            # Local mirror of Grocy stock and products
+            await self._migrate_grocy_mirror(db)
+            
+            # Cached LLM ingredient extractions per recipe
+            await self._migrate_recipe_ingredient_cache(db)
+    
+    async def _table_exists(self, db: aiosqlite.Connection, name: str) -> bool:
+        """Check whether a table (or virtual table) exists"""
+        async with db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ) as cursor:
+            return await cursor.fetchone() is not None
+    
+    async def _migrate_recipes_fts(self, db: aiosqlite.Connection):
+        """
+        Create the FTS5 index for recipe_text and keep it in sync via triggers
+        
+        The index is an external-content table over recipes, so recipe
+        bodies are not stored a second time. Triggers keep it in sync for
+        rows stored as plain text and never need to decompress anything, so
+        plain sqlite3 clients can still write to recipes. Compressed rows
+        hold an empty recipe_text; they are indexed and unindexed from
+        Python (_index_recipe_text / _unindex_compressed), which has the
+        decompressed text. For the same reason the index must never be
+        rebuilt with FTS5's 'rebuild' command.
+        
+        The index is (re)built when it is first created or when an older
+        layout (over the recipes_plain view, or storing its own copy of the
+        text) is found.
+        """
+        async with db.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'recipes_fts'"
+        ) as cursor:
+            row = await cursor.fetchone()
+        
+        needs_backfill = row is None
+        if row is not None and "content='recipes'" not in row["sql"]:
+            await db.execute("DROP TABLE recipes_fts")
+            needs_backfill = True
+        await db.execute("DROP VIEW IF EXISTS recipes_plain")
+        
+        await db.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(
+                recipe_text,
+                content='recipes',
+                content_rowid='id',
+                tokenize='{FTS_TOKENIZE}'
+            )
+        """)
+        
+        # Triggers are recreated on every start so their definitions stay current
+        for trigger in ("recipes_fts_ai", "recipes_fts_ad", "recipes_fts_au"):
+            await db.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        await db.execute("""
+            CREATE TRIGGER recipes_fts_ai AFTER INSERT ON recipes
+            WHEN new.recipe_blob IS NULL BEGIN
+                INSERT INTO recipes_fts(rowid, recipe_text) VALUES (new.id, new.recipe_text);
+            END
+        """)
+        await db.execute("""
+            CREATE TRIGGER recipes_fts_ad AFTER DELETE ON recipes
+            WHEN old.recipe_blob IS NULL BEGIN
+                INSERT INTO recipes_fts(recipes_fts, rowid, recipe_text)
+                VALUES ('delete', old.id, old.recipe_text);
+            END
+        """)
+        await db.execute("""
+            CREATE TRIGGER recipes_fts_au
+            AFTER UPDATE OF recipe_text, recipe_blob ON recipes BEGIN
+                INSERT INTO recipes_fts(recipes_fts, rowid, recipe_text)
+                SELECT 'delete', old.id, old.recipe_text WHERE old.recipe_blob IS NULL;
+                INSERT INTO recipes_fts(rowid, recipe_text)
+                SELECT new.id, new.recipe_text WHERE new.recipe_blob IS NULL;
+            END
+        """)
+        
+        if needs_backfill:
+            await db.execute("""
+                INSERT INTO recipes_fts(rowid, recipe_text)
+                SELECT id, recipe_text FROM recipes WHERE recipe_blob IS NULL
+            """)
+            async with db.execute(
+                "SELECT id, recipe_blob FROM recipes WHERE recipe_blob IS NOT NULL"
+            ) as cursor:
+                compressed = await cursor.fetchall()
+            await db.executemany(
+                "INSERT INTO recipes_fts(rowid, recipe_text) VALUES (?, ?)",
+                [(row["id"], self._inflate(row["recipe_blob"])) for row in compressed]
+            )
+            await db.execute("INSERT INTO recipes_fts(recipes_fts) VALUES ('optimize')")
+            print("🔍 Built full-text search index for recipe history")
+    
+    async def _index_recipe_text(self, db: aiosqlite.Connection, recipe_id: int, text: str):
+        """Add a compressed recipe's plain text to the search index"""
+        await db.execute(
+            "INSERT INTO recipes_fts(rowid, recipe_text) VALUES (?, ?)", (recipe_id, text)
+        )
+    
+    async def _unindex_compressed(self, db: aiosqlite.Connection, recipe_ids: List[int]):
+        """
+        Remove compressed recipes from the search index before deleting them
+        
+        External-content deletes need the indexed text, which the delete
+        trigger can't decompress. Plain rows are left to the trigger.
+        """
+        if not recipe_ids:
+            return
+        placeholders = ", ".join("?" for _ in recipe_ids)
+        async with db.execute(f"""
+            SELECT id, recipe_blob FROM recipes
+            WHERE id IN ({placeholders}) AND recipe_blob IS NOT NULL
+        """, recipe_ids) as cursor:
+            rows = await cursor.fetchall()
+        await db.executemany(
+            "INSERT INTO recipes_fts(recipes_fts, rowid, recipe_text) VALUES ('delete', ?, ?)",
+            [(row["id"], self._inflate(row["recipe_blob"])) for row in rows]
+        )
+    
+    async def _migrate_recipe_compression(self, db: aiosqlite.Connection):
+        """
+        Prepare compressed recipe storage and load trained dictionaries
+        
+        Compressed rows keep an empty recipe_text and hold the body in
+        recipe_blob. Dictionaries are kept forever because existing blobs
+        reference them by ID.
+        """
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS compression_dictionaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dictionary BLOB NOT NULL,
+                sample_count INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        if not await self._column_exists(db, "recipes", "recipe_blob"):
+            await db.execute("ALTER TABLE recipes ADD COLUMN recipe_blob BLOB")
+        
+        await self._load_dictionaries(db)
+    
+    async def _load_dictionaries(self, db: aiosqlite.Connection):
+        """Load all compression dictionaries into memory"""
+        async with db.execute("SELECT id, dictionary FROM compression_dictionaries") as cursor:
+            self._dictionaries = {row["id"]: row["dictionary"] for row in await cursor.fetchall()}
+    
+    def _compress(self, text: str) -> bytes:
+        """Compress a recipe body with the newest dictionary, if any"""
+        if self._dictionaries:
+            dictionary_id = max(self._dictionaries)
+            return compress_recipe_text(text, dictionary_id, self._dictionaries[dictionary_id])
+        return compress_recipe_text(text)
+    
+    async def train_compression_dictionary(self, sample_size: int = 500) -> Optional[int]:
+        """
+        Train a new compression dictionary on the most recent recipes
+        
+        Returns the new dictionary ID, or None if there is too little
+        history to learn from. Later compressions use the new dictionary;
+        existing blobs keep using the one they were written with.
+        """
+        async with self._read() as db:
+            async with db.execute(f"""
+                SELECT {recipe_text_sql("recipes")} AS recipe_text FROM recipes
+                ORDER BY created_at DESC, id DESC LIMIT ?
+            """, (sample_size,)) as cursor:
+                samples = [row["recipe_text"] for row in await cursor.fetchall()]
+        
+        if len(samples) < 2:
+            return None
+        
+        dictionary = train_dictionary(samples)
+        if not dictionary:
+            return None
+        
+        async with self._write() as db:
+            cursor = await db.execute("""
+                INSERT INTO compression_dictionaries (dictionary, sample_count)
+                VALUES (?, ?)
+            """, (dictionary, len(samples)))
+            dictionary_id = cursor.lastrowid
+            await self._load_dictionaries(db)
+        return dictionary_id
+    
+    async def compress_recipe_texts(self, batch_size: int = 200) -> Dict[str, int]:
+        """
+        Compress every recipe body still stored as plain text
+        
+        Works in batches so the writer lock is never held for long. Returns
+        a dict with the number of rows compressed and the text size before
+        and after, in bytes.
+        """
+        stats = {"recipes": 0, "bytes_before": 0, "bytes_after": 0}
+        
+        while True:
+            async with self._write() as db:
+                async with db.execute("""
+                    SELECT id, recipe_text FROM recipes
+                    WHERE recipe_blob IS NULL
+                    LIMIT ?
+                """, (batch_size,)) as cursor:
+                    rows = await cursor.fetchall()
+                
+                for row in rows:
+                    blob = self._compress(row["recipe_text"])
+                    await db.execute(
+                        "UPDATE recipes SET recipe_text = '', recipe_blob = ? WHERE id = ?",
+                        (blob, row["id"])
+                    )
+                    # The update trigger only re-indexes plain rows
+                    await self._index_recipe_text(db, row["id"], row["recipe_text"])
+                    stats["recipes"] += 1
+                    stats["bytes_before"] += len(row["recipe_text"].encode("utf-8"))
+                    stats["bytes_after"] += len(blob)
+            
+            if len(rows) < batch_size:
+                break
+        
+        if stats["recipes"]:
+            # Merge the index segments left behind by the re-indexing
+            async with self._write() as db:
+                await db.execute("INSERT INTO recipes_fts(recipes_fts) VALUES ('optimize')")
+        return stats
+    
+    async def database_size(self) -> int:
+        """Size of the database file in bytes (page_count * page_size)"""
+        async with self._read() as db:
+            async with db.execute(
+                "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()"
+            ) as cursor:
+                return (await cursor.fetchone())[0]
+    
+    async def vacuum(self):
+        """Rebuild the database file so freed pages are returned to the OS"""
+        await self.connect()
+        async with self._write_lock:
+            await self._writer.execute("VACUUM")
+    
+    async def _column_exists(self, db: aiosqlite.Connection, table: str, column: str) -> bool:
+        """Check whether a table has a column"""
+        async with db.execute(f"PRAGMA table_info({table})") as cursor:
+            return any(row["name"] == column for row in await cursor.fetchall())
+    
+    async def _migrate_inventory_snapshots(self, db: aiosqlite.Connection):
+        """
+        Move Grocy inventory snapshots into the inventory_snapshots table
+        
+        Snapshots are stored once per content hash, zlib-compressed, and
+        recipes reference them through inventory_snapshot_hash. Snapshots
+        still held inline in recipes.grocy_inventory_snapshot are migrated
+        in batches and the inline copy is cleared.
+        """
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS inventory_snapshots (
+                hash TEXT PRIMARY KEY,
+                compressed_blob BLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        if not await self._column_exists(db, "recipes", "inventory_snapshot_hash"):
+            await db.execute("ALTER TABLE recipes ADD COLUMN inventory_snapshot_hash TEXT")
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_recipes_snapshot_hash
+            ON recipes(inventory_snapshot_hash)
+        """)
+        
+        migrated = 0
+        while True:
+            async with db.execute("""
+                SELECT id, grocy_inventory_snapshot FROM recipes
+                WHERE grocy_inventory_snapshot IS NOT NULL
+                LIMIT 200
+            """) as cursor:
+                rows = await cursor.fetchall()
+            if not rows:
+                break
+            
+            for row in rows:
+                try:
+                    snapshot = json.loads(row["grocy_inventory_snapshot"])
+                except json.JSONDecodeError:
+                    snapshot = {}
+                snapshot_hash = await self._store_snapshot(db, snapshot)
+                await db.execute("""
+                    UPDATE recipes
+                    SET inventory_snapshot_hash = ?, grocy_inventory_snapshot = NULL
+                    WHERE id = ?
+                """, (snapshot_hash, row["id"]))
+            migrated += len(rows)
+        
+        if migrated:
+            print(f"📦 Moved {migrated} inventory snapshots to deduplicated storage")
+    
+    async def _store_snapshot(self, db: aiosqlite.Connection, snapshot: Dict[str, Any]) -> str:
+        """Store an inventory snapshot once by content hash and return the hash"""
+        canonical = json.dumps(snapshot, sort_keys=True, separators=(",", ":"))
+        snapshot_hash = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        
+        async with db.execute(
+            "SELECT 1 FROM inventory_snapshots WHERE hash = ?", (snapshot_hash,)
+        ) as cursor:
+            exists = await cursor.fetchone() is not None
+        
+        if not exists:
+            await db.execute(
+                "INSERT INTO inventory_snapshots (hash, compressed_blob) VALUES (?, ?)",
+                (snapshot_hash, zlib.compress(canonical.encode("utf-8"), 6))
+            )
+        return snapshot_hash
+    
+    async def _attach_snapshots(self, db: aiosqlite.Connection, rows: List[Dict[str, Any]]):
+        """
+        Fill grocy_inventory_snapshot (as a JSON string) on full recipe rows
+        
+        Each distinct snapshot is loaded and decompressed once, however many
+        rows share it.
+        """
+        hashes = {row["inventory_snapshot_hash"] for row in rows if row.get("inventory_snapshot_hash")}
+        if not hashes:
+            return
+        
+        placeholders = ", ".join("?" for _ in hashes)
+        async with db.execute(
+            f"SELECT hash, compressed_blob FROM inventory_snapshots WHERE hash IN ({placeholders})",
+            list(hashes)
+        ) as cursor:
+            snapshots = {
+                row["hash"]: zlib.decompress(row["compressed_blob"]).decode("utf-8")
+                for row in await cursor.fetchall()
+            }
+        
+        for row in rows:
+            snapshot_hash = row.get("inventory_snapshot_hash")
+            if snapshot_hash:
+                row["grocy_inventory_snapshot"] = snapshots.get(snapshot_hash, "{}")
+    
+    async def _gc_snapshots(self, db: aiosqlite.Connection):
+        """Delete inventory snapshots no longer referenced by any recipe"""
+        await db.execute("""
+            DELETE FROM inventory_snapshots
+            WHERE NOT EXISTS (
+                SELECT 1 FROM recipes
+                WHERE recipes.inventory_snapshot_hash = inventory_snapshots.hash
+            )
+        """)
+    
+    async def _migrate_grocy_mirror(self, db: aiosqlite.Connection):
+        """
+        Create the tables that mirror Grocy stock and products locally
+        
+        Rows are keyed by Grocy source URL, kind ('stock' or 'products') and
+        Grocy ID so a sync only rewrites the rows that changed. The state
+        table records Grocy's db-changed-time the mirror was taken at and
+        holds the volatile (expiry) payload.
+        """
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS grocy_mirror_rows (
+                source TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                item_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (source, kind, item_id)
+            ) WITHOUT ROWID
+        """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS grocy_mirror_state (
+                source TEXT PRIMARY KEY,
+                changed_time TEXT,
+                volatile TEXT,
+                synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+    
+    async def _migrate_recipe_ingredient_cache(self, db: aiosqlite.Connection):
+        """
+        Create the table that caches structured ingredients per recipe
+        
+        Keyed by recipe, extraction mode, product catalog version and unit
+        preference. stock holds the Grocy stock amount of each matched
+        product at extraction time, so stock figures can be brought up to
+        date when an entry is reused.
+        """
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS recipe_ingredient_cache (
+                recipe_id INTEGER NOT NULL REFERENCES recipes(id) ON DELETE CASCADE,
+                mode TEXT NOT NULL,
+                catalog_version TEXT NOT NULL,
+                unit_preference TEXT NOT NULL,
+                ingredients TEXT NOT NULL,
+                stock TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (recipe_id, mode, catalog_version, unit_preference)
+            ) WITHOUT ROWID
+        """)
+    
+    async def _migrate_recipe_profiles(self, db: aiosqlite.Connection):
+        """
+        Create the recipe_profiles junction table
+        
+        Replaces filtering on the active_profiles JSON string. On first
+        creation it is backfilled from the JSON of existing recipes; names
+        that no longer match a dietary profile are not linked.
+        """
+        needs_backfill = not await self._table_exists(db, "recipe_profiles")
+        
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS recipe_profiles (
+                recipe_id INTEGER NOT NULL REFERENCES recipes(id) ON DELETE CASCADE,
+                profile_id INTEGER NOT NULL REFERENCES dietary_profiles(id) ON DELETE CASCADE,
+                PRIMARY KEY (recipe_id, profile_id)
+            ) WITHOUT ROWID
+        """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_recipe_profiles_profile
+            ON recipe_profiles(profile_id, recipe_id)
+        """)
+        
+        if needs_backfill:
+            await db.execute("""
+                INSERT OR IGNORE INTO recipe_profiles (recipe_id, profile_id)
+                SELECT recipes.id, dietary_profiles.id
+                FROM recipes, json_each(recipes.active_profiles)
+                JOIN dietary_profiles ON dietary_profiles.name = json_each.value
+                WHERE json_valid(recipes.active_profiles)
+            """)
+    
+    async def _migrate_recipe_counts(self, db: aiosqlite.Connection):
+        """
+        Create the recipe_counts table and the triggers that maintain it
+        
+        Holds the total number of recipes (dimension 'total') and counts per
+        cuisine and per effort level, so unfiltered counts never touch the
+        recipes table. NULL cuisine/effort values are counted under ''.
+        Populated from existing rows the first time it is created.
+        """
+        needs_backfill = not await self._table_exists(db, "recipe_counts")
+        
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS recipe_counts (
+                dimension TEXT NOT NULL,
+                value TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (dimension, value)
+            ) WITHOUT ROWID
+        """)
+        await db.execute("""
+            CREATE TRIGGER IF NOT EXISTS recipe_counts_ai AFTER INSERT ON recipes BEGIN
+                INSERT INTO recipe_counts (dimension, value, count)
+                VALUES ('total', '', 1),
+                       ('cuisine', COALESCE(new.cuisine, ''), 1),
+                       ('effort_level', COALESCE(new.effort_level, ''), 1)
+                ON CONFLICT (dimension, value) DO UPDATE SET count = count + 1;
+            END
+        """)
+        await db.execute("""
+            CREATE TRIGGER IF NOT EXISTS recipe_counts_ad AFTER DELETE ON recipes BEGIN
+                UPDATE recipe_counts SET count = count - 1
+                WHERE (dimension = 'total' AND value = '')
+                   OR (dimension = 'cuisine' AND value = COALESCE(old.cuisine, ''))
+                   OR (dimension = 'effort_level' AND value = COALESCE(old.effort_level, ''));
+            END
+        """)
+        await db.execute("""
+            CREATE TRIGGER IF NOT EXISTS recipe_counts_au
+            AFTER UPDATE OF cuisine, effort_level ON recipes BEGIN
+                UPDATE recipe_counts SET count = count - 1
+                WHERE (dimension = 'cuisine' AND value = COALESCE(old.cuisine, ''))
+                   OR (dimension = 'effort_level' AND value = COALESCE(old.effort_level, ''));
+                INSERT INTO recipe_counts (dimension, value, count)
+                VALUES ('cuisine', COALESCE(new.cuisine, ''), 1),
+                       ('effort_level', COALESCE(new.effort_level, ''), 1)
+                ON CONFLICT (dimension, value) DO UPDATE SET count = count + 1;
+            END
+        """)
+        
+        if needs_backfill:
+            await db.execute("""
+                INSERT INTO recipe_counts (dimension, value, count)
+                SELECT 'total', '', COUNT(*) FROM recipes
+                UNION ALL
+                SELECT 'cuisine', COALESCE(cuisine, ''), COUNT(*) FROM recipes
+                GROUP BY COALESCE(cuisine, '')
+                UNION ALL
+                SELECT 'effort_level', COALESCE(effort_level, ''), COUNT(*) FROM recipes
+                GROUP BY COALESCE(effort_level, '')
+            """)
+    
+    @staticmethod
+    def _build_fts_query(search_text: str) -> Optional[str]:
+        """
+        Turn free user text into a safe FTS5 MATCH expression
+        
+        Each word is quoted (so FTS operators in user input are inert) and
+        prefix-matched, and all words must appear (implicit AND). Words
+        without a letter or digit are dropped since the tokenizer ignores
+        them; returns None when nothing searchable is left.
+        """
+        terms = [t.replace('"', '""') for t in search_text.split() if re.search(r"[^\W_]", t)]
+        if not terms:
+            return None
+        return " ".join(f'"{t}"*' for t in terms)
     
     # Recipe operations
     async def create_recipe(self, recipe_data: Dict[str, Any]) -> int:
         """Insert a new recipe and return its ID"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
+            snapshot_hash = await self._store_snapshot(
+                db, recipe_data.get("grocy_inventory_snapshot", {})
+            )
+            
             cursor = await db.execute("""
                 INSERT INTO recipes (
                     recipe_text, cuisine, time_minutes, effort_level,
                     dish_preference, calories_per_serving, used_external_ingredients,
-                    prioritize_expiring, active_profiles, grocy_inventory_snapshot,
-                    user_prompt, llm_model
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    prioritize_expiring, active_profiles, inventory_snapshot_hash,
+                    user_prompt, llm_model, recipe_blob
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
-                recipe_data.get("recipe_text"),
+                "" if self.compress_recipes else recipe_data.get("recipe_text"),
                 recipe_data.get("cuisine"),
                 recipe_data.get("time_minutes"),
                 recipe_data.get("effort_level"),
@@ -101,32 +823,75 @@ class Database:
                 recipe_data.get("used_external_ingredients"),
                 recipe_data.get("prioritize_expiring"),
                 json.dumps(recipe_data.get("active_profiles", [])),
-                json.dumps(recipe_data.get("grocy_inventory_snapshot", {})),
+                snapshot_hash,
                 recipe_data.get("user_prompt"),
-                recipe_data.get("llm_model")
+                recipe_data.get("llm_model"),
+                self._compress(recipe_data.get("recipe_text") or "") if self.compress_recipes else None
             ))
-            await db.commit()
-            return cursor.lastrowid
+            recipe_id = cursor.lastrowid
+            
+            if self.compress_recipes:
+                # The insert trigger only indexes plain rows
+                await self._index_recipe_text(db, recipe_id, recipe_data.get("recipe_text") or "")
+            
+            await db.execute("""
+                INSERT OR IGNORE INTO recipe_profiles (recipe_id, profile_id)
+                SELECT ?, dietary_profiles.id
+                FROM dietary_profiles
+                JOIN json_each(?) ON json_each.value = dietary_profiles.name
+            """, (recipe_id, json.dumps(recipe_data.get("active_profiles", []))))
+            
+            return recipe_id
     
     async def get_recipe(self, recipe_id: int) -> Optional[Dict[str, Any]]:
-        """Get a recipe by ID"""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(
+        """Get a recipe by ID, including its inventory snapshot"""
+        async with self._read() as db:
+            async with db.execute(
                 "SELECT * FROM recipes WHERE id = ?", (recipe_id,)
-            )
-            row = await cursor.fetchone()
-            return dict(row) if row else None
+            ) as cursor:
+                row = await cursor.fetchone()
+            if not row:
+                return None
+            
+            recipe = dict(row)
+            self._inflate_rows([recipe])
+            await self._attach_snapshots(db, [recipe])
+            return recipe
     
-    async def get_recipes(
-        self, 
-        limit: int = 50, 
-        offset: int = 0,
-        filters: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
-        """Get recipes with optional filtering"""
-        query = "SELECT * FROM recipes WHERE 1=1"
-        params = []
+    def _build_recipe_query(
+        self,
+        filters: Optional[Dict[str, Any]],
+        columns: str = "recipes.*",
+        with_snippet: bool = True
+    ) -> Tuple[str, List[Any], bool]:
+        """
+        Build the SELECT ... WHERE part of a history query from filters
+        
+        Returns (query, params, uses_fts). When uses_fts is True the query
+        joins recipes_fts and, if with_snippet is set, also selects a
+        search_snippet column.
+        """
+        fts_query = None
+        if filters and filters.get("search_text"):
+            fts_query = self._build_fts_query(filters["search_text"])
+        
+        if fts_query is not None:
+            if with_snippet:
+                # Compressed rows get theirs from _fill_snippets()
+                columns += """,
+                CASE WHEN recipes.recipe_blob IS NULL
+                    THEN snippet(recipes_fts, 0, '<mark>', '</mark>', '…', 16)
+                END AS search_snippet"""
+            query = f"""
+                SELECT {columns}
+                FROM recipes_fts
+                JOIN recipes ON recipes.id = recipes_fts.rowid
+                WHERE recipes_fts MATCH ?
+            """
+            params = [fts_query]
+        else:
+            query = f"SELECT {columns} FROM recipes WHERE 1=1"
+            params = []
         
         if filters:
             if filters.get("cuisine"):
@@ -148,67 +913,322 @@ class Database:
                 query += " AND calories_per_serving <= ?"
                 params.append(filters["max_calories"])
             if filters.get("profile_name"):
-                query += " AND active_profiles LIKE ?"
-                params.append(f'%"{filters["profile_name"]}"%')
-            if filters.get("search_text"):
-                query += " AND recipe_text LIKE ?"
-                params.append(f'%{filters["search_text"]}%')
+                profile_names = filters["profile_name"]
+                if isinstance(profile_names, str):
+                    profile_names = [profile_names]
+                profile_names = list(dict.fromkeys(profile_names))
+                placeholders = ", ".join("?" for _ in profile_names)
+                
+                query += f"""
+                    AND recipes.id IN (
+                        SELECT recipe_profiles.recipe_id
+                        FROM dietary_profiles
+                        JOIN recipe_profiles ON recipe_profiles.profile_id = dietary_profiles.id
+                        WHERE dietary_profiles.name IN ({placeholders})
+                """
+                params.extend(profile_names)
+                if filters.get("profile_match") == "all":
+                    query += " GROUP BY recipe_profiles.recipe_id HAVING COUNT(*) = ?"
+                    params.append(len(profile_names))
+                query += ")"
+        
+        return query, params, fts_query is not None
+    
+    async def _fill_snippets(
+        self,
+        db: aiosqlite.Connection,
+        rows: List[Dict[str, Any]],
+        fts_query: str
+    ):
+        """Add the search_snippet of compressed rows, which snippet() can't read"""
+        missing = [row["id"] for row in rows if row.get("search_snippet") is None]
+        if not missing:
+            return
+        placeholders = ", ".join("?" for _ in missing)
+        async with db.execute(f"""
+            SELECT id, recipe_blob FROM recipes
+            WHERE id IN ({placeholders}) AND recipe_blob IS NOT NULL
+        """, missing) as cursor:
+            texts = {row["id"]: self._inflate(row["recipe_blob"]) for row in await cursor.fetchall()}
+        snippets = fts_snippets(texts, fts_query)
+        for row in rows:
+            if row.get("search_snippet") is None:
+                row["search_snippet"] = snippets.get(row["id"])
+    
+    @staticmethod
+    def encode_cursor(created_at: str, recipe_id: int) -> str:
+        """Encode a (created_at, id) position as an opaque pagination cursor"""
+        raw = json.dumps([created_at, recipe_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int]:
+        """Decode a pagination cursor; raises ValueError if it is malformed"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, recipe_id = json.loads(base64.urlsafe_b64decode(padded))
+            if not isinstance(created_at, str) or not isinstance(recipe_id, int):
+                raise ValueError
+            return created_at, recipe_id
+        except (ValueError, TypeError, binascii.Error):
+            raise ValueError("Invalid pagination cursor")
+    
+    async def get_recipes(
+        self, 
+        limit: int = 50, 
+        offset: int = 0,
+        filters: Optional[Dict[str, Any]] = None,
+        summary: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Get recipes with optional filtering
+        
+        With summary=True only the listing columns are selected, plus a
+        recipe_preview holding the first 300 characters of the recipe text;
+        recipe_text and grocy_inventory_snapshot are not loaded.
+        
+        When filters contain search_text, results come from the FTS5 index,
+        are ordered by BM25 relevance and carry a highlighted search_snippet.
         
-        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        profile_name may be a single name or a list of names; profile_match
+        selects whether a recipe needs "any" (default) or "all" of them.
+        """
+        columns = RECIPE_SUMMARY_COLUMNS if summary else "recipes.*"
+        query, params, uses_fts = self._build_recipe_query(filters, columns)
+        
+        if uses_fts:
+            query += " ORDER BY bm25(recipes_fts), recipes.created_at DESC, recipes.id DESC"
+        else:
+            query += " ORDER BY recipes.created_at DESC, recipes.id DESC"
+        query += " LIMIT ? OFFSET ?"
         params.extend([limit, offset])
         
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._read() as db:
             cursor = await db.execute(query, params)
+            rows = [dict(row) for row in await cursor.fetchall()]
+            if uses_fts:
+                await self._fill_snippets(db, rows, params[0])
+            if not summary:
+                self._inflate_rows(rows)
+                await self._attach_snapshots(db, rows)
+            return rows
+    
+    async def get_recipes_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        summary: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get one page of recipes using keyset pagination
+        
+        Pages are ordered newest first by (created_at, id) and served from
+        the composite index, so every page costs the same no matter how deep
+        it is, and newly generated recipes never shift rows between pages.
+        Search results are also returned newest first in this mode.
+        summary selects the listing columns only, as in get_recipes().
+        
+        Returns a dict with:
+        - recipes: the rows on this page
+        - next_cursor: cursor for the following page, or None at the end
+        """
+        columns = RECIPE_SUMMARY_COLUMNS if summary else "recipes.*"
+        query, params, uses_fts = self._build_recipe_query(filters, columns)
+        
+        if cursor:
+            created_at, recipe_id = self.decode_cursor(cursor)
+            query += " AND (recipes.created_at, recipes.id) < (?, ?)"
+            params.extend([created_at, recipe_id])
+        
+        # Fetch one extra row to know whether another page exists
+        query += " ORDER BY recipes.created_at DESC, recipes.id DESC LIMIT ?"
+        params.append(limit + 1)
+        
+        async with self._read() as db:
+            db_cursor = await db.execute(query, params)
+            rows = [dict(row) for row in await db_cursor.fetchall()]
+            if uses_fts:
+                await self._fill_snippets(db, rows, params[0])
+            if not summary:
+                self._inflate_rows(rows)
+                await self._attach_snapshots(db, rows)
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = self.encode_cursor(last["created_at"], last["id"])
+        
+        return {"recipes": rows, "next_cursor": next_cursor}
+    
+    async def count_recipes(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Count recipes matching the same filters as get_recipes
+        
+        Unfiltered counts and counts filtered only by cuisine or only by
+        effort level are read from the recipe_counts table; anything else
+        runs a SELECT COUNT(*) without loading any rows.
+        """
+        active = {k: v for k, v in (filters or {}).items() if v and k != "profile_match"}
+        
+        counter_key = None
+        if not active:
+            counter_key = ("total", "")
+        elif len(active) == 1 and "cuisine" in active:
+            counter_key = ("cuisine", active["cuisine"])
+        elif len(active) == 1 and "effort_level" in active:
+            counter_key = ("effort_level", active["effort_level"])
+        
+        async with self._read() as db:
+            if counter_key:
+                async with db.execute(
+                    "SELECT count FROM recipe_counts WHERE dimension = ? AND value = ?",
+                    counter_key
+                ) as cursor:
+                    row = await cursor.fetchone()
+                return row[0] if row else 0
+            
+            query, params, _ = self._build_recipe_query(
+                filters, columns="recipes.id", with_snippet=False
+            )
+            async with db.execute(f"SELECT COUNT(*) FROM ({query})", params) as cursor:
+                row = await cursor.fetchone()
+            return row[0]
+    
+    async def get_recipe_counts(self) -> Dict[str, Any]:
+        """
+        Get the maintained recipe counters
+        
+        Returns a dict with:
+        - total: number of recipes
+        - by_cuisine: {cuisine: count}
+        - by_effort_level: {effort_level: count}
+        Recipes without a cuisine/effort level are counted under "".
+        """
+        async with self._read() as db:
+            cursor = await db.execute(
+                "SELECT dimension, value, count FROM recipe_counts WHERE count > 0"
+            )
             rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+        
+        counts = {"total": 0, "by_cuisine": {}, "by_effort_level": {}}
+        for row in rows:
+            if row["dimension"] == "total":
+                counts["total"] = row["count"]
+            elif row["dimension"] == "cuisine":
+                counts["by_cuisine"][row["value"]] = row["count"]
+            elif row["dimension"] == "effort_level":
+                counts["by_effort_level"][row["value"]] = row["count"]
+        return counts
     
     async def delete_recipe(self, recipe_id: int) -> bool:
         """Delete a recipe by ID"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
+            await self._unindex_compressed(db, [recipe_id])
             cursor = await db.execute(
                 "DELETE FROM recipes WHERE id = ?", (recipe_id,)
             )
-            await db.commit()
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+            if deleted:
+                await self._gc_snapshots(db)
+            return deleted
     
-    async def cleanup_old_recipes(self, max_count: int):
-        """Keep only the most recent N recipes"""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                DELETE FROM recipes WHERE id NOT IN (
-                    SELECT id FROM recipes 
-                    ORDER BY created_at DESC 
-                    LIMIT ?
+    async def cleanup_old_recipes(
+        self,
+        max_count: Optional[int] = None,
+        max_age_days: Optional[int] = None,
+        batch_size: int = 200
+    ) -> int:
+        """
+        Apply the retention policy and return how many recipes were deleted
+        
+        Keeps at most max_count recipes (newest first) and removes recipes
+        older than max_age_days; either policy is skipped when None or 0.
+        Deletes run in batches of batch_size, each in its own short write
+        transaction, so other writers are never blocked for long. Orphaned
+        inventory snapshots are dropped at the end.
+        """
+        deleted = 0
+        
+        if max_age_days:
+            async with self._read() as db:
+                async with db.execute(
+                    "SELECT datetime('now', ?)", (f"-{int(max_age_days)} days",)
+                ) as cursor:
+                    cutoff = (await cursor.fetchone())[0]
+            deleted += await self._delete_in_batches(
+                "recipes.created_at < ?", [cutoff], batch_size
+            )
+        
+        if max_count:
+            # The (created_at, id) of the oldest recipe that is kept
+            async with self._read() as db:
+                async with db.execute("""
+                    SELECT created_at, id FROM recipes
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT 1 OFFSET ?
+                """, (max_count - 1,)) as cursor:
+                    boundary = await cursor.fetchone()
+            if boundary:
+                deleted += await self._delete_in_batches(
+                    "(recipes.created_at, recipes.id) < (?, ?)",
+                    [boundary["created_at"], boundary["id"]],
+                    batch_size
                 )
-            """, (max_count,))
-            await db.commit()
+        
+        if deleted:
+            async with self._write() as db:
+                await self._gc_snapshots(db)
+        return deleted
+    
+    async def _delete_in_batches(self, condition: str, params: List[Any], batch_size: int) -> int:
+        """Delete recipes matching condition, oldest first, batch_size at a time"""
+        deleted = 0
+        while True:
+            async with self._write() as db:
+                async with db.execute(f"""
+                    SELECT id FROM recipes
+                    WHERE {condition}
+                    ORDER BY created_at, id
+                    LIMIT ?
+                """, params + [batch_size]) as cursor:
+                    recipe_ids = [row["id"] for row in await cursor.fetchall()]
+                await self._unindex_compressed(db, recipe_ids)
+                placeholders = ", ".join("?" for _ in recipe_ids)
+                if recipe_ids:
+                    await db.execute(
+                        f"DELETE FROM recipes WHERE id IN ({placeholders})", recipe_ids
+                    )
+                batch = len(recipe_ids)
+            deleted += batch
+            if batch < batch_size:
+                return deleted
+            # Let queued readers and writers run between batches
+            await asyncio.sleep(0)
     
     # Dietary profile operations
     async def create_profile(self, name: str, dietary_restrictions: str) -> int:
         """Create a new dietary profile"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
             cursor = await db.execute("""
                 INSERT INTO dietary_profiles (name, dietary_restrictions)
                 VALUES (?, ?)
             """, (name, dietary_restrictions))
-            await db.commit()
             return cursor.lastrowid
     
     async def get_profile(self, profile_id: int) -> Optional[Dict[str, Any]]:
         """Get a profile by ID"""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(
+        async with self._read() as db:
+            async with db.execute(
                 "SELECT * FROM dietary_profiles WHERE id = ?", (profile_id,)
-            )
-            row = await cursor.fetchone()
+            ) as cursor:
+                row = await cursor.fetchone()
             return dict(row) if row else None
     
     async def get_all_profiles(self) -> List[Dict[str, Any]]:
         """Get all dietary profiles"""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._read() as db:
             cursor = await db.execute(
                 "SELECT * FROM dietary_profiles ORDER BY name"
             )
@@ -238,51 +1258,171 @@ class Database:
         updates.append("updated_at = CURRENT_TIMESTAMP")
         params.append(profile_id)
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
             cursor = await db.execute(
                 f"UPDATE dietary_profiles SET {', '.join(updates)} WHERE id = ?",
                 params
             )
-            await db.commit()
             return cursor.rowcount > 0
     
     async def delete_profile(self, profile_id: int) -> bool:
         """Delete a dietary profile"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
             cursor = await db.execute(
                 "DELETE FROM dietary_profiles WHERE id = ?", (profile_id,)
             )
-            await db.commit()
             return cursor.rowcount > 0
     
+    # Grocy mirror operations
+    async def get_grocy_mirror(self, source: str) -> Optional[Dict[str, Any]]:
+        """Load the mirrored Grocy stock, products and expiry data for a source"""
+        async with self._read() as db:
+            async with db.execute(
+                "SELECT changed_time, volatile FROM grocy_mirror_state WHERE source = ?",
+                (source,)
+            ) as cursor:
+                state = await cursor.fetchone()
+            if not state:
+                return None
+            
+            mirror = {
+                "changed_time": state["changed_time"],
+                "volatile": json.loads(state["volatile"]) if state["volatile"] else [],
+                "stock": [],
+                "products": []
+            }
+            async with db.execute("""
+                SELECT kind, data FROM grocy_mirror_rows
+                WHERE source = ?
+                ORDER BY kind, position
+            """, (source,)) as cursor:
+                async for row in cursor:
+                    mirror[row["kind"]].append(json.loads(row["data"]))
+            return mirror
+    
+    async def save_grocy_mirror(
+        self,
+        source: str,
+        changed_time: Optional[str],
+        stock: List[Dict[str, Any]],
+        products: List[Dict[str, Any]],
+        volatile: Any
+    ) -> int:
+        """
+        Update the local Grocy mirror and return how many rows changed
+        
+        Unchanged rows are left alone; only new, modified and removed
+        items are written.
+        """
+        async with self._write() as db:
+            changes_before = db.total_changes
+            for kind, items, id_key in (
+                ("stock", stock, "product_id"),
+                ("products", products, "id")
+            ):
+                rows = [
+                    (source, kind, item[id_key], position, json.dumps(item, sort_keys=True))
+                    for position, item in enumerate(items)
+                    if item.get(id_key) is not None
+                ]
+                await db.executemany("""
+                    INSERT INTO grocy_mirror_rows (source, kind, item_id, position, data)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(source, kind, item_id) DO UPDATE
+                    SET position = excluded.position, data = excluded.data
+                    WHERE position != excluded.position OR data != excluded.data
+                """, rows)
+                await db.execute("""
+                    DELETE FROM grocy_mirror_rows
+                    WHERE source = ? AND kind = ?
+                    AND item_id NOT IN (SELECT value FROM json_each(?))
+                """, (source, kind, json.dumps([row[2] for row in rows])))
+            changed = db.total_changes - changes_before
+            
+            await db.execute("""
+                INSERT OR REPLACE INTO grocy_mirror_state (source, changed_time, volatile, synced_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            """, (source, changed_time, json.dumps(volatile)))
+            return changed
+    
+    # Recipe ingredient cache operations
+    async def get_recipe_ingredients(
+        self,
+        recipe_id: int,
+        mode: str,
+        catalog_version: str,
+        unit_preference: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get a cached ingredient extraction ({"ingredients", "stock"}), if any"""
+        async with self._read() as db:
+            async with db.execute("""
+                SELECT ingredients, stock FROM recipe_ingredient_cache
+                WHERE recipe_id = ? AND mode = ? AND catalog_version = ? AND unit_preference = ?
+            """, (recipe_id, mode, catalog_version, unit_preference)) as cursor:
+                row = await cursor.fetchone()
+        if not row:
+            return None
+        return {"ingredients": json.loads(row["ingredients"]), "stock": json.loads(row["stock"])}
+    
+    async def save_recipe_ingredients(
+        self,
+        recipe_id: int,
+        mode: str,
+        catalog_version: str,
+        unit_preference: str,
+        ingredients: List[Dict[str, Any]],
+        stock: Dict[str, float]
+    ):
+        """
+        Cache an ingredient extraction
+        
+        Entries for other catalog versions are dropped, since products were
+        added, renamed or removed since they were extracted.
+        """
+        async with self._write() as db:
+            await db.execute(
+                "DELETE FROM recipe_ingredient_cache WHERE catalog_version != ?",
+                (catalog_version,)
+            )
+            await db.execute("""
+                INSERT OR REPLACE INTO recipe_ingredient_cache
+                (recipe_id, mode, catalog_version, unit_preference, ingredients, stock)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                recipe_id, mode, catalog_version, unit_preference,
+                json.dumps(ingredients), json.dumps(stock)
+            ))
+    
     # Settings operations
     async def get_setting(self, key: str) -> Optional[str]:
         """Get a setting value"""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
+        async with self._read() as db:
+            async with db.execute(
                 "SELECT value FROM settings WHERE key = ?", (key,)
-            )
-            row = await cursor.fetchone()
+            ) as cursor:
+                row = await cursor.fetchone()
             return row[0] if row else None
     
     async def set_setting(self, key: str, value: str):
         """Set a setting value"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
             await db.execute("""
                 INSERT OR REPLACE INTO settings (key, value, updated_at)
                 VALUES (?, ?, CURRENT_TIMESTAMP)
             """, (key, value))
-            await db.commit()
     
     async def get_all_settings(self) -> Dict[str, str]:
         """Get all settings"""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._read() as db:
             cursor = await db.execute("SELECT * FROM settings")
             rows = await cursor.fetchall()
             return {row["key"]: row["value"] for row in rows}
 
 
 # Global database instance
-db = Database("../data/recipes.db")
+db = Database(
+    "../data/recipes.db",
+    reader_pool_size=settings.database_reader_pool_size,
+    compress_recipes=settings.recipe_compression
+)
 
@@ -1,8 +1,13 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import math
 
 from .database import db
+from .services.retention import retention
+from .services.grocy_client import grocy_pool, breaker_states, GrocyUnavailableError
+from .services.llm_client import llm_pool
 from .routers import recipes, history, profiles, settings, inventory
 
 
@@ -11,11 +16,16 @@ async def lifespan(app: FastAPI):
     """Handle startup and shutdown events"""
     # Startup
     await db.init_db()
+    retention.start()
     print("🌶️  Elzar backend started! BAM!")
     print(f"📊 Database initialized at: {db.db_path}")
     yield
     # Shutdown
     print("👋 Elzar backend shutting down...")
+    await retention.stop()
+    await grocy_pool.close()
+    await llm_pool.close()
+    await db.close()
 
 
 app = FastAPI(
@@ -42,6 +52,16 @@ app.include_router(settings.router)
 app.include_router(inventory.router)
 
 
+@app.exception_handler(GrocyUnavailableError)
+async def grocy_unavailable_handler(request: Request, exc: GrocyUnavailableError):
+    """Report Grocy failing fast as 503 rather than a generic 500"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -55,8 +75,15 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "message": "BAM! Everything's cooking! 🌶️"}
+    """Health check endpoint, including the Grocy circuit breaker state"""
+    grocy = breaker_states()
+    if any(breaker["state"] != "closed" for breaker in grocy.values()):
+        return {
+            "status": "degraded",
+            "message": "Grocy is unreachable, failing fast until it recovers",
+            "grocy": grocy
+        }
+    return {"status": "healthy", "message": "BAM! Everything's cooking! 🌶️", "grocy": grocy}
 
 
 if __name__ == "__main__":
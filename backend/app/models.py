@@ -37,6 +37,29 @@ class RecipeResponse(BaseModel):
     llm_model: Optional[str] = None
 
 
+class RecipeSummary(BaseModel):
+    """Lightweight recipe row for history listings (no full recipe body)"""
+    id: int
+    recipe_preview: str  # First 300 characters of the recipe text
+    cuisine: Optional[str] = None
+    time_minutes: Optional[int] = None
+    effort_level: Optional[str] = None
+    dish_preference: Optional[str] = None
+    calories_per_serving: Optional[int] = None
+    used_external_ingredients: bool
+    prioritize_expiring: bool
+    active_profiles: Optional[str] = None  # JSON string
+    created_at: datetime
+    llm_model: Optional[str] = None
+    search_snippet: Optional[str] = None  # Highlighted match when searching history
+
+
+class RecipeHistoryPage(BaseModel):
+    """One page of recipe history with a cursor for the next page"""
+    recipes: List[RecipeSummary]
+    next_cursor: Optional[str] = None  # None when there are no more pages
+
+
 class RecipeFilter(BaseModel):
     """Filter model for recipe history"""
     cuisine: Optional[str] = None
@@ -45,7 +68,8 @@ class RecipeFilter(BaseModel):
     effort_level: Optional[str] = None
     min_calories: Optional[int] = None
     max_calories: Optional[int] = None
-    profile_name: Optional[str] = None
+    profile_name: Optional[List[str]] = None
+    profile_match: str = "any"  # "any" or "all"
     search_text: Optional[str] = None
 
 
@@ -1,28 +1,24 @@
-from fastapi import APIRouter, HTTPException, Query, status
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, Dict, List, Optional
 
-from ..models import RecipeResponse, RecipeFilter
+from ..models import RecipeSummary, RecipeFilter, RecipeHistoryPage
 from ..database import db
 
 router = APIRouter(prefix="/api/history", tags=["history"])
 
 
-@router.get("/", response_model=List[RecipeResponse])
-async def get_recipe_history(
-    limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+def history_filters(
     cuisine: Optional[str] = None,
     min_time: Optional[int] = None,
     max_time: Optional[int] = None,
     effort_level: Optional[str] = None,
     min_calories: Optional[int] = None,
     max_calories: Optional[int] = None,
-    profile_name: Optional[str] = None,
+    profile_name: Optional[List[str]] = Query(None),
+    profile_match: str = Query("any", pattern="^(any|all)$"),
     search_text: Optional[str] = None
-):
-    """
-    Get recipe history with optional filtering and pagination
-    """
+) -> Optional[Dict[str, Any]]:
+    """Collect history filter query parameters into a filters dict"""
     filters = {}
     
     if cuisine:
@@ -39,32 +35,91 @@ async def get_recipe_history(
         filters["max_calories"] = max_calories
     if profile_name:
         filters["profile_name"] = profile_name
+        filters["profile_match"] = profile_match
     if search_text:
         filters["search_text"] = search_text
     
+    return filters if filters else None
+
+
+def to_recipe_summary(recipe: Dict[str, Any]) -> RecipeSummary:
+    """Build a RecipeSummary from a summary database row"""
+    return RecipeSummary(
+        id=recipe["id"],
+        recipe_preview=recipe["recipe_preview"],
+        cuisine=recipe["cuisine"],
+        time_minutes=recipe["time_minutes"],
+        effort_level=recipe["effort_level"],
+        dish_preference=recipe["dish_preference"],
+        calories_per_serving=recipe["calories_per_serving"],
+        used_external_ingredients=recipe["used_external_ingredients"],
+        prioritize_expiring=recipe["prioritize_expiring"],
+        active_profiles=recipe["active_profiles"],
+        created_at=recipe["created_at"],
+        llm_model=recipe["llm_model"],
+        search_snippet=recipe.get("search_snippet")
+    )
+
+
+@router.get("/", response_model=List[RecipeSummary])
+async def get_recipe_history(
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    filters: Optional[Dict[str, Any]] = Depends(history_filters)
+):
+    """
+    Get recipe history with optional filtering and pagination
+    
+    profile_name can be repeated to filter by several household members;
+    profile_match="all" requires every one of them, "any" (default) at least one.
+    
+    search_text uses the full-text index: results are ranked by relevance
+    and include a search_snippet with matches wrapped in <mark> tags.
+    
+    Rows are summaries with a short recipe_preview; load the full recipe
+    with GET /api/recipes/{id}. Offset paging gets slower the deeper it
+    goes; prefer /api/history/page.
+    """
     recipes = await db.get_recipes(
         limit=limit,
         offset=offset,
-        filters=filters if filters else None
+        filters=filters,
+        summary=True
     )
     
-    return [
-        RecipeResponse(
-            id=recipe["id"],
-            recipe_text=recipe["recipe_text"],
-            cuisine=recipe["cuisine"],
-            time_minutes=recipe["time_minutes"],
-            effort_level=recipe["effort_level"],
-            dish_preference=recipe["dish_preference"],
-            calories_per_serving=recipe["calories_per_serving"],
-            used_external_ingredients=recipe["used_external_ingredients"],
-            prioritize_expiring=recipe["prioritize_expiring"],
-            active_profiles=recipe["active_profiles"],
-            created_at=recipe["created_at"],
-            llm_model=recipe["llm_model"]
+    return [to_recipe_summary(recipe) for recipe in recipes]
+
+
+@router.get("/page", response_model=RecipeHistoryPage)
+async def get_recipe_history_page(
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = Depends(history_filters)
+):
+    """
+    Get recipe history using cursor (keyset) pagination
+    
+    Accepts the same filters as /api/history/. Pass the returned
+    next_cursor to fetch the following page; it is null on the last page.
+    Results are always newest first, including when searching.
+    """
+    try:
+        page = await db.get_recipes_page(
+            limit=limit,
+            cursor=cursor,
+            filters=filters,
+            summary=True
         )
-        for recipe in recipes
-    ]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return RecipeHistoryPage(
+        recipes=[to_recipe_summary(recipe) for recipe in page["recipes"]],
+        next_cursor=page["next_cursor"]
+    )
 
 
 @router.delete("/{recipe_id}")
@@ -82,8 +137,20 @@ async def delete_recipe(recipe_id: int):
 
 
 @router.get("/count")
-async def get_recipe_count():
-    """Get total count of recipes in history"""
-    recipes = await db.get_recipes(limit=10000, offset=0)
-    return {"count": len(recipes)}
+async def get_recipe_count(
+    filters: Optional[Dict[str, Any]] = Depends(history_filters)
+):
+    """
+    Get count of recipes in history
+    
+    Accepts the same filters as /api/history/; without filters the total
+    comes straight from the maintained counters.
+    """
+    count = await db.count_recipes(filters)
+    return {"count": count}
+
 
+@router.get("/counts")
+async def get_recipe_counts():
+    """Get total recipe count plus counts per cuisine and per effort level"""
+    return await db.get_recipe_counts()
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, status
-from typing import List
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import json
 
 from ..models import (
@@ -9,7 +10,8 @@ from ..models import (
     InventoryItem,
     ProductCreateRequest
 )
-from ..services.grocy_client import GrocyClient
+from ..services.grocy_client import GrocyClient, GrocyUnavailableError, fetch_concurrently
+from ..services.product_catalog import load_catalog
 from ..services.inventory_matcher import InventoryMatcher
 from ..utils.config_manager import get_effective_config
 
@@ -40,18 +42,18 @@ async def parse_inventory_text(request: InventoryParseRequest):
     
     try:
         # Fetch Grocy data
-        products = await grocy_client.get_products()
-        locations = await grocy_client.get_locations()
+        catalog = await load_catalog(grocy_client)
         
         # Get unit preference from settings (default to metric)
         unit_preference = config.get("unit_preference", "metric")
         
-        # Parse and match using LLM
+        # Parse and match, using the LLM for anything not matched locally
         parsed_items = await matcher.parse_and_match(
             request.text,
-            products,
-            locations,
-            unit_preference
+            catalog.products,
+            catalog.locations,
+            unit_preference,
+            catalog=catalog
         )
         
         # Convert to ParsedItem models with robust None handling
@@ -73,6 +75,8 @@ async def parse_inventory_text(request: InventoryParseRequest):
         
         return result
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -89,6 +93,9 @@ async def purchase_items(request: InventoryActionRequest):
     1. Creates new products if needed (when create_if_missing=True)
     2. Adds stock for each item
     3. Returns summary of actions taken
+    
+    Items are processed concurrently; each item's product is created
+    before it is purchased.
     """
     config = await get_effective_config()
     grocy_client = GrocyClient(config["grocy_url"], config["grocy_api_key"])
@@ -100,22 +107,10 @@ async def purchase_items(request: InventoryActionRequest):
     }
     
     try:
-        # Get quantity units for product creation
-        quantity_units = await grocy_client.get_quantity_units()
-        
-        # Create a unit lookup (name -> id)
-        unit_lookup = {qu["name"].lower(): qu["id"] for qu in quantity_units}
-        # Add common aliases
-        unit_lookup.update({
-            "count": unit_lookup.get("piece", unit_lookup.get("pcs", 2)),  # Default to Piece
-            "g": unit_lookup.get("gram", unit_lookup.get("g", 2)),
-            "kg": unit_lookup.get("kilogram", unit_lookup.get("kg", 2)),
-            "ml": unit_lookup.get("milliliter", unit_lookup.get("ml", 2)),
-            "l": unit_lookup.get("liter", unit_lookup.get("l", 2)),
-            "oz": unit_lookup.get("ounce", unit_lookup.get("oz", 2)),
-            "lb": unit_lookup.get("pound", unit_lookup.get("lb", 2)),
-            "gal": unit_lookup.get("gallon", unit_lookup.get("gal", 2)),
-        })
+        # Indexed products and quantity units (resolves common unit aliases)
+        catalog = await load_catalog(grocy_client)
+        # Items needing the same new unit must not both try to create it
+        unit_lock = asyncio.Lock()
         
         # Common units to auto-create if missing
         common_units = {
@@ -131,105 +126,123 @@ async def purchase_items(request: InventoryActionRequest):
             "teaspoon": "teaspoons",
         }
         
-        for item in request.items:
-            if item.action != "purchase":
-                continue
-            
-            try:
-                # Create product if needed
-                if item.create_if_missing and item.product_id is None:
-                    # Get or create unit ID
-                    unit_name_lower = item.unit.lower()
-                    qu_id = unit_lookup.get(unit_name_lower)
-                    
-                    # If unit doesn't exist, try to create it
-                    if not qu_id and unit_name_lower in common_units:
-                        try:
-                            new_unit = await grocy_client.create_quantity_unit(
-                                name=unit_name_lower.capitalize(),
-                                name_plural=common_units[unit_name_lower]
-                            )
-                            qu_id = new_unit["created_object_id"]
-                            unit_lookup[unit_name_lower] = qu_id
-                            print(f"✅ Created quantity unit: {unit_name_lower} (ID: {qu_id})")
-                        except Exception as e:
-                            # Unit might already exist, try to fetch it again
-                            if "constraint" in str(e).lower() or "unique" in str(e).lower():
-                                print(f"ℹ️ Unit '{unit_name_lower}' already exists, fetching...")
-                                existing_units = await grocy_client.get_quantity_units()
-                                unit_lookup = {u["name"].lower(): u["id"] for u in existing_units}
-                                qu_id = unit_lookup.get(unit_name_lower)
-                                if not qu_id:
-                                    print(f"⚠️ Failed to find unit '{unit_name_lower}' after refresh: {e}")
-                                    qu_id = 2  # Fallback to Piece
-                            else:
-                                print(f"⚠️ Failed to create unit '{unit_name_lower}': {e}")
-                                qu_id = 2  # Fallback to Piece
-                    elif not qu_id:
-                        qu_id = 2  # Default to Piece if not a common unit
-                    
-                    # Create product
+        async def resolve_unit(unit_name_lower: str) -> int:
+            """Get or create the quantity unit for a new product"""
+            nonlocal catalog
+            async with unit_lock:
+                qu_id = catalog.unit_id(unit_name_lower)
+                
+                # If unit doesn't exist, try to create it
+                if not qu_id and unit_name_lower in common_units:
                     try:
-                        created = await grocy_client.create_product(
-                            name=item.product_name,
-                            location_id=item.location_id or 1,  # Default location
-                            qu_id_stock=qu_id,
-                            description=f"Auto-created from inventory import"
+                        new_unit = await grocy_client.create_quantity_unit(
+                            name=unit_name_lower.capitalize(),
+                            name_plural=common_units[unit_name_lower]
                         )
-                        
-                        item.product_id = created["created_object_id"]
-                        results["created_products"].append({
-                            "name": item.product_name,
-                            "id": item.product_id
-                        })
-                    except Exception as product_error:
-                        # Product might already exist, try to find it
-                        if "constraint" in str(product_error).lower() or "unique" in str(product_error).lower():
-                            products = await grocy_client.get_products()
-                            matching_product = next(
-                                (p for p in products if p["name"].lower() == item.product_name.lower()),
-                                None
-                            )
-                            if matching_product:
-                                item.product_id = matching_product["id"]
-                                print(f"ℹ️ Product '{item.product_name}' already exists (ID: {item.product_id})")
-                            else:
-                                print(f"⚠️ Failed to create product '{item.product_name}': {product_error}")
-                                continue
+                        qu_id = new_unit["created_object_id"]
+                        catalog.add_unit(unit_name_lower, qu_id)
+                        print(f"✅ Created quantity unit: {unit_name_lower} (ID: {qu_id})")
+                    except Exception as e:
+                        # Unit might already exist, try to fetch it again
+                        if "constraint" in str(e).lower() or "unique" in str(e).lower():
+                            print(f"ℹ️ Unit '{unit_name_lower}' already exists, fetching...")
+                            catalog = await load_catalog(grocy_client)
+                            qu_id = catalog.unit_id(unit_name_lower)
+                            if not qu_id:
+                                print(f"⚠️ Failed to find unit '{unit_name_lower}' after refresh: {e}")
+                                qu_id = 2  # Fallback to Piece
                         else:
-                            print(f"⚠️ Failed to create product '{item.product_name}': {product_error}")
-                            continue
+                            print(f"⚠️ Failed to create unit '{unit_name_lower}': {e}")
+                            qu_id = 2  # Fallback to Piece
+                elif not qu_id:
+                    qu_id = 2  # Default to Piece if not a common unit
+                return qu_id
+        
+        async def purchase(item: InventoryItem):
+            """Create the item's product if needed, then purchase it"""
+            created_product = None
+            
+            # Create product if needed
+            if item.create_if_missing and item.product_id is None:
+                qu_id = await resolve_unit(item.unit.lower())
                 
-                # Purchase the product
-                if item.product_id:
-                    await grocy_client.purchase_product(
-                        product_id=item.product_id,
-                        amount=item.amount,
-                        best_before_date=item.best_before_date,
-                        price=item.price,
-                        location_id=item.location_id
+                # Create product
+                try:
+                    created = await grocy_client.create_product(
+                        name=item.product_name,
+                        location_id=item.location_id or 1,  # Default location
+                        qu_id_stock=qu_id,
+                        description=f"Auto-created from inventory import"
                     )
                     
-                    results["success"].append({
-                        "product_id": item.product_id,
-                        "product_name": item.product_name,
-                        "quantity": item.amount,
-                        "unit": item.unit
-                    })
-                else:
-                    results["failed"].append({
-                        "product_name": item.product_name,
-                        "reason": "No product ID and create_if_missing=False"
-                    })
-                    
+                    item.product_id = created["created_object_id"]
+                    created_product = {
+                        "name": item.product_name,
+                        "id": item.product_id
+                    }
+                except Exception as product_error:
+                    # Product might already exist, try to find it
+                    if "constraint" in str(product_error).lower() or "unique" in str(product_error).lower():
+                        matching_product = (await load_catalog(grocy_client)).find_product(item.product_name)
+                        if matching_product:
+                            item.product_id = matching_product["id"]
+                            print(f"ℹ️ Product '{item.product_name}' already exists (ID: {item.product_id})")
+                        else:
+                            print(f"⚠️ Failed to create product '{item.product_name}': {product_error}")
+                            return None, None
+                    else:
+                        print(f"⚠️ Failed to create product '{item.product_name}': {product_error}")
+                        return None, None
+            
+            # Purchase the product
+            if not item.product_id:
+                return created_product, ("failed", {
+                    "product_name": item.product_name,
+                    "reason": "No product ID and create_if_missing=False"
+                })
+            
+            try:
+                await grocy_client.purchase_product(
+                    product_id=item.product_id,
+                    amount=item.amount,
+                    best_before_date=item.best_before_date,
+                    price=item.price,
+                    location_id=item.location_id
+                )
             except Exception as e:
-                results["failed"].append({
+                return created_product, ("failed", {
                     "product_name": item.product_name,
                     "reason": str(e)
                 })
+            
+            return created_product, ("success", {
+                "product_id": item.product_id,
+                "product_name": item.product_name,
+                "quantity": item.amount,
+                "unit": item.unit
+            })
+        
+        items = [item for item in request.items if item.action == "purchase"]
+        outcomes = await grocy_client.run_batch(items, purchase)
+        
+        for item, (outcome, error) in zip(items, outcomes):
+            if error is not None:
+                results["failed"].append({
+                    "product_name": item.product_name,
+                    "reason": str(error)
+                })
+                continue
+            
+            created_product, entry = outcome
+            if created_product:
+                results["created_products"].append(created_product)
+            if entry:
+                results[entry[0]].append(entry[1])
         
         return results
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -255,11 +268,17 @@ async def consume_items(request: InventoryActionRequest):
         "failed": []
     }
     
-    # Get current stock to check availability
-    stock = await grocy_client.get_stock()
+    # Get current stock of the requested products to check availability
+    stock = await grocy_client.get_stock(
+        item.product_id for item in request.items
+        if item.action == "consume" and item.product_id
+    )
     stock_by_product = {s["product_id"]: float(s.get("amount", 0)) for s in stock}
     
     try:
+        # Items that passed the stock checks, in request order
+        to_consume = []
+        
         for item in request.items:
             if item.action != "consume":
                 continue
@@ -288,21 +307,7 @@ async def consume_items(request: InventoryActionRequest):
                     })
                     continue
                 
-                # Consume the product
-                # Don't pass location_id - let Grocy use the product's default location
-                await grocy_client.consume_product(
-                    product_id=item.product_id,
-                    amount=item.amount,
-                    spoiled=False,
-                    location_id=None
-                )
-                
-                results["success"].append({
-                    "product_id": item.product_id,
-                    "product_name": item.product_name,
-                    "quantity": item.amount,
-                    "unit": item.unit
-                })
+                to_consume.append(item)
                     
             except Exception as e:
                 results["failed"].append({
@@ -310,8 +315,36 @@ async def consume_items(request: InventoryActionRequest):
                     "reason": str(e)
                 })
         
+        # Consume the products concurrently
+        # Don't pass location_id - let Grocy use the product's default location
+        outcomes = await grocy_client.run_batch(
+            to_consume,
+            lambda item: grocy_client.consume_product(
+                product_id=item.product_id,
+                amount=item.amount,
+                spoiled=False,
+                location_id=None
+            )
+        )
+        
+        for item, (_, error) in zip(to_consume, outcomes):
+            if error is not None:
+                results["failed"].append({
+                    "product_name": item.product_name,
+                    "reason": str(error)
+                })
+            else:
+                results["success"].append({
+                    "product_id": item.product_id,
+                    "product_name": item.product_name,
+                    "quantity": item.amount,
+                    "unit": item.unit
+                })
+        
         return results
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -319,6 +352,24 @@ async def consume_items(request: InventoryActionRequest):
         )
 
 
+async def _get_stock_amounts(
+    grocy_client: GrocyClient,
+    product_ids: Optional[List[int]] = None
+) -> Optional[Dict[int, float]]:
+    """
+    Current stock amount per product ID, or None if stock can't be fetched
+    
+    With product_ids only those products' stock is fetched.
+    """
+    try:
+        stock = await grocy_client.get_stock(product_ids)
+    except Exception as e:
+        # If we can't check stock, items are added to the list regardless
+        print(f"⚠️ Could not check stock: {e}")
+        return None
+    return {s["product_id"]: float(s.get("amount", 0)) for s in stock}
+
+
 @router.post("/add-to-shopping-list")
 async def add_to_shopping_list(request: InventoryActionRequest):
     """
@@ -338,138 +389,155 @@ async def add_to_shopping_list(request: InventoryActionRequest):
     }
     
     try:
-        # Get existing units for auto-creation
-        existing_units = await grocy_client.get_quantity_units()
-        unit_name_to_id = {u["name"].lower(): u["id"] for u in existing_units}
+        # Products found by name after a failed create aren't known yet, so
+        # only narrow the stock fetch when every item already has its ID
+        product_ids = None
+        if not any(item.create_if_missing and not item.product_id for item in request.items):
+            product_ids = [item.product_id for item in request.items if item.product_id]
         
-        # Get locations for auto-creation
-        locations = await grocy_client.get_locations()
-        location_id = locations[0]["id"] if locations else 1  # Default to first location
+        # Indexed units and locations for auto-creation, plus one stock
+        # snapshot that every item is checked against
+        catalog, stock_by_product = await fetch_concurrently(
+            load_catalog(grocy_client), _get_stock_amounts(grocy_client, product_ids)
+        )
+        location_id = catalog.default_location_id()  # Default to first location
+        # Items needing the same new unit must not both try to create it
+        unit_lock = asyncio.Lock()
         
-        for item in request.items:
-            try:
-                product_id = item.product_id
+        # Common units to auto-create if missing
+        common_units = {
+            "g": ("Gram", "Grams"),
+            "gram": ("Gram", "Grams"),
+            "kg": ("Kilogram", "Kilograms"),
+            "kilogram": ("Kilogram", "Kilograms"),
+            "oz": ("Ounce", "Ounces"),
+            "ounce": ("Ounce", "Ounces"),
+            "lb": ("Pound", "Pounds"),
+            "pound": ("Pound", "Pounds"),
+            "ml": ("Milliliter", "Milliliters"),
+            "l": ("Liter", "Liters"),
+            "liter": ("Liter", "Liters"),
+            "fl oz": ("Fluid Ounce", "Fluid Ounces"),
+            "pt": ("Pint", "Pints"),
+            "qt": ("Quart", "Quarts"),
+            "gal": ("Gallon", "Gallons"),
+        }
+        
+        async def resolve_unit(unit_lower: str) -> int:
+            """Get or create the quantity unit for a new product"""
+            nonlocal catalog
+            async with unit_lock:
+                qu_id = catalog.unit_id(unit_lower)
+                if qu_id:
+                    return qu_id
+                if unit_lower not in common_units:
+                    return catalog.unit_id("unit") or 1
                 
-                # Create product if needed
-                if item.create_if_missing and not product_id:
-                    # Get or create unit
-                    unit_lower = item.unit.lower() if item.unit else "unit"
-                    qu_id = unit_name_to_id.get(unit_lower)
-                    
-                    if not qu_id:
-                        # Try to create common units
-                        common_units = {
-                            "g": ("Gram", "Grams"),
-                            "gram": ("Gram", "Grams"),
-                            "kg": ("Kilogram", "Kilograms"),
-                            "kilogram": ("Kilogram", "Kilograms"),
-                            "oz": ("Ounce", "Ounces"),
-                            "ounce": ("Ounce", "Ounces"),
-                            "lb": ("Pound", "Pounds"),
-                            "pound": ("Pound", "Pounds"),
-                            "ml": ("Milliliter", "Milliliters"),
-                            "l": ("Liter", "Liters"),
-                            "liter": ("Liter", "Liters"),
-                            "fl oz": ("Fluid Ounce", "Fluid Ounces"),
-                            "pt": ("Pint", "Pints"),
-                            "qt": ("Quart", "Quarts"),
-                            "gal": ("Gallon", "Gallons"),
-                        }
-                        
-                        if unit_lower in common_units:
-                            name, plural = common_units[unit_lower]
-                            try:
-                                created_unit = await grocy_client.create_quantity_unit(name, plural, unit_lower)
-                                qu_id = created_unit["created_object_id"]
-                                unit_name_to_id[unit_lower] = qu_id
-                            except Exception as unit_error:
-                                # Unit might already exist, try to fetch it again
-                                if "constraint" in str(unit_error).lower() or "unique" in str(unit_error).lower():
-                                    existing_units = await grocy_client.get_quantity_units()
-                                    unit_name_to_id = {u["name"].lower(): u["id"] for u in existing_units}
-                                    qu_id = unit_name_to_id.get(unit_lower) or unit_name_to_id.get(name.lower())
-                                    if not qu_id:
-                                        raise unit_error
-                                else:
-                                    raise unit_error
-                        else:
-                            qu_id = unit_name_to_id.get("unit", 1)
-                    
-                    # Create product
-                    try:
-                        created_product = await grocy_client.create_product(
-                            name=item.product_name,
-                            location_id=item.location_id or location_id,
-                            qu_id_stock=qu_id
-                        )
-                        product_id = created_product["created_object_id"]
-                        results["created_products"].append({
-                            "name": item.product_name,
-                            "id": product_id
-                        })
-                    except Exception as product_error:
-                        # Product might already exist, try to find it
-                        if "constraint" in str(product_error).lower() or "unique" in str(product_error).lower():
-                            products = await grocy_client.get_products()
-                            matching_product = next(
-                                (p for p in products if p["name"].lower() == item.product_name.lower()),
-                                None
-                            )
-                            if matching_product:
-                                product_id = matching_product["id"]
-                                print(f"ℹ️ Product '{item.product_name}' already exists (ID: {product_id})")
-                            else:
-                                raise product_error
-                        else:
-                            raise product_error
+                name, plural = common_units[unit_lower]
+                try:
+                    created_unit = await grocy_client.create_quantity_unit(name, plural, unit_lower)
+                    qu_id = created_unit["created_object_id"]
+                    catalog.add_unit(unit_lower, qu_id)
+                except Exception as unit_error:
+                    # Unit might already exist, try to fetch it again
+                    if "constraint" in str(unit_error).lower() or "unique" in str(unit_error).lower():
+                        catalog = await load_catalog(grocy_client)
+                        qu_id = catalog.unit_id(unit_lower) or catalog.unit_id(name)
+                        if not qu_id:
+                            raise unit_error
+                    else:
+                        raise unit_error
+                return qu_id
+        
+        async def resolve_product(item: InventoryItem) -> Tuple[Optional[int], bool]:
+            """The item's product ID, creating the product if requested; and whether it was created"""
+            if not (item.create_if_missing and not item.product_id):
+                return item.product_id, False
+            
+            qu_id = await resolve_unit(item.unit.lower() if item.unit else "unit")
+            try:
+                created_product = await grocy_client.create_product(
+                    name=item.product_name,
+                    location_id=item.location_id or location_id,
+                    qu_id_stock=qu_id
+                )
+                return created_product["created_object_id"], True
+            except Exception as product_error:
+                # Product might already exist, try to find it
+                if "constraint" in str(product_error).lower() or "unique" in str(product_error).lower():
+                    matching_product = (await load_catalog(grocy_client)).find_product(item.product_name)
+                    if matching_product:
+                        print(f"ℹ️ Product '{item.product_name}' already exists (ID: {matching_product['id']})")
+                        return matching_product["id"], False
+                raise product_error
+        
+        # Missing products are created concurrently; the adds need their IDs
+        resolved = await grocy_client.run_batch(request.items, resolve_product)
+        
+        # One ("success" | "failed", entry) per item, so results keep request order
+        outcomes: List[Optional[Tuple[str, Dict]]] = [None] * len(request.items)
+        to_add = []
+        
+        for index, (item, (resolution, error)) in enumerate(zip(request.items, resolved)):
+            if error is not None:
+                outcomes[index] = ("failed", {"item": item.product_name, "reason": str(error)})
+                continue
+            
+            product_id, created = resolution
+            if created:
+                results["created_products"].append({
+                    "name": item.product_name,
+                    "id": product_id
+                })
+            
+            if not product_id:
+                outcomes[index] = ("failed", {
+                    "item": item.product_name,
+                    "reason": "No product ID and creation not enabled"
+                })
+                continue
+            
+            # Check current stock before adding to shopping list
+            if stock_by_product is not None and product_id in stock_by_product:
+                current_amount = stock_by_product[product_id]
                 
-                if not product_id:
-                    results["failed"].append({
+                # If we have enough in stock, skip adding to shopping list
+                if current_amount >= item.amount:
+                    outcomes[index] = ("failed", {
                         "item": item.product_name,
-                        "reason": "No product ID and creation not enabled"
+                        "reason": f"Already in stock ({current_amount} {item.unit} available)"
                     })
                     continue
-                
-                # Check current stock before adding to shopping list
-                try:
-                    stock = await grocy_client.get_stock()
-                    product_stock = next((s for s in stock if s["product_id"] == product_id), None)
-                    
-                    if product_stock:
-                        current_amount = float(product_stock.get("amount", 0))
-                        
-                        # If we have enough in stock, skip adding to shopping list
-                        if current_amount >= item.amount:
-                            results["failed"].append({
-                                "item": item.product_name,
-                                "reason": f"Already in stock ({current_amount} {item.unit} available)"
-                            })
-                            continue
-                except Exception as stock_error:
-                    # If we can't check stock, proceed with adding to list
-                    print(f"⚠️ Could not check stock for {item.product_name}: {stock_error}")
-                
-                # Add to shopping list
-                await grocy_client.add_to_shopping_list(
-                    product_id=product_id,
-                    amount=item.amount,
-                    list_id=1  # Default shopping list
-                )
-                
-                results["success"].append({
+            
+            to_add.append((index, item, product_id))
+        
+        # Add to shopping list with bounded concurrency
+        added = await grocy_client.run_batch(
+            to_add,
+            lambda entry: grocy_client.add_to_shopping_list(
+                product_id=entry[2],
+                amount=entry[1].amount,
+                list_id=1  # Default shopping list
+            )
+        )
+        
+        for (index, item, _), (_, error) in zip(to_add, added):
+            if error is not None:
+                outcomes[index] = ("failed", {"item": item.product_name, "reason": str(error)})
+            else:
+                outcomes[index] = ("success", {
                     "product_name": item.product_name,
                     "quantity": item.amount,
                     "unit": item.unit
                 })
-                
-            except Exception as e:
-                results["failed"].append({
-                    "item": item.product_name if hasattr(item, 'product_name') else "Unknown",
-                    "reason": str(e)
-                })
+        
+        for kind, entry in outcomes:
+            results[kind].append(entry)
         
         return results
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -493,28 +561,32 @@ async def create_products(products: List[ProductCreateRequest]):
     }
     
     try:
-        for product in products:
-            try:
-                created = await grocy_client.create_product(
-                    name=product.name,
-                    location_id=product.location_id,
-                    qu_id_stock=product.qu_id_stock,
-                    description=product.description
-                )
-                
-                results["success"].append({
+        outcomes = await grocy_client.run_batch(
+            products,
+            lambda product: grocy_client.create_product(
+                name=product.name,
+                location_id=product.location_id,
+                qu_id_stock=product.qu_id_stock,
+                description=product.description
+            )
+        )
+        
+        for product, (created, error) in zip(products, outcomes):
+            if error is not None:
+                results["failed"].append({
                     "name": product.name,
-                    "id": created["created_object_id"]
+                    "reason": str(error)
                 })
-                
-            except Exception as e:
-                results["failed"].append({
+            else:
+                results["success"].append({
                     "name": product.name,
-                    "reason": str(e)
+                    "id": created["created_object_id"]
                 })
         
         return results
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
@@ -12,14 +14,17 @@ from ..models import (
     RecipeConsumeRequest,
     RecipeShoppingListRequest,
     RecipeSaveRequest,
-    InventoryActionRequest
+    InventoryActionRequest,
+    InventoryItem
 )
 from ..database import db
 from ..config import settings
-from ..services.grocy_client import GrocyClient
+from ..services.grocy_client import GrocyClient, GrocyUnavailableError, fetch_concurrently
+from ..services.product_catalog import ProductCatalog, load_catalog
 from ..services.llm_client import LLMClient
 from ..services.notification import NotificationService
 from ..services.inventory_matcher import InventoryMatcher
+from ..services.retention import retention
 from ..utils.recipe_parser import (
     extract_metadata_from_recipe,
     format_recipe_for_download
@@ -29,6 +34,102 @@ from ..utils.config_manager import get_effective_config
 router = APIRouter(prefix="/api/recipes", tags=["recipes"])
 
 
+async def _prepare_generation(request: RecipeGenerationRequest, config: dict):
+    """Gather the inventory, dietary profiles and LLM parameters for a generation request"""
+    grocy_client = GrocyClient(config["grocy_url"], config["grocy_api_key"])
+    
+    # Fetch Grocy inventory
+    inventory = await grocy_client.format_inventory_for_llm(
+        prioritize_expiring=request.prioritize_expiring
+    )
+    
+    # Get active dietary profiles
+    dietary_profiles = []
+    if request.active_profiles:
+        all_profiles = await db.get_all_profiles()
+        dietary_profiles = [
+            {
+                "name": p["name"],
+                "dietary_restrictions": p["dietary_restrictions"]
+            }
+            for p in all_profiles
+            if p["name"] in request.active_profiles
+        ]
+    
+    # Prepare request params for LLM
+    request_params = {
+        "cuisine": request.cuisine,
+        "time_minutes": request.time_minutes,
+        "effort_level": request.effort_level,
+        "dish_preference": request.dish_preference,
+        "calories_per_serving": request.calories_per_serving,
+        "use_external_ingredients": request.use_external_ingredients,
+        "prioritize_expiring": request.prioritize_expiring,
+        "elzar_voice": request.elzar_voice,
+        "servings": request.servings,
+        "high_leftover_potential": request.high_leftover_potential,
+        "user_prompt": request.user_prompt
+    }
+    
+    return inventory, dietary_profiles, request_params
+
+
+async def _save_generated_recipe(
+    recipe_text: str,
+    request: RecipeGenerationRequest,
+    inventory: dict,
+    config: dict
+) -> RecipeResponse:
+    """Extract metadata from a generated recipe, store it and return the saved recipe"""
+    # Extract metadata from generated recipe
+    extracted_metadata = extract_metadata_from_recipe(recipe_text)
+    
+    # Prepare recipe data for database
+    recipe_data = {
+        "recipe_text": recipe_text,
+        "cuisine": extracted_metadata.get("cuisine") or request.cuisine,
+        "time_minutes": extracted_metadata.get("time_minutes") or request.time_minutes,
+        "effort_level": extracted_metadata.get("effort_level") or request.effort_level,
+        "dish_preference": request.dish_preference,
+        "calories_per_serving": extracted_metadata.get("calories_per_serving") or request.calories_per_serving,
+        "used_external_ingredients": request.use_external_ingredients,
+        "prioritize_expiring": request.prioritize_expiring,
+        "active_profiles": request.active_profiles,
+        "grocy_inventory_snapshot": inventory,
+        "user_prompt": request.user_prompt,
+        "llm_model": config["llm_model"]
+    }
+    
+    # Save to database
+    recipe_id = await db.create_recipe(recipe_data)
+    
+    # Old recipes are pruned by the background retention task
+    retention.notify_recipe_created()
+    
+    # Get the saved recipe
+    saved_recipe = await db.get_recipe(recipe_id)
+    
+    return RecipeResponse(
+        id=saved_recipe["id"],
+        recipe_text=saved_recipe["recipe_text"],
+        cuisine=saved_recipe["cuisine"],
+        time_minutes=saved_recipe["time_minutes"],
+        effort_level=saved_recipe["effort_level"],
+        dish_preference=saved_recipe["dish_preference"],
+        calories_per_serving=saved_recipe["calories_per_serving"],
+        used_external_ingredients=saved_recipe["used_external_ingredients"],
+        prioritize_expiring=saved_recipe["prioritize_expiring"],
+        active_profiles=saved_recipe["active_profiles"],
+        created_at=saved_recipe["created_at"],
+        llm_model=saved_recipe["llm_model"]
+    )
+
+
+def _sse_event(event: str, data) -> str:
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
 @router.post("/generate", response_model=RecipeResponse)
 async def generate_recipe(request: RecipeGenerationRequest):
     """
@@ -38,43 +139,11 @@ async def generate_recipe(request: RecipeGenerationRequest):
     """
     config = await get_effective_config()
     
-    # Initialize clients with effective config
-    grocy_client = GrocyClient(config["grocy_url"], config["grocy_api_key"])
+    # Initialize LLM client with effective config
     llm_client = LLMClient(config["llm_api_url"], config["llm_api_key"], config["llm_model"])
     
     try:
-        # Fetch Grocy inventory
-        inventory = await grocy_client.format_inventory_for_llm(
-            prioritize_expiring=request.prioritize_expiring
-        )
-        
-        # Get active dietary profiles
-        dietary_profiles = []
-        if request.active_profiles:
-            all_profiles = await db.get_all_profiles()
-            dietary_profiles = [
-                {
-                    "name": p["name"],
-                    "dietary_restrictions": p["dietary_restrictions"]
-                }
-                for p in all_profiles
-                if p["name"] in request.active_profiles
-            ]
-        
-        # Prepare request params for LLM
-        request_params = {
-            "cuisine": request.cuisine,
-            "time_minutes": request.time_minutes,
-            "effort_level": request.effort_level,
-            "dish_preference": request.dish_preference,
-            "calories_per_serving": request.calories_per_serving,
-            "use_external_ingredients": request.use_external_ingredients,
-            "prioritize_expiring": request.prioritize_expiring,
-            "elzar_voice": request.elzar_voice,
-            "servings": request.servings,
-            "high_leftover_potential": request.high_leftover_potential,
-            "user_prompt": request.user_prompt
-        }
+        inventory, dietary_profiles, request_params = await _prepare_generation(request, config)
         
         # Generate recipe with LLM
         recipe_text = await llm_client.generate_recipe(
@@ -83,54 +152,67 @@ async def generate_recipe(request: RecipeGenerationRequest):
             dietary_profiles=dietary_profiles
         )
         
-        # Extract metadata from generated recipe
-        extracted_metadata = extract_metadata_from_recipe(recipe_text)
-        
-        # Prepare recipe data for database
-        recipe_data = {
-            "recipe_text": recipe_text,
-            "cuisine": extracted_metadata.get("cuisine") or request.cuisine,
-            "time_minutes": extracted_metadata.get("time_minutes") or request.time_minutes,
-            "effort_level": extracted_metadata.get("effort_level") or request.effort_level,
-            "dish_preference": request.dish_preference,
-            "calories_per_serving": extracted_metadata.get("calories_per_serving") or request.calories_per_serving,
-            "used_external_ingredients": request.use_external_ingredients,
-            "prioritize_expiring": request.prioritize_expiring,
-            "active_profiles": request.active_profiles,
-            "grocy_inventory_snapshot": inventory,
-            "user_prompt": request.user_prompt,
-            "llm_model": config["llm_model"]
-        }
-        
-        # Save to database
-        recipe_id = await db.create_recipe(recipe_data)
+        return await _save_generated_recipe(recipe_text, request, inventory, config)
         
-        # Clean up old recipes if needed
-        await db.cleanup_old_recipes(config["max_recipe_history"])
-        
-        # Get the saved recipe
-        saved_recipe = await db.get_recipe(recipe_id)
-        
-        return RecipeResponse(
-            id=saved_recipe["id"],
-            recipe_text=saved_recipe["recipe_text"],
-            cuisine=saved_recipe["cuisine"],
-            time_minutes=saved_recipe["time_minutes"],
-            effort_level=saved_recipe["effort_level"],
-            dish_preference=saved_recipe["dish_preference"],
-            calories_per_serving=saved_recipe["calories_per_serving"],
-            used_external_ingredients=saved_recipe["used_external_ingredients"],
-            prioritize_expiring=saved_recipe["prioritize_expiring"],
-            active_profiles=saved_recipe["active_profiles"],
-            created_at=saved_recipe["created_at"],
-            llm_model=saved_recipe["llm_model"]
+    except GrocyUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error generating recipe: {str(e)}"
         )
-        
+
+
+@router.post("/generate/stream")
+async def generate_recipe_stream(request: RecipeGenerationRequest):
+    """
+    Generate a new recipe, streaming it as Server-Sent Events
+    
+    Sends "token" events ({"text": ...}) as the LLM writes the recipe, then
+    a "recipe" event with the saved recipe (same shape as /generate) once
+    it is stored, or an "error" event ({"detail": ...}) if generation fails
+    part-way. If the client disconnects early nothing is saved.
+    """
+    config = await get_effective_config()
+    
+    llm_client = LLMClient(config["llm_api_url"], config["llm_api_key"], config["llm_model"])
+    
+    # Fail with a normal error response if Grocy can't be read
+    try:
+        inventory, dietary_profiles, request_params = await _prepare_generation(request, config)
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error generating recipe: {str(e)}"
         )
+    
+    async def events():
+        chunks = []
+        try:
+            async for text in llm_client.stream_recipe(
+                inventory=inventory,
+                request_params=request_params,
+                dietary_profiles=dietary_profiles
+            ):
+                chunks.append(text)
+                yield _sse_event("token", {"text": text})
+            
+            saved = await _save_generated_recipe("".join(chunks), request, inventory, config)
+            yield _sse_event("recipe", saved.model_dump())
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Error generating recipe: {str(e)}"})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop nginx from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
 
 
 @router.post("/regenerate/{recipe_id}", response_model=RecipeResponse)
@@ -211,7 +293,7 @@ async def regenerate_recipe(recipe_id: int):
         }
         
         new_recipe_id = await db.create_recipe(recipe_data)
-        await db.cleanup_old_recipes(config["max_recipe_history"])
+        retention.notify_recipe_created()
         
         # Get the saved recipe
         saved_recipe = await db.get_recipe(new_recipe_id)
@@ -231,6 +313,8 @@ async def regenerate_recipe(recipe_id: int):
             llm_model=saved_recipe["llm_model"]
         )
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -348,6 +432,91 @@ async def send_recipe_notification(recipe_id: int, notification: NotificationReq
         )
 
 
+async def _extract_ingredients(
+    matcher: InventoryMatcher,
+    recipe: Dict[str, Any],
+    catalog: ProductCatalog,
+    stock_info: Dict[str, Any],
+    unit_preference: str,
+    for_shopping_list: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Extract a recipe's ingredients, reusing a cached extraction if possible
+    
+    Extractions are cached per recipe, mode, catalog version and unit
+    preference, so repeat actions on a recipe skip the LLM. The LLM's
+    in_stock/stock_amount describe stock at extraction time and are
+    brought up to date on reuse; if a matched product has come into stock
+    since, the recipe is extracted again.
+    """
+    mode = "shopping" if for_shopping_list else "recipe"
+    key = (recipe["id"], mode, catalog.version, unit_preference)
+    stock_now = {
+        str(item["product_id"]): float(item.get("amount") or 0)
+        for item in stock_info.get("available_items", [])
+        if item.get("product_id") is not None
+    }
+    
+    cached = await db.get_recipe_ingredients(*key)
+    if cached is not None:
+        ingredients = _restock_ingredients(cached["ingredients"], cached["stock"], stock_now)
+        if ingredients is not None:
+            print(f"♻️ Reusing cached ingredients for recipe {recipe['id']} ({mode})")
+            return ingredients
+    
+    ingredients = await matcher.extract_recipe_ingredients(
+        recipe["recipe_text"],
+        catalog.products,
+        stock_info,
+        unit_preference,
+        for_shopping_list=for_shopping_list
+    )
+    
+    # Stock of the matched products now, to compare against on reuse
+    stock_then = {
+        str(ing["product_id"]): stock_now.get(str(ing["product_id"]), 0.0)
+        for ing in ingredients
+        if ing.get("product_id")
+    }
+    try:
+        await db.save_recipe_ingredients(*key, ingredients, stock_then)
+    except Exception as e:
+        print(f"⚠️ Could not cache ingredients for recipe {recipe['id']}: {e}")
+    return ingredients
+
+
+def _restock_ingredients(
+    ingredients: List[Dict[str, Any]],
+    stock_then: Dict[str, float],
+    stock_now: Dict[str, float]
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Update cached ingredients' stock figures to current Grocy stock
+    
+    stock_amount is in the ingredient's unit, so it is scaled by how the
+    product's stock changed. Returns None when a product that was out of
+    stock now has some, since its amount can't be converted without the LLM.
+    """
+    result = []
+    for ingredient in ingredients:
+        ingredient = dict(ingredient)
+        product_id = ingredient.get("product_id")
+        if product_id:
+            then = stock_then.get(str(product_id), 0.0)
+            now = stock_now.get(str(product_id), 0.0)
+            if now != then:
+                if then <= 0:
+                    return None
+                try:
+                    amount = float(ingredient.get("stock_amount") or 0)
+                except (TypeError, ValueError):
+                    return None
+                ingredient["stock_amount"] = round(amount * now / then, 2)
+                ingredient["in_stock"] = now > 0
+        result.append(ingredient)
+    return result
+
+
 @router.post("/{recipe_id}/parse-ingredients")
 async def parse_recipe_ingredients(recipe_id: int, action_type: str = "consume"):
     """
@@ -383,34 +552,27 @@ async def parse_recipe_ingredients(recipe_id: int, action_type: str = "consume")
     
     try:
         # Get Grocy data
-        products = await grocy_client.get_products()
-        locations = await grocy_client.get_locations()
-        quantity_units = await grocy_client.get_quantity_units()
-        stock_info = await grocy_client.format_inventory_for_llm()
+        catalog, stock_info = await fetch_concurrently(
+            load_catalog(grocy_client),
+            grocy_client.format_inventory_for_llm()
+        )
         unit_preference = config.get("unit_preference", "metric")
         
         # Extract and match ingredients using LLM
         # Use shopping list mode for realistic purchasing quantities
         for_shopping_list = (action_type == "shopping")
-        ingredients = await matcher.extract_recipe_ingredients(
-            recipe["recipe_text"],
-            products,
-            stock_info,
-            unit_preference,
+        ingredients = await _extract_ingredients(
+            matcher, recipe, catalog, stock_info, unit_preference,
             for_shopping_list=for_shopping_list
         )
         
-        print(f"🔍 LLM returned {len(ingredients)} ingredients for action_type='{action_type}'")
+        print(f"🔍 Got {len(ingredients)} ingredients for action_type='{action_type}'")
         for i, ing in enumerate(ingredients[:3]):  # Show first 3 for debugging
             print(f"  [{i}] product_id={ing.get('product_id')}, product_name={ing.get('product_name')}, quantity={ing.get('quantity')}, unit={ing.get('unit')}")
         
         # Format as ParsedItems (same structure as inventory parser)
         from ..models import ParsedItem
         
-        product_name_to_id = {p["name"].lower(): p["id"] for p in products if p.get("name")}
-        location_name_to_id = {loc["name"].lower(): loc["id"] for loc in locations if loc.get("name")}
-        unit_name_to_id = {unit["name"].lower(): unit["id"] for unit in quantity_units if unit.get("name")}
-        
         parsed_items = []
         for ing in ingredients:
             product_id = ing.get("product_id")
@@ -418,21 +580,14 @@ async def parse_recipe_ingredients(recipe_id: int, action_type: str = "consume")
             
             # If LLM provided product_id but no name, look up the name
             if product_id and not product_name:
-                matched_product = next(
-                    (p for p in products if p["id"] == product_id),
-                    None
-                )
+                matched_product = catalog.product_by_id(product_id)
                 if matched_product:
                     product_name = matched_product["name"]
                     print(f"✓ Looked up name for product ID {product_id}: {product_name}")
             
             # If LLM didn't provide product_id, try to match by name
             if not product_id and product_name:
-                # Try exact match first
-                matched_product = next(
-                    (p for p in products if p["name"].lower() == product_name.lower()),
-                    None
-                )
+                matched_product = catalog.find_product(product_name)
                 if matched_product:
                     product_id = matched_product["id"]
                     product_name = matched_product["name"]
@@ -448,18 +603,18 @@ async def parse_recipe_ingredients(recipe_id: int, action_type: str = "consume")
             location_id = None
             if product_id:
                 # Get location from existing product
-                product = next((p for p in products if p["id"] == product_id), None)
+                product = catalog.product_by_id(product_id)
                 if product:
                     location_id = product.get("location_id")
             
             # Guess location for new products
-            if not location_id and locations:
+            if not location_id and catalog.locations:
                 # Default to first location (usually Pantry or Fridge)
-                location_id = locations[0]["id"]
+                location_id = catalog.default_location_id()
             
             # Get unit ID
             unit_str = (ing.get("unit") or "").lower()
-            quantity_unit_id = unit_name_to_id.get(unit_str, 2) if unit_str else 2  # Default to Piece
+            quantity_unit_id = (catalog.unit_id(unit_str) or 2) if unit_str else 2  # Default to Piece
             
             # Ensure quantity and unit are never None
             quantity = ing.get("quantity")
@@ -484,6 +639,8 @@ async def parse_recipe_ingredients(recipe_id: int, action_type: str = "consume")
         
         return {"parsed_items": parsed_items}
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -522,16 +679,14 @@ async def consume_recipe_ingredients(recipe_id: int):
     
     try:
         # Get Grocy data
-        products = await grocy_client.get_products()
-        stock_info = await grocy_client.format_inventory_for_llm()
+        catalog, stock_info = await fetch_concurrently(
+            load_catalog(grocy_client), grocy_client.format_inventory_for_llm()
+        )
         unit_preference = config.get("unit_preference", "metric")
         
         # Extract and match ingredients
-        ingredients = await matcher.extract_recipe_ingredients(
-            recipe["recipe_text"],
-            products,
-            stock_info,
-            unit_preference
+        ingredients = await _extract_ingredients(
+            matcher, recipe, catalog, stock_info, unit_preference
         )
         
         # Consume ingredients that are in stock
@@ -541,6 +696,9 @@ async def consume_recipe_ingredients(recipe_id: int):
             "insufficient_stock": []
         }
         
+        # (ingredient, amount) pairs to consume, in recipe order
+        to_consume = []
+        
         for ingredient in ingredients:
             if not ingredient.get("product_id"):
                 results["skipped"].append({
@@ -570,25 +728,33 @@ async def consume_recipe_ingredients(recipe_id: int):
                 # Still consume what we have
                 needed_amount = stock_amount
             
-            try:
-                await grocy_client.consume_product(
-                    product_id=ingredient["product_id"],
-                    amount=needed_amount
-                )
-                
+            to_consume.append((ingredient, needed_amount))
+        
+        outcomes = await grocy_client.run_batch(
+            to_consume,
+            lambda entry: grocy_client.consume_product(
+                product_id=entry[0]["product_id"],
+                amount=entry[1]
+            )
+        )
+        
+        for (ingredient, needed_amount), (_, error) in zip(to_consume, outcomes):
+            if error is not None:
+                results["skipped"].append({
+                    "ingredient": ingredient["ingredient_text"],
+                    "reason": str(error)
+                })
+            else:
                 results["consumed"].append({
                     "product_name": ingredient["product_name"],
                     "quantity": needed_amount,
                     "unit": ingredient["unit"]
                 })
-            except Exception as e:
-                results["skipped"].append({
-                    "ingredient": ingredient["ingredient_text"],
-                    "reason": str(e)
-                })
         
         return results
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -627,16 +793,14 @@ async def add_missing_to_shopping_list(recipe_id: int):
     
     try:
         # Get Grocy data
-        products = await grocy_client.get_products()
-        stock_info = await grocy_client.format_inventory_for_llm()
+        catalog, stock_info = await fetch_concurrently(
+            load_catalog(grocy_client), grocy_client.format_inventory_for_llm()
+        )
         unit_preference = config.get("unit_preference", "metric")
         
         # Extract and match ingredients
-        ingredients = await matcher.extract_recipe_ingredients(
-            recipe["recipe_text"],
-            products,
-            stock_info,
-            unit_preference
+        ingredients = await _extract_ingredients(
+            matcher, recipe, catalog, stock_info, unit_preference
         )
         
         # Add missing ingredients to shopping list
@@ -645,6 +809,9 @@ async def add_missing_to_shopping_list(recipe_id: int):
             "skipped": []
         }
         
+        # (ingredient, amount, stock amount) to add, in recipe order
+        to_add = []
+        
         for ingredient in ingredients:
             # Skip if no product match
             if not ingredient.get("product_id"):
@@ -664,28 +831,35 @@ async def add_missing_to_shopping_list(recipe_id: int):
             
             # Calculate how much we need to buy
             amount_to_buy = needed_amount - stock_amount if stock_amount > 0 else needed_amount
-            
-            try:
-                await grocy_client.add_to_shopping_list(
-                    product_id=ingredient["product_id"],
-                    amount=amount_to_buy,
-                    note=f"For recipe: {recipe.get('cuisine', 'Recipe')}"
-                )
-                
+            to_add.append((ingredient, amount_to_buy, stock_amount))
+        
+        outcomes = await grocy_client.run_batch(
+            to_add,
+            lambda entry: grocy_client.add_to_shopping_list(
+                product_id=entry[0]["product_id"],
+                amount=entry[1],
+                note=f"For recipe: {recipe.get('cuisine', 'Recipe')}"
+            )
+        )
+        
+        for (ingredient, amount_to_buy, stock_amount), (_, error) in zip(to_add, outcomes):
+            if error is not None:
+                results["skipped"].append({
+                    "ingredient": ingredient["ingredient_text"],
+                    "reason": str(error)
+                })
+            else:
                 results["added"].append({
                     "product_name": ingredient["product_name"],
                     "quantity": amount_to_buy,
                     "unit": ingredient["unit"],
                     "reason": "Not in stock" if stock_amount == 0 else f"Insufficient (have {stock_amount})"
                 })
-            except Exception as e:
-                results["skipped"].append({
-                    "ingredient": ingredient["ingredient_text"],
-                    "reason": str(e)
-                })
         
         return results
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -730,30 +904,17 @@ async def save_recipe_to_grocy(recipe_id: int):
     
     try:
         # Format recipe for Grocy (strip Elzar's voice, clean formatting)
-        formatted_recipe = await llm_client.format_recipe_for_grocy(recipe["recipe_text"])
-        
-        # Get Grocy data
-        products = await grocy_client.get_products()
-        stock_info = await grocy_client.format_inventory_for_llm()
-        quantity_units = await grocy_client.get_quantity_units()
+        # while fetching Grocy data
+        formatted_recipe, catalog, stock_info = await fetch_concurrently(
+            llm_client.format_recipe_for_grocy(recipe["recipe_text"]),
+            load_catalog(grocy_client),
+            grocy_client.format_inventory_for_llm()
+        )
         unit_preference = config.get("unit_preference", "metric")
         
-        # Create unit lookup
-        unit_lookup = {qu["name"].lower(): qu["id"] for qu in quantity_units}
-        unit_lookup.update({
-            "count": unit_lookup.get("piece", unit_lookup.get("pcs", 1)),
-            "g": unit_lookup.get("gram", unit_lookup.get("g", 1)),
-            "kg": unit_lookup.get("kilogram", unit_lookup.get("kg", 1)),
-            "ml": unit_lookup.get("milliliter", unit_lookup.get("ml", 1)),
-            "l": unit_lookup.get("liter", unit_lookup.get("l", 1)),
-        })
-        
         # Extract and match ingredients (use original recipe for LLM parsing)
-        ingredients = await matcher.extract_recipe_ingredients(
-            recipe["recipe_text"],
-            products,
-            stock_info,
-            unit_preference
+        ingredients = await _extract_ingredients(
+            matcher, recipe, catalog, stock_info, unit_preference
         )
         
         # Extract recipe title from formatted text (first line, remove markdown #)
@@ -789,6 +950,9 @@ async def save_recipe_to_grocy(recipe_id: int):
             "ingredients_skipped": []
         }
         
+        # (ingredient, quantity unit ID) to link, in recipe order
+        to_link = []
+        
         for ingredient in ingredients:
             if not ingredient.get("product_id"):
                 results["ingredients_skipped"].append({
@@ -799,30 +963,36 @@ async def save_recipe_to_grocy(recipe_id: int):
             
             # Get quantity unit ID
             unit_str = ingredient.get("unit", "").lower() if ingredient.get("unit") else "unit"
-            qu_id = unit_lookup.get(unit_str, 2)  # Default to Piece
-            
-            try:
-                await grocy_client.add_recipe_ingredient(
-                    recipe_id=grocy_recipe_id,
-                    product_id=ingredient["product_id"],
-                    amount=ingredient["quantity"],
-                    qu_id=qu_id,
-                    note=""
-                )
-                
+            to_link.append((ingredient, catalog.unit_id(unit_str) or 2))  # Default to Piece
+        
+        outcomes = await grocy_client.run_batch(
+            to_link,
+            lambda entry: grocy_client.add_recipe_ingredient(
+                recipe_id=grocy_recipe_id,
+                product_id=entry[0]["product_id"],
+                amount=entry[0]["quantity"],
+                qu_id=entry[1],
+                note=""
+            )
+        )
+        
+        for (ingredient, _), (_, error) in zip(to_link, outcomes):
+            if error is not None:
+                results["ingredients_skipped"].append({
+                    "ingredient": ingredient["ingredient_text"],
+                    "reason": str(error)
+                })
+            else:
                 results["ingredients_added"].append({
                     "product_name": ingredient["product_name"],
                     "quantity": ingredient["quantity"],
                     "unit": ingredient["unit"]
                 })
-            except Exception as e:
-                results["ingredients_skipped"].append({
-                    "ingredient": ingredient["ingredient_text"],
-                    "reason": str(e)
-                })
         
         return results
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -863,25 +1033,12 @@ async def save_recipe_to_grocy_reviewed(recipe_id: int, request: InventoryAction
     
     try:
         # Format recipe for Grocy (strip Elzar's voice, clean formatting)
-        formatted_recipe = await llm_client.format_recipe_for_grocy(recipe["recipe_text"])
-        
-        # Get Grocy data for product creation
-        quantity_units = await grocy_client.get_quantity_units()
-        locations = await grocy_client.get_locations()
-        default_location_id = locations[0]["id"] if locations else 1
-        
-        # Create unit lookup
-        unit_lookup = {qu["name"].lower(): qu["id"] for qu in quantity_units}
-        unit_lookup.update({
-            "count": unit_lookup.get("piece", unit_lookup.get("pcs", 1)),
-            "g": unit_lookup.get("gram", unit_lookup.get("g", 1)),
-            "kg": unit_lookup.get("kilogram", unit_lookup.get("kg", 1)),
-            "ml": unit_lookup.get("milliliter", unit_lookup.get("ml", 1)),
-            "l": unit_lookup.get("liter", unit_lookup.get("l", 1)),
-            "oz": unit_lookup.get("ounce", unit_lookup.get("oz", 1)),
-            "lb": unit_lookup.get("pound", unit_lookup.get("lb", 1)),
-            "fl oz": unit_lookup.get("fluid ounce", unit_lookup.get("fl oz", 1)),
-        })
+        # while fetching Grocy data for product creation
+        formatted_recipe, catalog = await fetch_concurrently(
+            llm_client.format_recipe_for_grocy(recipe["recipe_text"]),
+            load_catalog(grocy_client)
+        )
+        default_location_id = catalog.default_location_id()
         
         # Extract recipe title from formatted text
         recipe_lines = formatted_recipe.split("\n")
@@ -897,9 +1054,229 @@ async def save_recipe_to_grocy_reviewed(recipe_id: int, request: InventoryAction
                     servings = int(numbers[0])
                     break
         
-        # Get all products for unit lookup
-        all_products = await grocy_client.get_products()
-        product_units = {p["id"]: p.get("qu_id_stock", 1) for p in all_products}
+        # Process reviewed ingredients - create missing products
+        results = {
+            "grocy_recipe_id": None,
+            "recipe_name": recipe_title,
+            "servings": servings,
+            "ingredients_added": [],
+            "ingredients_skipped": [],
+            "created_products": []
+        }
+        
+        # Items needing the same new unit must not both try to create it
+        unit_lock = asyncio.Lock()
+        
+        # Common units to auto-create if missing
+        common_units = {
+            "g": ("Gram", "Grams"),
+            "kg": ("Kilogram", "Kilograms"),
+            "oz": ("Ounce", "Ounces"),
+            "lb": ("Pound", "Pounds"),
+            "ml": ("Milliliter", "Milliliters"),
+            "l": ("Liter", "Liters"),
+            "fl oz": ("Fluid Ounce", "Fluid Ounces"),
+        }
+        
+        async def resolve_unit(unit_lower: str) -> int:
+            """Get or create the quantity unit for a new product"""
+            nonlocal catalog
+            async with unit_lock:
+                qu_id = catalog.unit_id(unit_lower)
+                
+                if not qu_id and unit_lower in common_units:
+                    name, plural = common_units[unit_lower]
+                    try:
+                        created_unit = await grocy_client.create_quantity_unit(name, plural, unit_lower)
+                        qu_id = created_unit["created_object_id"]
+                        catalog.add_unit(unit_lower, qu_id)
+                    except Exception as unit_error:
+                        if "constraint" in str(unit_error).lower() or "unique" in str(unit_error).lower():
+                            catalog = await load_catalog(grocy_client)
+                            qu_id = catalog.unit_id(unit_lower) or catalog.unit_id(name)
+                
+                return qu_id or catalog.unit_id("unit") or 1
+        
+        async def resolve_product(item: InventoryItem) -> Tuple[Optional[int], bool]:
+            """The item's product ID, creating the product if requested; and whether it was created"""
+            if not (item.create_if_missing and not item.product_id):
+                return item.product_id, False
+            
+            qu_id = await resolve_unit(item.unit.lower() if item.unit else "unit")
+            try:
+                created_product = await grocy_client.create_product(
+                    name=item.product_name,
+                    location_id=item.location_id or default_location_id,
+                    qu_id_stock=qu_id
+                )
+                return created_product["created_object_id"], True
+            except Exception as product_error:
+                if "constraint" in str(product_error).lower() or "unique" in str(product_error).lower():
+                    matching_product = (await load_catalog(grocy_client)).find_product(item.product_name)
+                    if matching_product:
+                        return matching_product["id"], False
+                return None, False
+        
+        # Create the recipe while missing products are created concurrently;
+        # only the ingredient links need both
+        created_recipe, resolved = await fetch_concurrently(
+            grocy_client.create_recipe(
+                name=recipe_title,
+                description=formatted_recipe,
+                base_servings=servings
+            ),
+            grocy_client.run_batch(request.items, resolve_product)
+        )
+        
+        grocy_recipe_id = created_recipe["created_object_id"]
+        results["grocy_recipe_id"] = grocy_recipe_id
+        
+        # One ("ingredients_added" | "ingredients_skipped", entry) per item,
+        # so results keep request order
+        outcomes: List[Optional[Tuple[str, Dict]]] = [None] * len(request.items)
+        processed_ingredients = []
+        
+        for index, (item, (resolution, error)) in enumerate(zip(request.items, resolved)):
+            if error is not None:
+                outcomes[index] = ("ingredients_skipped", {
+                    "ingredient": item.product_name,
+                    "reason": str(error)
+                })
+                continue
+            
+            product_id, created = resolution
+            if created:
+                results["created_products"].append({
+                    "name": item.product_name,
+                    "id": product_id
+                })
+            
+            if not product_id:
+                outcomes[index] = ("ingredients_skipped", {
+                    "ingredient": item.product_name,
+                    "reason": "No product ID and creation not enabled"
+                })
+                continue
+            
+            # Use the product's stock quantity unit to avoid conversion errors
+            product = catalog.product_by_id(product_id)
+            qu_id = product.get("qu_id_stock", 1) if product else None
+            
+            # If we don't have the unit (newly created product), refresh the catalog
+            if qu_id is None:
+                catalog = await load_catalog(grocy_client)
+                product = catalog.product_by_id(product_id)
+                qu_id = product.get("qu_id_stock") if product else None
+            
+            # If still no unit found, skip this ingredient with a helpful error
+            if qu_id is None:
+                outcomes[index] = ("ingredients_skipped", {
+                    "ingredient": item.product_name,
+                    "reason": f"Product ID {product_id} has no stock unit defined in Grocy"
+                })
+                continue
+            
+            processed_ingredients.append({
+                "index": index,
+                "product_id": product_id,
+                "product_name": item.product_name,
+                "amount": item.amount,
+                "unit": item.unit,
+                "qu_id": qu_id
+            })
+        
+        # Add ingredients to recipe
+        added = await grocy_client.run_batch(
+            processed_ingredients,
+            lambda ingredient: grocy_client.add_recipe_ingredient(
+                recipe_id=grocy_recipe_id,
+                product_id=ingredient["product_id"],
+                amount=ingredient["amount"],
+                qu_id=ingredient["qu_id"],
+                note=""
+            )
+        )
+        
+        for ingredient, (_, error) in zip(processed_ingredients, added):
+            if error is not None:
+                outcomes[ingredient["index"]] = ("ingredients_skipped", {
+                    "ingredient": ingredient["product_name"],
+                    "reason": str(error)
+                })
+            else:
+                outcomes[ingredient["index"]] = ("ingredients_added", {
+                    "product_name": ingredient["product_name"],
+                    "quantity": ingredient["amount"],
+                    "unit": ingredient["unit"]
+                })
+        
+        for kind, entry in outcomes:
+            results[kind].append(entry)
+        
+        return results
+        
+    except GrocyUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error saving recipe to Grocy: {str(e)}"
+        )
+
+
+@router.post("/{recipe_id}/save-to-grocy-reviewed")
+async def save_recipe_to_grocy_reviewed(recipe_id: int, request: InventoryActionRequest):
+    """
+    Save recipe to Grocy with reviewed ingredients
+    
+    This endpoint:
+    1. Gets the recipe from database
+    2. Uses LLM to format the recipe cleanly
+    3. Creates missing products if requested
+    4. Creates recipe in Grocy
+    5. Links reviewed ingredients to the recipe
+    6. Returns Grocy recipe ID and summary
+    """
+    config = await get_effective_config()
+    
+    # Get recipe
+    recipe = await db.get_recipe(recipe_id)
+    if not recipe:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recipe not found"
+        )
+    
+    # Initialize clients
+    grocy_client = GrocyClient(config["grocy_url"], config["grocy_api_key"])
+    llm_client = LLMClient(
+        config["llm_api_url"],
+        config["llm_api_key"],
+        config["llm_model"]
+    )
+    
+    try:
+        # Format recipe for Grocy (strip Elzar's voice, clean formatting)
+        # while fetching Grocy data for product creation
+        formatted_recipe, catalog = await fetch_concurrently(
+            llm_client.format_recipe_for_grocy(recipe["recipe_text"]),
+            load_catalog(grocy_client)
+        )
+        default_location_id = catalog.default_location_id()
+        
+        # Extract recipe title from formatted text
+        recipe_lines = formatted_recipe.split("\n")
+        recipe_title = recipe_lines[0].replace("#", "").strip() if recipe_lines else "Elzar Recipe"
+        
+        # Infer servings from formatted recipe text
+        servings = 4  # Default
+        for line in recipe_lines[:10]:
+            if "serving" in line.lower():
+                import re
+                numbers = re.findall(r'\d+', line)
+                if numbers:
+                    servings = int(numbers[0])
+                    break
         
         # Process reviewed ingredients - create missing products
         results = {
@@ -920,7 +1297,7 @@ async def save_recipe_to_grocy_reviewed(recipe_id: int, request: InventoryAction
             if item.create_if_missing and not product_id:
                 # Get or create unit
                 unit_lower = item.unit.lower() if item.unit else "unit"
-                qu_id = unit_lookup.get(unit_lower)
+                qu_id = catalog.unit_id(unit_lower)
                 
                 if not qu_id:
                     # Try to create common units
@@ -939,15 +1316,14 @@ async def save_recipe_to_grocy_reviewed(recipe_id: int, request: InventoryAction
                         try:
                             created_unit = await grocy_client.create_quantity_unit(name, plural, unit_lower)
                             qu_id = created_unit["created_object_id"]
-                            unit_lookup[unit_lower] = qu_id
+                            catalog.add_unit(unit_lower, qu_id)
                         except Exception as unit_error:
                             if "constraint" in str(unit_error).lower() or "unique" in str(unit_error).lower():
-                                existing_units = await grocy_client.get_quantity_units()
-                                unit_lookup = {u["name"].lower(): u["id"] for u in existing_units}
-                                qu_id = unit_lookup.get(unit_lower) or unit_lookup.get(name.lower())
+                                catalog = await load_catalog(grocy_client)
+                                qu_id = catalog.unit_id(unit_lower) or catalog.unit_id(name)
                     
                     if not qu_id:
-                        qu_id = unit_lookup.get("unit", 1)
+                        qu_id = catalog.unit_id("unit") or 1
                 
                 # Create product
                 try:
@@ -963,24 +1339,21 @@ async def save_recipe_to_grocy_reviewed(recipe_id: int, request: InventoryAction
                     })
                 except Exception as product_error:
                     if "constraint" in str(product_error).lower() or "unique" in str(product_error).lower():
-                        products = await grocy_client.get_products()
-                        matching_product = next(
-                            (p for p in products if p["name"].lower() == item.product_name.lower()),
-                            None
-                        )
+                        catalog = await load_catalog(grocy_client)
+                        matching_product = catalog.find_product(item.product_name)
                         if matching_product:
                             product_id = matching_product["id"]
             
             if product_id:
                 # Use the product's stock quantity unit to avoid conversion errors
-                qu_id = product_units.get(product_id)
+                product = catalog.product_by_id(product_id)
+                qu_id = product.get("qu_id_stock", 1) if product else None
                 
-                # If we don't have the unit (newly created product), refresh the list
+                # If we don't have the unit (newly created product), refresh the catalog
                 if qu_id is None:
-                    # Refresh product list
-                    all_products = await grocy_client.get_products()
-                    product_units = {p["id"]: p.get("qu_id_stock") for p in all_products}
-                    qu_id = product_units.get(product_id)
+                    catalog = await load_catalog(grocy_client)
+                    product = catalog.product_by_id(product_id)
+                    qu_id = product.get("qu_id_stock") if product else None
                 
                 # If still no unit found, skip this ingredient with a helpful error
                 if qu_id is None:
@@ -1014,29 +1387,34 @@ async def save_recipe_to_grocy_reviewed(recipe_id: int, request: InventoryAction
         results["grocy_recipe_id"] = grocy_recipe_id
         
         # Add ingredients to recipe
-        for ingredient in processed_ingredients:
-            try:
-                await grocy_client.add_recipe_ingredient(
-                    recipe_id=grocy_recipe_id,
-                    product_id=ingredient["product_id"],
-                    amount=ingredient["amount"],
-                    qu_id=ingredient["qu_id"],
-                    note=""
-                )
-                
+        outcomes = await grocy_client.run_batch(
+            processed_ingredients,
+            lambda ingredient: grocy_client.add_recipe_ingredient(
+                recipe_id=grocy_recipe_id,
+                product_id=ingredient["product_id"],
+                amount=ingredient["amount"],
+                qu_id=ingredient["qu_id"],
+                note=""
+            )
+        )
+        
+        for ingredient, (_, error) in zip(processed_ingredients, outcomes):
+            if error is not None:
+                results["ingredients_skipped"].append({
+                    "ingredient": ingredient["product_name"],
+                    "reason": str(error)
+                })
+            else:
                 results["ingredients_added"].append({
                     "product_name": ingredient["product_name"],
                     "quantity": ingredient["amount"],
                     "unit": ingredient["unit"]
                 })
-            except Exception as e:
-                results["ingredients_skipped"].append({
-                    "ingredient": ingredient["product_name"],
-                    "reason": str(e)
-                })
         
         return results
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
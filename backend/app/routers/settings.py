@@ -4,8 +4,8 @@ from typing import Dict, Any, Optional
 
 from ..database import db
 from ..config import settings
-from ..utils.config_manager import get_effective_config
-from ..services.grocy_client import GrocyClient
+from ..utils.config_manager import get_effective_config, invalidate_config, refresh_config
+from ..services.grocy_client import GrocyClient, GrocyUnavailableError
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
 
@@ -117,6 +117,9 @@ async def update_core_config(update: CoreConfigUpdate):
         
         if update.unit_preference is not None:
             await db.set_setting("unit_preference", update.unit_preference)
+        
+        # Reload the cached config so the next request sees the new values
+        await refresh_config()
             
         return {
             "status": "success", 
@@ -124,6 +127,8 @@ async def update_core_config(update: CoreConfigUpdate):
         }
         
     except Exception as e:
+        # Some settings may have been written before the failure
+        invalidate_config()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update configuration: {str(e)}"
@@ -154,6 +159,7 @@ async def get_setting(key: str) -> Dict[str, Any]:
 async def set_setting(key: str, setting: SettingValue):
     """Set a setting value"""
     await db.set_setting(key, setting.value)
+    await refresh_config()
     return {"status": "success", "key": key, "value": setting.value}
 
 
@@ -173,6 +179,8 @@ async def test_grocy_connection():
             "message": "Successfully connected to Grocy",
             "items_count": len(stock)
         }
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -354,6 +362,8 @@ async def setup_unit_conversions():
             "details": results
         }
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -423,6 +433,8 @@ async def setup_locations():
             "details": results
         }
         
+    except GrocyUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,7 +1,251 @@
+import asyncio
+import random
+import time
 import httpx
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Callable, Awaitable
 from datetime import datetime
 
+from ..config import settings
+from .http_pool import KeyedClientPool
+from .stock_mirror import stock_mirror
+
+
+def _build_grocy_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.grocy_max_connections,
+        max_keepalive_connections=settings.grocy_max_keepalive_connections,
+        keepalive_expiry=settings.grocy_keepalive_expiry
+    )
+    try:
+        return httpx.AsyncClient(limits=limits, http2=settings.grocy_http2)
+    except ImportError:
+        # HTTP/2 needs the optional h2 package (pip install httpx[http2])
+        print("⚠️ GROCY_HTTP2 is enabled but h2 is not installed, using HTTP/1.1")
+        return httpx.AsyncClient(limits=limits)
+
+
+# Global Grocy connection pool, keyed by URL and API key; a replaced client
+# is kept open for the longest per-request timeout
+grocy_pool = KeyedClientPool(
+    _build_grocy_client,
+    retire_delay=max(settings.grocy_read_timeout, settings.grocy_write_timeout)
+)
+
+
+# Responses that mean Grocy (or a proxy in front of it) is struggling
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+
+class GrocyUnavailableError(Exception):
+    """Raised without contacting Grocy while its circuit breaker is open"""
+    
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one Grocy instance
+    
+    After failure_threshold consecutive failed requests (connection
+    errors, timeouts, 5xx responses; a request counts once however often
+    it was retried) the circuit opens and requests fail fast for
+    reset_timeout seconds. Then a single trial request is let through:
+    success closes the circuit, failure opens it again.
+    """
+    
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._retry_at = 0.0
+    
+    def before_request(self):
+        """Raise GrocyUnavailableError if requests should fail fast"""
+        if self.state == "closed":
+            return
+        now = time.monotonic()
+        if now < self._retry_at:
+            raise GrocyUnavailableError(
+                f"Grocy is unavailable, retrying in {self._retry_at - now:.0f}s",
+                retry_after=self._retry_at - now
+            )
+        # Let this request through as the trial; others keep failing fast
+        # until it finishes (or another reset_timeout passes)
+        self.state = "half_open"
+        self._retry_at = now + self.reset_timeout
+    
+    def record_success(self):
+        if self.state != "closed":
+            print("✅ Grocy is reachable again, circuit breaker closed")
+        self.state = "closed"
+        self.failures = 0
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                print(f"⚠️ Grocy circuit breaker opened after {self.failures} failures")
+            self.state = "open"
+            self._retry_at = time.monotonic() + self.reset_timeout
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in_seconds": (
+                round(max(0.0, self._retry_at - time.monotonic()), 1)
+                if self.state != "closed" else 0
+            )
+        }
+
+
+# In-flight GETs per (Grocy URL, API key, path), shared by concurrent callers
+_inflight: Dict[Tuple[str, str, str], asyncio.Task] = {}
+
+
+# Circuit breakers per Grocy URL
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(base_url: str) -> CircuitBreaker:
+    if base_url not in _breakers:
+        _breakers[base_url] = CircuitBreaker(
+            settings.grocy_breaker_failure_threshold,
+            settings.grocy_breaker_reset_timeout
+        )
+    return _breakers[base_url]
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Circuit breaker state per Grocy URL, for the health endpoint"""
+    return {base_url: breaker.status() for base_url, breaker in _breakers.items()}
+
+
+async def fetch_concurrently(*aws):
+    """
+    Await several coroutines concurrently and return their results in order
+    
+    If one fails, the others are cancelled and its exception is re-raised
+    as-is rather than wrapped in an ExceptionGroup, so callers keep their
+    existing except clauses.
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(aw) for aw in aws]
+    except BaseExceptionGroup as eg:
+        error = eg.exceptions[0]
+        while isinstance(error, BaseExceptionGroup):
+            error = error.exceptions[0]
+        raise error
+    return [task.result() for task in tasks]
+
+
+def grocy_query_string(query: Iterable[str]) -> str:
+    """
+    Build a query string for Grocy's list filtering
+    
+    query holds Grocy conditions such as "product_id=5", "name~milk" or
+    "id§^(1|2)$" (regex). Returns "" when there are none, otherwise "?"
+    and the encoded parameters.
+    """
+    params = [("query[]", condition) for condition in query]
+    return f"?{httpx.QueryParams(params)}" if params else ""
+
+
+def project(rows: List[Dict[str, Any]], fields: Iterable[str]) -> List[Dict[str, Any]]:
+    """Keep only the given fields of each row"""
+    fields = tuple(fields)
+    return [{field: row[field] for field in fields if field in row} for row in rows]
+
+
+class GrocyMasterDataCache:
+    """
+    Cache for rarely-changing Grocy master data (products, locations, units)
+    
+    Entries are served from memory for master_data_ttl seconds. After that
+    they are revalidated against Grocy's /api/system/db-changed-time, and
+    only refetched if the Grocy database changed since they were loaded.
+    Our own writes invalidate the affected entities explicitly; stock-only
+    writes (purchase, consume) leave master data alone and only mark the
+    stock mirror as needing a re-check.
+    """
+    
+    def __init__(self):
+        # entity -> (data, Grocy changed_time when loaded, monotonic time last validated)
+        self._entries: Dict[str, Tuple[Any, Optional[str], float]] = {}
+        # Bumped on invalidation so fetches that started earlier aren't stored
+        self._generation = 0
+        # Bumped whenever cached data is replaced or dropped
+        self._version = 0
+        # Bumped by any write, so the stock mirror re-checks Grocy
+        self._stock_generation = 0
+        self._probe: Optional[asyncio.Task] = None
+    
+    def get_fresh(self, entity: str, ttl: float) -> Optional[Any]:
+        """Return cached data still inside its TTL, or None"""
+        entry = self._entries.get(entity)
+        if entry is not None and time.monotonic() - entry[2] < ttl:
+            return entry[0]
+        return None
+    
+    def get_stale(self, entity: str) -> Optional[Tuple[Any, Optional[str]]]:
+        """Return (data, changed_time) for an expired entry, or None"""
+        entry = self._entries.get(entity)
+        return (entry[0], entry[1]) if entry is not None else None
+    
+    @property
+    def generation(self) -> int:
+        return self._generation
+    
+    @property
+    def stock_generation(self) -> int:
+        """Changes whenever one of our writes may have changed stock"""
+        return self._stock_generation
+    
+    @property
+    def version(self) -> int:
+        """Changes whenever the cached master data may have changed"""
+        return self._version
+    
+    def store(self, entity: str, data: Any, changed_time: Optional[str], generation: int):
+        """Cache data fetched at the given generation, unless invalidated since"""
+        if generation == self._generation:
+            entry = self._entries.get(entity)
+            if entry is None or entry[0] is not data:
+                self._version += 1
+            self._entries[entity] = (data, changed_time, time.monotonic())
+    
+    def invalidate(self, *entities: str):
+        """Drop the given entities, or everything if none are given"""
+        self._generation += 1
+        self._version += 1
+        self._stock_generation += 1
+        if not entities:
+            self._entries.clear()
+        for entity in entities:
+            self._entries.pop(entity, None)
+    
+    def invalidate_stock(self):
+        """Mark stock as changed without dropping any master data"""
+        self._stock_generation += 1
+    
+    async def changed_time(self, fetch) -> Optional[str]:
+        """Grocy's db-changed-time, shared by concurrent callers"""
+        if self._probe is None or self._probe.done():
+            self._probe = asyncio.create_task(fetch())
+        try:
+            return await asyncio.shield(self._probe)
+        except Exception:
+            # Unknown change state means the data must be refetched
+            return None
+
+
+# Master data caches per (Grocy URL, API key)
+_master_data_caches: Dict[Tuple[str, str], GrocyMasterDataCache] = {}
+
 
 class GrocyClient:
     """Client for interacting with Grocy API"""
@@ -14,49 +258,191 @@ class GrocyClient:
             "Accept": "application/json"
         }
     
-    async def get_stock(self) -> List[Dict[str, Any]]:
-        """Get current stock/inventory from Grocy"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/stock",
-                headers=self.headers,
-                timeout=30.0
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client for this Grocy instance"""
+        return grocy_pool.get(self.base_url, self.api_key)
+    
+    @property
+    def cache(self) -> GrocyMasterDataCache:
+        """Master data cache shared by clients for this Grocy instance"""
+        key = (self.base_url, self.api_key)
+        if key not in _master_data_caches:
+            _master_data_caches[key] = GrocyMasterDataCache()
+        return _master_data_caches[key]
+    
+    async def _request(self, method: str, path: str, json: Any = None) -> httpx.Response:
+        """
+        Send a request to Grocy through the circuit breaker
+        
+        GETs are idempotent, so transient failures (connection errors,
+        timeouts, 502/503/504) are retried with jittered exponential
+        backoff. Writes are sent once. Reads and writes have separate
+        timeouts so a hung Grocy doesn't hold a request for long.
+        """
+        breaker = get_breaker(self.base_url)
+        idempotent = method == "GET"
+        attempts = 1 + (settings.grocy_retry_attempts if idempotent else 0)
+        timeout = httpx.Timeout(
+            settings.grocy_read_timeout if idempotent else settings.grocy_write_timeout,
+            connect=settings.grocy_connect_timeout
+        )
+        
+        # The breaker sees one outcome per call, not one per attempt
+        breaker.before_request()
+        for attempt in range(attempts):
+            try:
+                response = await self.client.request(
+                    method,
+                    f"{self.base_url}{path}",
+                    headers=self.headers,
+                    json=json,
+                    timeout=timeout
+                )
+            except httpx.TransportError:
+                if attempt + 1 >= attempts:
+                    breaker.record_failure()
+                    raise
+            else:
+                if response.status_code < 500:
+                    breaker.record_success()
+                    return response
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt + 1 >= attempts:
+                    breaker.record_failure()
+                    return response
+            
+            # Full jitter: sleep a random time up to the exponential bound
+            await asyncio.sleep(random.uniform(0, settings.grocy_retry_backoff * 2 ** attempt))
+    
+    async def _get_json(self, path: str) -> Any:
+        """
+        GET a Grocy path and return the parsed JSON, coalescing concurrent calls
+        
+        Identical GETs issued while one is already in flight wait for that
+        request instead of sending their own, and all get the same parsed
+        result, so treat it as read-only. This sits below the caches, so a
+        burst of cache misses still reaches Grocy only once.
+        """
+        key = (self.base_url, self.api_key, path)
+        task = _inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_json(path))
+            _inflight[key] = task
+            task.add_done_callback(lambda t: self._forget_inflight(key, t))
+        # A cancelled caller must not cancel the request others are waiting on
+        return await asyncio.shield(task)
+    
+    @staticmethod
+    def _forget_inflight(key: Tuple[str, str, str], task: asyncio.Task):
+        if _inflight.get(key) is task:
+            del _inflight[key]
+        if not task.cancelled():
+            # Mark the error as retrieved even if every caller went away
+            task.exception()
+    
+    async def _fetch_json(self, path: str) -> Any:
+        response = await self._request("GET", path)
+        response.raise_for_status()
+        return response.json()
+    
+    async def run_batch(
+        self,
+        items: Iterable[Any],
+        operation: Callable[[Any], Awaitable[Any]],
+        concurrency: Optional[int] = None
+    ) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Run a Grocy operation for each item with bounded concurrency
+        
+        Items run concurrently, at most `concurrency` at a time (default
+        GROCY_WRITE_CONCURRENCY). Each item's operation still runs its own
+        steps in order, so creating a product and then purchasing it stays
+        ordered. Returns a (result, error) pair per item in item order; one
+        item failing doesn't cancel the others.
+        """
+        limit = concurrency or settings.grocy_write_concurrency
+        semaphore = asyncio.Semaphore(max(1, limit))
+        
+        async def run(item):
+            async with semaphore:
+                try:
+                    return await operation(item), None
+                except Exception as e:
+                    return None, e
+        
+        return await asyncio.gather(*(run(item) for item in items))
+    
+    async def get_db_changed_time(self) -> str:
+        """Get the time the Grocy database last changed"""
+        return (await self._get_json("/api/system/db-changed-time"))["changed_time"]
+    
+    async def _get_master_data(self, entity: str) -> List[Dict[str, Any]]:
+        """
+        Get /api/objects/{entity} through the master data cache
+        
+        Returns a new list each time so callers can't modify the cached one.
+        """
+        cache = self.cache
+        data = cache.get_fresh(entity, settings.grocy_master_data_ttl)
+        if data is not None:
+            return list(data)
+        
+        generation = cache.generation
+        stale = cache.get_stale(entity)
+        if stale is not None:
+            changed_time = await cache.changed_time(self.get_db_changed_time)
+            if changed_time is not None and changed_time == stale[1]:
+                cache.store(entity, stale[0], changed_time, generation)
+                return list(stale[0])
+            try:
+                data = await self._fetch_objects(entity)
+            except (httpx.TransportError, GrocyUnavailableError) as e:
+                # Master data rarely changes; keep working while Grocy is down
+                print(f"⚠️ Grocy unreachable, serving cached {entity}: {e}")
+                return list(stale[0])
+        else:
+            # Read the change time alongside the data; if Grocy changes in
+            # between, the older stamp just causes a refetch next time
+            changed_time, data = await fetch_concurrently(
+                cache.changed_time(self.get_db_changed_time),
+                self._fetch_objects(entity)
             )
-            response.raise_for_status()
-            return response.json()
+        
+        cache.store(entity, data, changed_time, generation)
+        return list(data)
+    
+    async def _fetch_objects(self, entity: str) -> List[Dict[str, Any]]:
+        return await self._get_json(f"/api/objects/{entity}")
+    
+    async def get_stock(self, product_ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Get current stock/inventory from Grocy
+        
+        Each stock row embeds its full product, so when only some products
+        matter pass their IDs and Grocy filters the rows server-side.
+        """
+        if product_ids is None:
+            return await self._get_json("/api/stock")
+        ids = sorted({int(product_id) for product_id in product_ids})
+        if not ids:
+            return []
+        if len(ids) == 1:
+            condition = f"product_id={ids[0]}"
+        else:
+            condition = f"product_id§^({'|'.join(map(str, ids))})$"
+        return await self._get_json(f"/api/stock{grocy_query_string([condition])}")
     
     async def get_volatile_stock(self) -> List[Dict[str, Any]]:
         """Get stock with expiration information (volatile stock)"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/stock/volatile",
-                headers=self.headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._get_json("/api/stock/volatile")
     
     async def get_products(self) -> List[Dict[str, Any]]:
-        """Get all products"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/objects/products",
-                headers=self.headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        """Get all products (cached)"""
+        return await self._get_master_data("products")
     
     async def get_product_details(self, product_id: int) -> Dict[str, Any]:
         """Get details for a specific product"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/stock/products/{product_id}",
-                headers=self.headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._get_json(f"/api/stock/products/{product_id}")
     
     async def format_inventory_for_llm(
         self, 
@@ -65,71 +451,84 @@ class GrocyClient:
         """
         Format Grocy inventory into a structure suitable for LLM prompts
         
+        Reads from the local stock mirror, which only re-downloads stock
+        when Grocy changed.
+        
         Returns a dict with:
         - available_items: List of items with quantities
         - expiring_soon: List of items expiring soon (if prioritize_expiring)
         """
         try:
-            stock = await self.get_stock()
-            volatile_stock = await self.get_volatile_stock() if prioritize_expiring else []
-            products = await self.get_products()
-            
-            # Create a product lookup
-            product_lookup = {p["id"]: p for p in products}
+            snapshot = await stock_mirror.get(self)
+        except httpx.HTTPError as e:
+            raise Exception(f"Error fetching Grocy inventory: {str(e)}")
+        
+        result = snapshot.formatted(
+            prioritize_expiring,
+            lambda: self._format_inventory(
+                snapshot.stock,
+                snapshot.volatile if prioritize_expiring else [],
+                snapshot.products,
+                prioritize_expiring
+            )
+        )
+        # Copy the lists so callers can't modify the shared snapshot
+        return {key: list(items) for key, items in result.items()}
+    
+    @staticmethod
+    def _format_inventory(
+        stock: List[Dict[str, Any]],
+        volatile_stock: Any,
+        products: List[Dict[str, Any]],
+        prioritize_expiring: bool
+    ) -> Dict[str, Any]:
+        """Build the LLM inventory structure from raw Grocy stock and products"""
+        # Create a product lookup
+        product_lookup = {p["id"]: p for p in products}
+        
+        # Format available items
+        available_items = []
+        for item in stock:
+            product_id = item.get("product_id")
+            product = product_lookup.get(product_id, {})
             
-            # Format available items
-            available_items = []
-            for item in stock:
+            available_items.append({
+                "name": product.get("name", "Unknown"),
+                "amount": item.get("amount", 0),
+                "unit": item.get("quantity_unit_stock", {}).get("name", "unit"),
+                "product_id": product_id
+            })
+        
+        result = {
+            "available_items": available_items,
+            "expiring_soon": []
+        }
+        
+        # Add expiring items if requested
+        if prioritize_expiring and volatile_stock:
+            expiring_items = []
+            for item in volatile_stock:
                 product_id = item.get("product_id")
                 product = product_lookup.get(product_id, {})
+                best_before = item.get("best_before_date")
                 
-                available_items.append({
-                    "name": product.get("name", "Unknown"),
-                    "amount": item.get("amount", 0),
-                    "unit": item.get("quantity_unit_stock", {}).get("name", "unit"),
-                    "product_id": product_id
-                })
-            
-            result = {
-                "available_items": available_items,
-                "expiring_soon": []
-            }
-            
-            # Add expiring items if requested
-            if prioritize_expiring and volatile_stock:
-                expiring_items = []
-                for item in volatile_stock:
-                    product_id = item.get("product_id")
-                    product = product_lookup.get(product_id, {})
-                    best_before = item.get("best_before_date")
-                    
-                    if best_before:
-                        expiring_items.append({
-                            "name": product.get("name", "Unknown"),
-                            "amount": item.get("amount", 0),
-                            "expiry_date": best_before,
-                            "product_id": product_id
-                        })
-                
-                # Sort by expiry date
-                expiring_items.sort(key=lambda x: x["expiry_date"])
-                result["expiring_soon"] = expiring_items[:10]  # Top 10 expiring
-            
-            return result
+                if best_before:
+                    expiring_items.append({
+                        "name": product.get("name", "Unknown"),
+                        "amount": item.get("amount", 0),
+                        "expiry_date": best_before,
+                        "product_id": product_id
+                    })
             
-        except httpx.HTTPError as e:
-            raise Exception(f"Error fetching Grocy inventory: {str(e)}")
+            # Sort by expiry date
+            expiring_items.sort(key=lambda x: x["expiry_date"])
+            result["expiring_soon"] = expiring_items[:10]  # Top 10 expiring
+        
+        return result
     
     async def get_locations(self) -> List[Dict[str, Any]]:
-        """Get all storage locations from Grocy"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/objects/locations",
-                headers=self.headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        """Get all storage locations from Grocy (cached)"""
+        return await self._get_master_data("locations")
     
     async def create_location(self, name: str, description: str = "") -> Dict[str, Any]:
         """
@@ -148,35 +547,23 @@ class GrocyClient:
             "is_freezer": 1 if "freez" in name.lower() else 0
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/objects/locations",
-                headers=self.headers,
-                json=body,
-                timeout=30.0
-            )
+        response = await self._request("POST", "/api/objects/locations", json=body)
+        self.cache.invalidate("locations")
             
-            if response.status_code != 200:
-                try:
-                    error_data = response.json()
-                    error_msg = error_data.get('error_message', response.text)
-                except:
-                    error_msg = response.text or "Unknown error"
+        if response.status_code != 200:
+            try:
+                error_data = response.json()
+                error_msg = error_data.get('error_message', response.text)
+            except:
+                error_msg = response.text or "Unknown error"
                 
-                raise Exception(f"Grocy API error: {response.status_code} - {error_msg}")
+            raise Exception(f"Grocy API error: {response.status_code} - {error_msg}")
             
-            return response.json()
+        return response.json()
     
     async def get_quantity_units(self) -> List[Dict[str, Any]]:
-        """Get all quantity units from Grocy"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/objects/quantity_units",
-                headers=self.headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        """Get all quantity units from Grocy (cached)"""
+        return await self._get_master_data("quantity_units")
     
     async def purchase_product(
         self,
@@ -211,15 +598,10 @@ class GrocyClient:
         if location_id is not None:
             body["location_id"] = location_id
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/stock/products/{product_id}/add",
-                headers=self.headers,
-                json=body,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._request("POST", f"/api/stock/products/{product_id}/add", json=body)
+        self.cache.invalidate_stock()
+        response.raise_for_status()
+        return response.json()
     
     async def consume_product(
         self, 
@@ -251,25 +633,20 @@ class GrocyClient:
         
         print(f"🔍 Consuming product {product_id}: amount={amount}, location_id={location_id}")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/stock/products/{product_id}/consume",
-                headers=self.headers,
-                json=body,
-                timeout=30.0
-            )
+        response = await self._request("POST", f"/api/stock/products/{product_id}/consume", json=body)
+        self.cache.invalidate_stock()
             
-            if response.status_code != 200:
-                # Try to get error details from Grocy
-                try:
-                    error_data = response.json()
-                    error_msg = error_data.get('error_message', response.text)
-                except:
-                    error_msg = response.text or "Unknown error"
+        if response.status_code != 200:
+            # Try to get error details from Grocy
+            try:
+                error_data = response.json()
+                error_msg = error_data.get('error_message', response.text)
+            except:
+                error_msg = response.text or "Unknown error"
                 
-                raise Exception(f"Grocy API error: {response.status_code} - {error_msg}")
+            raise Exception(f"Grocy API error: {response.status_code} - {error_msg}")
             
-            return response.json()
+        return response.json()
     
     async def create_product(
         self,
@@ -312,21 +689,16 @@ class GrocyClient:
             "treat_opened_as_out_of_stock": 1
         }
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/api/objects/products",
-                    headers=self.headers,
-                    json=body,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                # Log the error details for debugging
-                error_detail = f"Grocy API error: {e.response.status_code} - {e.response.text}"
-                print(f"❌ Failed to create product '{name}': {error_detail}")
-                raise Exception(error_detail)
+        try:
+            response = await self._request("POST", "/api/objects/products", json=body)
+            self.cache.invalidate("products")
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            # Log the error details for debugging
+            error_detail = f"Grocy API error: {e.response.status_code} - {e.response.text}"
+            print(f"❌ Failed to create product '{name}': {error_detail}")
+            raise Exception(error_detail)
     
     async def create_quantity_unit(
         self,
@@ -352,20 +724,15 @@ class GrocyClient:
             "active": 1
         }
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/api/objects/quantity_units",
-                    headers=self.headers,
-                    json=body,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                error_detail = f"Grocy API error: {e.response.status_code} - {e.response.text}"
-                print(f"❌ Failed to create quantity unit '{name}': {error_detail}")
-                raise Exception(error_detail)
+        try:
+            response = await self._request("POST", "/api/objects/quantity_units", json=body)
+            self.cache.invalidate("quantity_units")
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = f"Grocy API error: {e.response.status_code} - {e.response.text}"
+            print(f"❌ Failed to create quantity unit '{name}': {error_detail}")
+            raise Exception(error_detail)
     
     async def create_quantity_unit_conversion(
         self,
@@ -390,20 +757,14 @@ class GrocyClient:
             "factor": factor
         }
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/api/objects/quantity_unit_conversions",
-                    headers=self.headers,
-                    json=body,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                error_detail = f"Grocy API error: {e.response.status_code} - {e.response.text}"
-                print(f"❌ Failed to create unit conversion: {error_detail}")
-                raise Exception(error_detail)
+        try:
+            response = await self._request("POST", "/api/objects/quantity_unit_conversions", json=body)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = f"Grocy API error: {e.response.status_code} - {e.response.text}"
+            print(f"❌ Failed to create unit conversion: {error_detail}")
+            raise Exception(error_detail)
     
     async def add_to_shopping_list(
         self, 
@@ -433,20 +794,14 @@ class GrocyClient:
         if list_id is not None:
             body["list_id"] = list_id
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/stock/shoppinglist/add-product",
-                headers=self.headers,
-                json=body,
-                timeout=30.0
-            )
-            response.raise_for_status()
+        response = await self._request("POST", "/api/stock/shoppinglist/add-product", json=body)
+        response.raise_for_status()
             
-            # Grocy shopping list endpoint may return empty response
-            if response.status_code == 204 or not response.text:
-                return {"success": True, "product_id": product_id}
+        # Grocy shopping list endpoint may return empty response
+        if response.status_code == 204 or not response.text:
+            return {"success": True, "product_id": product_id}
             
-            return response.json()
+        return response.json()
     
     async def create_recipe(
         self,
@@ -475,15 +830,9 @@ class GrocyClient:
             "type": "normal"
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/objects/recipes",
-                headers=self.headers,
-                json=body,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._request("POST", "/api/objects/recipes", json=body)
+        response.raise_for_status()
+        return response.json()
     
     async def add_recipe_ingredient(
         self,
@@ -516,21 +865,15 @@ class GrocyClient:
             "only_check_single_unit_in_stock": 0
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/objects/recipes_pos",
-                headers=self.headers,
-                json=body,
-                timeout=30.0
-            )
+        response = await self._request("POST", "/api/objects/recipes_pos", json=body)
             
-            if response.status_code != 200:
-                error_detail = ""
-                try:
-                    error_detail = response.json()
-                except:
-                    error_detail = response.text
-                raise Exception(f"Grocy API error: {response.status_code} - {error_detail}")
+        if response.status_code != 200:
+            error_detail = ""
+            try:
+                error_detail = response.json()
+            except:
+                error_detail = response.text
+            raise Exception(f"Grocy API error: {response.status_code} - {error_detail}")
             
-            return response.json()
+        return response.json()
 
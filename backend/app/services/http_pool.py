@@ -0,0 +1,52 @@
+import asyncio
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import httpx
+
+
+class KeyedClientPool:
+    """
+    App-lifetime pooled HTTP client for one remote service
+
+    Keeps one keep-alive httpx.AsyncClient for the current key (the
+    service URL, plus credentials where they are part of the client),
+    shared by every caller. When the key changes the client is rebuilt
+    with build_client; the old one is closed after retire_delay seconds,
+    which should cover the longest request it may still be serving.
+    """
+
+    def __init__(self, build_client: Callable[[], httpx.AsyncClient], retire_delay: float):
+        self._build_client = build_client
+        self.retire_delay = retire_delay
+        self._client: Optional[httpx.AsyncClient] = None
+        self._key: Optional[Tuple[Hashable, ...]] = None
+        self._retiring: Dict[asyncio.Task, httpx.AsyncClient] = {}
+
+    def get(self, *key: Hashable) -> httpx.AsyncClient:
+        """Get the shared client for this key, rebuilding it on change"""
+        if self._client is None or self._client.is_closed or self._key != key:
+            if self._client is not None and not self._client.is_closed:
+                self._retire(self._client)
+            self._client = self._build_client()
+            self._key = key
+        return self._client
+
+    def _retire(self, client: httpx.AsyncClient):
+        async def close_later():
+            await asyncio.sleep(self.retire_delay)
+            await client.aclose()
+
+        task = asyncio.create_task(close_later())
+        self._retiring[task] = client
+        task.add_done_callback(lambda t: self._retiring.pop(t, None))
+
+    async def close(self):
+        """Close the shared client and any clients waiting to be retired"""
+        for task, client in list(self._retiring.items()):
+            task.cancel()
+            await client.aclose()
+        self._retiring.clear()
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._key = None
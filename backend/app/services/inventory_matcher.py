@@ -2,6 +2,11 @@ import httpx
 from typing import List, Dict, Any, Optional
 import json
 
+from ..config import settings
+from .llm_client import llm_pool
+from .product_catalog import ProductCatalog, select_candidates
+from .local_matcher import match_locally, combine_items
+
 
 class InventoryMatcher:
     """
@@ -17,6 +22,28 @@ class InventoryMatcher:
             "Content-Type": "application/json"
         }
     
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client for the LLM API"""
+        return llm_pool.get(self.llm_api_url)
+    
+    def candidate_products(
+        self,
+        text: str,
+        grocy_products: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Products to list in a prompt for matching the items in text
+        
+        Small catalogs are listed whole. Larger ones are narrowed locally to
+        the best name matches for each line of text, which keeps prompts
+        (and LLM latency) from growing with the catalog.
+        """
+        per_line = settings.llm_candidates_per_line
+        if per_line <= 0 or len(grocy_products) <= settings.llm_full_catalog_limit:
+            return grocy_products
+        return select_candidates(text, grocy_products, per_line)
+    
     def build_parse_prompt(
         self,
         input_text: str,
@@ -27,10 +54,10 @@ class InventoryMatcher:
         """
         Build prompt for parsing inventory text and matching to Grocy products
         """
-        # Format products for LLM
+        # Format candidate products for LLM
         product_list = "\n".join([
             f"- ID: {p['id']}, Name: {p['name']}"
-            for p in grocy_products
+            for p in self.candidate_products(input_text, grocy_products)
         ])
         
         # Format locations for LLM
@@ -107,14 +134,31 @@ Return ONLY a valid JSON array with NO additional text or explanation:
         input_text: str,
         grocy_products: List[Dict[str, Any]],
         grocy_locations: List[Dict[str, Any]],
-        unit_preference: str = "metric"
+        unit_preference: str = "metric",
+        catalog: Optional[ProductCatalog] = None
     ) -> List[Dict[str, Any]]:
         """
         Parse text and match items to Grocy products using LLM
         
+        Lines that plainly name an existing product ("2 onions", "1 gal
+        milk") are resolved locally first; only the rest go to the LLM, and
+        if nothing is left no LLM call is made.
+        
+        Args:
+            catalog: Indexed products, units and locations, if already loaded
+        
         Returns:
             List of parsed items with matching information
         """
+        local_items = []
+        if settings.llm_local_matching:
+            if catalog is None:
+                catalog = ProductCatalog(grocy_products, [], grocy_locations)
+            local_items, unresolved = match_locally(input_text, catalog, unit_preference)
+            if not unresolved:
+                return combine_items(local_items)
+            input_text = "\n".join(unresolved)
+        
         prompt = self.build_parse_prompt(
             input_text,
             grocy_products,
@@ -135,31 +179,32 @@ Return ONLY a valid JSON array with NO additional text or explanation:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.llm_api_url}/chat/completions",
-                    headers=self.headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                llm_response = data["choices"][0]["message"]["content"]
-                
-                # Extract JSON from response (LLM might add markdown code blocks)
-                llm_response = llm_response.strip()
-                if llm_response.startswith("```json"):
-                    llm_response = llm_response[7:]
-                if llm_response.startswith("```"):
-                    llm_response = llm_response[3:]
-                if llm_response.endswith("```"):
-                    llm_response = llm_response[:-3]
-                llm_response = llm_response.strip()
-                
-                # Parse JSON
-                parsed_items = json.loads(llm_response)
-                return parsed_items
-                
+            response = await self.client.post(
+                f"{self.llm_api_url}/chat/completions",
+                headers=self.headers,
+                json=payload
+            )
+            response.raise_for_status()
+            
+            data = response.json()
+            llm_response = data["choices"][0]["message"]["content"]
+            
+            # Extract JSON from response (LLM might add markdown code blocks)
+            llm_response = llm_response.strip()
+            if llm_response.startswith("```json"):
+                llm_response = llm_response[7:]
+            if llm_response.startswith("```"):
+                llm_response = llm_response[3:]
+            if llm_response.endswith("```"):
+                llm_response = llm_response[:-3]
+            llm_response = llm_response.strip()
+            
+            # Parse JSON
+            parsed_items = json.loads(llm_response)
+            if local_items:
+                return combine_items(local_items + parsed_items)
+            return parsed_items
+            
         except httpx.HTTPError as e:
             raise Exception(f"Error calling LLM API: {str(e)}")
         except json.JSONDecodeError as e:
@@ -177,10 +222,10 @@ Return ONLY a valid JSON array with NO additional text or explanation:
         """
         Build prompt for extracting ingredients for shopping list with realistic purchasing quantities
         """
-        # Format products for LLM
+        # Format candidate products for LLM
         product_list = "\n".join([
             f"- ID: {p['id']}, Name: {p['name']}"
-            for p in grocy_products
+            for p in self.candidate_products(recipe_text, grocy_products)
         ])
         
         # Format stock info
@@ -269,10 +314,10 @@ Return ONLY a valid JSON array with NO additional text:
         """
         Build prompt for extracting ingredients from recipe text
         """
-        # Format products for LLM
+        # Format candidate products for LLM
         product_list = "\n".join([
             f"- ID: {p['id']}, Name: {p['name']}"
-            for p in grocy_products
+            for p in self.candidate_products(recipe_text, grocy_products)
         ])
         
         # Format stock info
@@ -375,31 +420,30 @@ Return ONLY a valid JSON array with NO additional text:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.llm_api_url}/chat/completions",
-                    headers=self.headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                llm_response = data["choices"][0]["message"]["content"]
-                
-                # Extract JSON from response
-                llm_response = llm_response.strip()
-                if llm_response.startswith("```json"):
-                    llm_response = llm_response[7:]
-                if llm_response.startswith("```"):
-                    llm_response = llm_response[3:]
-                if llm_response.endswith("```"):
-                    llm_response = llm_response[:-3]
-                llm_response = llm_response.strip()
-                
-                # Parse JSON
-                ingredients = json.loads(llm_response)
-                return ingredients
-                
+            response = await self.client.post(
+                f"{self.llm_api_url}/chat/completions",
+                headers=self.headers,
+                json=payload
+            )
+            response.raise_for_status()
+            
+            data = response.json()
+            llm_response = data["choices"][0]["message"]["content"]
+            
+            # Extract JSON from response
+            llm_response = llm_response.strip()
+            if llm_response.startswith("```json"):
+                llm_response = llm_response[7:]
+            if llm_response.startswith("```"):
+                llm_response = llm_response[3:]
+            if llm_response.endswith("```"):
+                llm_response = llm_response[:-3]
+            llm_response = llm_response.strip()
+            
+            # Parse JSON
+            ingredients = json.loads(llm_response)
+            return ingredients
+            
         except httpx.HTTPError as e:
             raise Exception(f"Error calling LLM API: {str(e)}")
         except json.JSONDecodeError as e:
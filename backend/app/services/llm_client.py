@@ -1,7 +1,26 @@
 import httpx
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 import json
 
+from ..config import settings
+from .http_pool import KeyedClientPool
+
+
+def _build_llm_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=settings.llm_request_timeout,
+        limits=httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+            keepalive_expiry=settings.llm_keepalive_expiry
+        )
+    )
+
+
+# Global LLM connection pool, keyed by API URL (the API key is sent per
+# request), shared by LLMClient and InventoryMatcher
+llm_pool = KeyedClientPool(_build_llm_client, retire_delay=settings.llm_request_timeout)
+
 
 class LLMClient:
     """Client for OpenAI-compatible LLM APIs"""
@@ -15,6 +34,11 @@ class LLMClient:
             "Content-Type": "application/json"
         }
     
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client for the LLM API"""
+        return llm_pool.get(self.api_url)
+    
     def build_recipe_prompt(
         self,
         inventory: Dict[str, Any],
@@ -197,21 +221,77 @@ class LLMClient:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.api_url}/chat/completions",
-                    headers=self.headers,
-                    json=payload
-                )
+            response = await self.client.post(
+                f"{self.api_url}/chat/completions",
+                headers=self.headers,
+                json=payload
+            )
+            response.raise_for_status()
+            
+            data = response.json()
+            recipe_text = data["choices"][0]["message"]["content"]
+            return recipe_text
+            
+        except httpx.HTTPError as e:
+            raise Exception(f"Error calling LLM API: {str(e)}")
+        except (KeyError, IndexError) as e:
+            raise Exception(f"Unexpected LLM response format: {str(e)}")
+    
+    async def stream_recipe(
+        self,
+        inventory: Dict[str, Any],
+        request_params: Dict[str, Any],
+        dietary_profiles: List[Dict[str, str]]
+    ) -> AsyncIterator[str]:
+        """
+        Generate a recipe using the LLM, yielding text as it is produced
+        
+        Uses the streaming chat completions API, so the first tokens arrive
+        long before the whole recipe is done.
+        
+        Yields:
+            Chunks of recipe text, in order
+        """
+        prompt = self.build_recipe_prompt(inventory, request_params, dietary_profiles)
+        
+        payload = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": 2000,
+            "stream": True
+        }
+        
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.api_url}/chat/completions",
+                headers=self.headers,
+                json=payload
+            ) as response:
                 response.raise_for_status()
                 
-                data = response.json()
-                recipe_text = data["choices"][0]["message"]["content"]
-                return recipe_text
-                
+                # Server-sent events: "data: {chunk}" lines, ending with "data: [DONE]"
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    
+                    choices = json.loads(data).get("choices") or []
+                    content = choices[0].get("delta", {}).get("content") if choices else None
+                    if content:
+                        yield content
+        
         except httpx.HTTPError as e:
             raise Exception(f"Error calling LLM API: {str(e)}")
-        except (KeyError, IndexError) as e:
+        except (KeyError, IndexError, AttributeError, json.JSONDecodeError) as e:
             raise Exception(f"Unexpected LLM response format: {str(e)}")
     
     async def regenerate_recipe(
@@ -257,18 +337,17 @@ class LLMClient:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.api_url}/chat/completions",
-                    headers=self.headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                recipe_text = data["choices"][0]["message"]["content"]
-                return recipe_text
-                
+            response = await self.client.post(
+                f"{self.api_url}/chat/completions",
+                headers=self.headers,
+                json=payload
+            )
+            response.raise_for_status()
+            
+            data = response.json()
+            recipe_text = data["choices"][0]["message"]["content"]
+            return recipe_text
+            
         except httpx.HTTPError as e:
             raise Exception(f"Error calling LLM API: {str(e)}")
         except (KeyError, IndexError) as e:
@@ -327,18 +406,17 @@ Provide ONLY the reformatted recipe with NO additional text."""
         }
         
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.api_url}/chat/completions",
-                    headers=self.headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                formatted_text = data["choices"][0]["message"]["content"]
-                return formatted_text
-                
+            response = await self.client.post(
+                f"{self.api_url}/chat/completions",
+                headers=self.headers,
+                json=payload
+            )
+            response.raise_for_status()
+            
+            data = response.json()
+            formatted_text = data["choices"][0]["message"]["content"]
+            return formatted_text
+            
         except httpx.HTTPError as e:
             raise Exception(f"Error calling LLM API: {str(e)}")
         except (KeyError, IndexError) as e:
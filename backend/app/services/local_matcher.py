@@ -0,0 +1,233 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from .product_catalog import ProductCatalog, normalize_name, normalize_unit
+
+
+# Canonical unit name -> (base unit, factor to base) for units we convert
+WEIGHT_UNITS = {
+    "milligram": ("g", 0.001),
+    "gram": ("g", 1.0),
+    "kilogram": ("g", 1000.0),
+    "ounce": ("g", 28.3495),
+    "pound": ("g", 453.592),
+}
+VOLUME_UNITS = {
+    "milliliter": ("ml", 1.0),
+    "liter": ("ml", 1000.0),
+    "teaspoon": ("ml", 4.92892),
+    "tablespoon": ("ml", 14.7868),
+    "fluid ounce": ("ml", 29.5735),
+    "cup": ("ml", 236.588),
+    "pint": ("ml", 473.176),
+    "quart": ("ml", 946.353),
+    "gallon": ("ml", 3785.41),
+}
+METRIC_UNITS = {"milligram", "gram", "kilogram", "milliliter", "liter"}
+
+# Units for whole items, reported as "count"
+COUNT_UNITS = {"piece", "unit", "count", "item"}
+
+# Container units kept as written
+CONTAINER_UNITS = {
+    "pack", "can", "bottle", "bag", "box", "jar", "carton", "bunch", "loaf", "tin", "tub"
+}
+
+UNICODE_FRACTIONS = {"½": 0.5, "⅓": 1 / 3, "⅔": 2 / 3, "¼": 0.25, "¾": 0.75, "⅛": 0.125}
+
+_QUANTITY = re.compile(
+    r"^(?:(?P<whole>\d+)\s+(?=\d+/\d+))?"
+    r"(?P<number>\d+/\d+|\d+(?:[.,]\d+)?|[½⅓⅔¼¾⅛])"
+    # A quantity ends at a space, a unit ("500g") or the end of the line, not "2%"
+    r"(?=\s|[^\W\d_]|$)\s*(?:x\b)?\s*"
+)
+_BULLET = re.compile(r"^\s*(?:[-*•]+|\[\s?\])\s*")
+
+
+def parse_quantity_line(
+    line: str
+) -> Optional[Tuple[float, Optional[str], str, Optional[str]]]:
+    """
+    Split a grocery line into (quantity, canonical unit, item name, unit words)
+
+    Handles "2 onions", "1 1/2 lb ground beef", "500g flour", "½ gal milk",
+    "3 x eggs" and "2 cans of tomatoes". A line without a leading quantity
+    means one of the item and has no unit ("pound cake" is a name). Unit
+    words is the unit as written when it runs straight into the name, since
+    it may then be part of the name ("1 pound cake"); it is None when there
+    is no unit or "of" follows it. Returns None if no item name is left.
+    """
+    text = _BULLET.sub("", line).strip()
+    quantity = 1.0
+    unit = None
+    unit_words = None
+    words = text.split()
+
+    match = _QUANTITY.match(text)
+    if match:
+        number = match.group("number")
+        if number in UNICODE_FRACTIONS:
+            quantity = UNICODE_FRACTIONS[number]
+        elif "/" in number:
+            numerator, denominator = number.split("/")
+            if float(denominator) == 0:
+                return None
+            quantity = float(numerator) / float(denominator)
+        else:
+            quantity = float(number.replace(",", "."))
+        if match.group("whole"):
+            quantity += float(match.group("whole"))
+        words = text[match.end():].split()
+
+        # Two-word units first ("fl oz"), then one-word ones
+        for size in (2, 1):
+            if len(words) > size:
+                candidate = normalize_unit(" ".join(words[:size]))
+                if candidate in WEIGHT_UNITS or candidate in VOLUME_UNITS \
+                        or candidate in COUNT_UNITS or candidate in CONTAINER_UNITS:
+                    unit = candidate
+                    unit_words = " ".join(words[:size])
+                    words = words[size:]
+                    break
+
+    if words and words[0].lower() == "of":
+        unit_words = None
+        words = words[1:]
+    name = " ".join(words).strip(" .")
+    if not name:
+        return None
+    return quantity, unit, name, unit_words
+
+
+def convert_quantity(
+    quantity: float,
+    unit: Optional[str],
+    unit_preference: str
+) -> Tuple[float, str]:
+    """
+    Express a quantity in the preferred unit system
+
+    Weights and volumes in the other system are converted (to g/kg/ml/l
+    for metric, oz/lb/fl oz/gal for imperial); units already in the
+    preferred system are kept as written. Whole items become "count".
+    """
+    if unit is None or unit in COUNT_UNITS:
+        return quantity, "count"
+    if unit in CONTAINER_UNITS:
+        return quantity, unit
+
+    metric = unit_preference == "metric"
+    if (unit in METRIC_UNITS) == metric:
+        short = {
+            "milligram": "mg", "gram": "g", "kilogram": "kg", "milliliter": "ml",
+            "liter": "l", "ounce": "oz", "pound": "lb", "fluid ounce": "fl oz",
+            "gallon": "gal", "pint": "pt", "quart": "qt", "teaspoon": "tsp",
+            "tablespoon": "tbsp", "cup": "cup",
+        }
+        return quantity, short[unit]
+
+    if unit in WEIGHT_UNITS:
+        grams = quantity * WEIGHT_UNITS[unit][1]
+        if metric:
+            return (round(grams / 1000, 2), "kg") if grams >= 1000 else (round(grams, 1), "g")
+        ounces = grams / WEIGHT_UNITS["ounce"][1]
+        return (round(ounces / 16, 2), "lb") if ounces >= 16 else (round(ounces, 2), "oz")
+
+    milliliters = quantity * VOLUME_UNITS[unit][1]
+    if metric:
+        return (round(milliliters / 1000, 2), "l") if milliliters >= 1000 else (round(milliliters, 1), "ml")
+    fluid_ounces = milliliters / VOLUME_UNITS["fluid ounce"][1]
+    return (round(fluid_ounces / 128, 2), "gal") if fluid_ounces >= 128 else (round(fluid_ounces, 2), "fl oz")
+
+
+def _match_part(
+    part: str,
+    catalog: ProductCatalog,
+    unit_preference: str
+) -> Optional[Dict[str, Any]]:
+    """Parsed item for one grocery line if it names a product exactly"""
+    parsed = parse_quantity_line(part)
+    if parsed is None:
+        return None
+    quantity, unit, name, unit_words = parsed
+
+    # "1 pound cake" may be a pound of cake or one pound cake. Leave it to
+    # the LLM when a spelled-out unit runs into the name or when the unit
+    # words are part of a product name
+    if unit_words is not None and (
+        unit_words.lower() == unit or catalog.find_product(f"{unit_words} {name}")
+    ):
+        return None
+
+    product = catalog.find_product(name)
+    if product is None:
+        return None
+
+    quantity, unit = convert_quantity(quantity, unit, unit_preference)
+    location_id = product.get("location_id") or catalog.default_location_id()
+    location = next((loc for loc in catalog.locations if loc["id"] == location_id), None)
+    return {
+        "original_text": part.strip(),
+        "item_name": product["name"],
+        "quantity": quantity,
+        "unit": unit,
+        "matched_product_id": product["id"],
+        "matched_product_name": product["name"],
+        "confidence": "high",
+        "suggested_location_id": location_id,
+        "suggested_location_name": location["name"] if location else None,
+        "suggested_quantity_unit_id": catalog.unit_id(unit),
+    }
+
+
+def match_locally(
+    input_text: str,
+    catalog: ProductCatalog,
+    unit_preference: str = "metric"
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Resolve the obvious lines of a grocery list without the LLM
+
+    A line is resolved when it is a quantity and unit followed by a name
+    that exactly matches a Grocy product, ignoring case, spacing and
+    plurals. A unit word that may belong to the name ("1 pound cake")
+    leaves the line to the LLM. Lines with several comma-separated items
+    are resolved only if every item is. Returns (parsed items, unresolved
+    lines); items use the same fields as the LLM's parse output.
+    """
+    items: List[Dict[str, Any]] = []
+    unresolved: List[str] = []
+
+    for line in re.split(r"[\n;]+", input_text):
+        if not normalize_name(line):
+            continue
+        # Not decimal commas ("1,5 kg")
+        parts = [part for part in re.split(r",(?!\d)", line) if part.strip()]
+        matched = [_match_part(part, catalog, unit_preference) for part in parts]
+        if all(matched):
+            items.extend(matched)
+        else:
+            unresolved.append(line.strip())
+
+    return items, unresolved
+
+
+def combine_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge items for the same product and unit, adding up quantities"""
+    combined: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+    result = []
+    for item in items:
+        product_id = item.get("matched_product_id")
+        key = (product_id, item.get("unit"))
+        existing = combined.get(key) if product_id else None
+        if existing is None:
+            item = dict(item)
+            if product_id:
+                combined[key] = item
+            result.append(item)
+            continue
+        existing["quantity"] = round(
+            float(existing.get("quantity") or 0) + float(item.get("quantity") or 0), 2
+        )
+        existing["original_text"] = f"{existing.get('original_text', '')}; {item.get('original_text', '')}"
+    return result
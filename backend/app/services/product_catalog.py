@@ -0,0 +1,302 @@
+import hashlib
+import json
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .grocy_client import fetch_concurrently
+
+
+# Common unit abbreviations -> canonical unit name (normalized)
+UNIT_ALIASES = {
+    "g": "gram",
+    "gr": "gram",
+    "kg": "kilogram",
+    "mg": "milligram",
+    "ml": "milliliter",
+    "l": "liter",
+    "litre": "liter",
+    "millilitre": "milliliter",
+    "oz": "ounce",
+    "fl oz": "fluid ounce",
+    "lb": "pound",
+    "lbs": "pound",
+    "gal": "gallon",
+    "pt": "pint",
+    "qt": "quart",
+    "tbsp": "tablespoon",
+    "tbs": "tablespoon",
+    "tsp": "teaspoon",
+    "c": "cup",
+    "pc": "piece",
+    "pcs": "piece",
+    "count": "piece",
+    "ea": "piece",
+    "each": "piece",
+    "pkg": "pack",
+    "package": "pack",
+}
+
+
+def _singular(word: str) -> str:
+    """Naive English singular form, good enough for grocery names"""
+    if len(word) <= 3 or word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "xes", "sses")):
+        return word[:-2]
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    Normalize a product, unit or location name for lookups
+
+    Lowercases, collapses whitespace and punctuation, and singularizes the
+    last word, so "Cherry  Tomatoes" and "cherry tomato" match.
+    """
+    if not name:
+        return ""
+    words = re.sub(r"[^\w\s]", " ", name.lower()).split()
+    if not words:
+        return ""
+    words[-1] = _singular(words[-1])
+    return " ".join(words)
+
+
+def _name_keys(name: Optional[str]) -> List[str]:
+    """Lookup keys for a name, most specific first"""
+    if not name:
+        return []
+    keys = [" ".join(name.lower().split()), normalize_name(name)]
+    # English plurals are irregular ("cookies" vs "berries"), so also try
+    # just dropping a trailing s
+    if keys[0].endswith("s") and not keys[0].endswith("ss"):
+        keys.append(keys[0][:-1])
+    return [key for i, key in enumerate(keys) if key and key not in keys[:i]]
+
+
+def normalize_unit(unit: Optional[str]) -> str:
+    """Normalize a unit name, resolving common abbreviations"""
+    if not unit:
+        return ""
+    key = " ".join(unit.lower().replace(".", "").split())
+    if key in UNIT_ALIASES:
+        return UNIT_ALIASES[key]
+    normalized = normalize_name(key)
+    return UNIT_ALIASES.get(normalized, normalized)
+
+
+class ProductCatalog:
+    """
+    Indexed view of Grocy products, quantity units and locations
+
+    Replaces linear scans over the product list with dictionary lookups by
+    ID and by normalized name. Built once per master data version and
+    shared by all requests; treat it as read-only apart from add_unit().
+    """
+
+    def __init__(
+        self,
+        products: List[Dict[str, Any]],
+        quantity_units: List[Dict[str, Any]],
+        locations: List[Dict[str, Any]]
+    ):
+        self.products = products
+        self.quantity_units = quantity_units
+        self.locations = locations
+
+        self._products_by_id = {p["id"]: p for p in products}
+        self._products_by_name: Dict[str, Dict[str, Any]] = {}
+        for product in products:
+            for key in _name_keys(product.get("name")):
+                # The first product wins, like the linear scans did
+                self._products_by_name.setdefault(key, product)
+
+        self._units_by_name: Dict[str, int] = {}
+        for unit in quantity_units:
+            for name in (unit.get("name"), unit.get("name_plural")):
+                if name:
+                    self._units_by_name.setdefault(name.lower().strip(), unit["id"])
+                    self._units_by_name.setdefault(normalize_unit(name), unit["id"])
+
+        self._locations_by_name = {
+            normalize_name(loc.get("name")): loc["id"] for loc in locations if loc.get("name")
+        }
+        self._version: Optional[str] = None
+
+    @property
+    def version(self) -> str:
+        """
+        Content hash of the product IDs and names
+
+        Unlike the master data cache version it is stable across restarts,
+        so it can key persisted data derived from the catalog, like cached
+        ingredient extractions.
+        """
+        if self._version is None:
+            names = sorted((str(p["id"]), p.get("name") or "") for p in self.products)
+            self._version = hashlib.sha1(json.dumps(names).encode("utf-8")).hexdigest()
+        return self._version
+
+    def product_by_id(self, product_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Get a product by Grocy ID"""
+        return self._products_by_id.get(product_id)
+
+    def find_product(self, name: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Find a product by name, ignoring case, spacing and plurals"""
+        if not name:
+            return None
+        # Most lookups hit on the plain lowercase name
+        product = self._products_by_name.get(" ".join(name.lower().split()))
+        if product is not None:
+            return product
+        for key in _name_keys(name)[1:]:
+            product = self._products_by_name.get(key)
+            if product is not None:
+                return product
+        return None
+
+    def unit_id(self, name: Optional[str]) -> Optional[int]:
+        """Get a quantity unit ID by name or common abbreviation"""
+        if not name:
+            return None
+        unit_id = self._units_by_name.get(name.lower().strip())
+        if unit_id is None:
+            unit_id = self._units_by_name.get(normalize_unit(name))
+        return unit_id
+
+    def add_unit(self, name: str, unit_id: int):
+        """Register a quantity unit created in Grocy since the catalog was built"""
+        self._units_by_name.setdefault(name.lower().strip(), unit_id)
+        self._units_by_name.setdefault(normalize_unit(name), unit_id)
+
+    def location_id(self, name: Optional[str]) -> Optional[int]:
+        """Get a location ID by name"""
+        return self._locations_by_name.get(normalize_name(name))
+
+    def default_location_id(self, fallback: int = 1) -> int:
+        """First location in Grocy (usually Pantry or Fridge)"""
+        return self.locations[0]["id"] if self.locations else fallback
+
+
+def _trigrams(text: Optional[str]) -> set:
+    """Character trigrams of a text's singularized words, padded at word edges"""
+    grams = set()
+    for word in re.findall(r"[^\W\d_]+", (text or "").lower()):
+        padded = f" {_singular(word)} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class CandidateIndex:
+    """
+    Character trigram index over product names
+
+    Picks the few products that could plausibly match a line of text, so
+    LLM prompts only list those instead of the whole catalog. A product
+    scores by how much of its name appears in the line, which tolerates
+    extra words ("2 cups all-purpose flour, sifted"), plurals and small
+    misspellings.
+    """
+
+    # Minimum share of a product name's trigrams found in the line
+    MIN_SCORE = 0.3
+
+    def __init__(self, products: List[Dict[str, Any]]):
+        self.products = products
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        for i, product in enumerate(products):
+            grams = _trigrams(product.get("name"))
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(i)
+
+    def top(self, text: str, k: int) -> List[int]:
+        """Indexes of the k best matching products for a line, best first"""
+        shared: Counter = Counter()
+        for gram in _trigrams(text):
+            shared.update(self._postings.get(gram, ()))
+
+        scored = []
+        for i, count in shared.items():
+            score = count / self._sizes[i]
+            if score >= self.MIN_SCORE:
+                # Ties go to the longer match ("Olive Oil" over "Oil")
+                scored.append((score, count, -i))
+        scored.sort(reverse=True)
+        return [-neg_i for _, _, neg_i in scored[:k]]
+
+    def select(self, text: str, per_line: int) -> List[Dict[str, Any]]:
+        """
+        Candidate products for every line of a text, in catalog order
+
+        Lines are also split on commas and semicolons, so "milk, eggs,
+        bread" gets candidates for each item.
+        """
+        chosen = set()
+        for line in re.split(r"[\n,;]+", text):
+            if line.strip():
+                chosen.update(self.top(line, per_line))
+        return [self.products[i] for i in sorted(chosen)]
+
+
+# Last built candidate index: ((id, name) per product, index)
+_candidate_index: Optional[Tuple[Tuple[Tuple[Any, Any], ...], CandidateIndex]] = None
+
+
+def select_candidates(
+    text: str,
+    products: List[Dict[str, Any]],
+    per_line: int
+) -> List[Dict[str, Any]]:
+    """
+    Products worth offering the LLM for matching the items in a text
+
+    The index is rebuilt only when the product names change.
+    """
+    global _candidate_index
+    key = tuple((p.get("id"), p.get("name")) for p in products)
+    if _candidate_index is None or _candidate_index[0] != key:
+        _candidate_index = (key, CandidateIndex(products))
+    return _candidate_index[1].select(text, per_line)
+
+
+# Built catalogs per (Grocy URL, API key): (master data version, catalog)
+_catalogs: Dict[Tuple[str, str], Tuple[int, ProductCatalog]] = {}
+
+
+async def load_catalog(grocy_client) -> ProductCatalog:
+    """
+    Get the ProductCatalog for a GrocyClient's instance
+
+    Products, units and locations come from the master data cache, and the
+    indexes are only rebuilt when that data changed.
+    """
+    products, quantity_units, locations = await fetch_concurrently(
+        grocy_client.get_products(),
+        grocy_client.get_quantity_units(),
+        grocy_client.get_locations()
+    )
+
+    cache = grocy_client.cache
+    key = (grocy_client.base_url, grocy_client.api_key)
+    version = cache.version
+    built = _catalogs.get(key)
+    if built is not None and built[0] == version:
+        return built[1]
+
+    # Build from the cache entries themselves so the catalog matches the
+    # version it is stored under, even if another request refreshed an
+    # entity while we were awaiting ours
+    cached = [cache.get_stale(entity) for entity in ("products", "quantity_units", "locations")]
+    if any(entry is None for entry in cached):
+        return ProductCatalog(products, quantity_units, locations)
+
+    catalog = ProductCatalog(cached[0][0], cached[1][0], cached[2][0])
+    _catalogs[key] = (version, catalog)
+    return catalog
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from typing import Optional
+
+from ..config import settings
+from ..database import Database, db
+from ..utils.config_manager import get_effective_config
+
+
+class RetentionService:
+    """
+    Background task that enforces the recipe history retention policy
+
+    Runs every interval_seconds, and sooner once the history grows past a
+    high-water mark above max_recipe_history. Recipe generation only calls
+    notify_recipe_created(), which never touches the database, so the
+    user-facing request never pays for retention.
+    """
+
+    def __init__(self, database: Database, interval_seconds: float, batch_size: int):
+        self.database = database
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def high_water_mark(max_count: int) -> int:
+        """Recipe count at which retention runs early (10% slack, at least 10)"""
+        return max_count + max(10, max_count // 10)
+
+    def start(self):
+        """Start the background loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify_recipe_created(self):
+        """Signal that a recipe was added; the loop checks the high-water mark"""
+        self._wakeup.set()
+
+    async def run_once(self, scheduled: bool = True) -> int:
+        """
+        Apply the retention policy once and return how many recipes were deleted
+
+        Scheduled runs apply both the count and the age policy. Runs woken
+        by new recipes only act once the history passes the high-water mark.
+        """
+        config = await get_effective_config()
+        max_count = config["max_recipe_history"]
+        max_age_days = config["max_recipe_age_days"]
+
+        # Reading the maintained counter is a single-row lookup
+        total = await self.database.count_recipes()
+        limit = max_count if scheduled else self.high_water_mark(max_count)
+        over_limit = bool(max_count) and total > limit
+
+        if not scheduled and not over_limit:
+            return 0
+
+        return await self.database.cleanup_old_recipes(
+            max_count=max_count if over_limit else None,
+            max_age_days=max_age_days if scheduled else None,
+            batch_size=self.batch_size
+        )
+
+    async def _run(self):
+        """
+        Loop until cancelled: clean up on schedule and when woken by new recipes
+
+        Scheduled runs keep a fixed deadline, so wakeups in between never
+        postpone them however often recipes are generated.
+        """
+        scheduled = True
+        deadline = 0.0
+        while True:
+            if scheduled:
+                deadline = time.monotonic() + self.interval_seconds
+            self._wakeup.clear()
+            try:
+                deleted = await self.run_once(scheduled=scheduled)
+                if deleted:
+                    print(f"🧹 Retention removed {deleted} old recipes")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Recipe retention failed: {e}")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                scheduled = True
+                continue
+            # asyncio.wait, unlike wait_for, never swallows a stop() that
+            # arrives just as a wakeup is set
+            waiter = asyncio.ensure_future(self._wakeup.wait())
+            try:
+                done, _ = await asyncio.wait({waiter}, timeout=remaining)
+            finally:
+                waiter.cancel()
+            scheduled = not done
+
+
+# Global retention service
+retention = RetentionService(
+    db,
+    interval_seconds=settings.retention_interval_minutes * 60,
+    batch_size=settings.retention_batch_size
+)
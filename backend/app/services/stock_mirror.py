@@ -0,0 +1,126 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import settings
+from ..database import Database, db
+
+
+# Fields the inventory formatting reads; stock rows also embed the whole
+# product, which the mirror doesn't need to keep or persist
+STOCK_FIELDS = ("product_id", "amount", "quantity_unit_stock")
+PRODUCT_FIELDS = ("id", "name")
+
+
+class MirrorSnapshot:
+    """One synced copy of Grocy stock, expiry data and products"""
+
+    def __init__(
+        self,
+        changed_time: Optional[str],
+        stock: List[Dict[str, Any]],
+        volatile: Any,
+        products: List[Dict[str, Any]]
+    ):
+        self.changed_time = changed_time
+        self.stock = stock
+        self.volatile = volatile
+        self.products = products
+        self.checked_at = 0.0
+        self.generation: Optional[int] = None
+        self._formatted: Dict[Any, Dict[str, Any]] = {}
+
+    def formatted(self, key: Any, build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Build a derived view of this snapshot once and reuse it"""
+        if key not in self._formatted:
+            self._formatted[key] = build()
+        return self._formatted[key]
+
+
+class StockMirror:
+    """
+    Local SQLite mirror of Grocy stock, products and expiry data
+
+    Inventory is served from memory, backed by SQLite so the mirror
+    survives restarts, and only keeps the fields the inventory formatting
+    reads. Every grocy_stock_sync_interval seconds (or right after one of
+    our own Grocy writes) Grocy's db-changed-time is checked, and stock is
+    only re-downloaded when it changed. If Grocy can't be reached the last
+    mirrored inventory keeps being served.
+    """
+
+    def __init__(self, database: Database, sync_interval: float):
+        self.database = database
+        self.sync_interval = sync_interval
+        self._snapshots: Dict[str, MirrorSnapshot] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def get(self, client) -> MirrorSnapshot:
+        """Get the current inventory snapshot for a GrocyClient's instance"""
+        source = client.base_url
+        snapshot = self._snapshots.get(source)
+        if snapshot is not None and self._is_current(snapshot, client):
+            return snapshot
+
+        lock = self._locks.setdefault(source, asyncio.Lock())
+        async with lock:
+            # Another request may have synced while we waited
+            snapshot = self._snapshots.get(source)
+            if snapshot is not None and self._is_current(snapshot, client):
+                return snapshot
+
+            if snapshot is None:
+                snapshot = await self._load(source)
+
+            try:
+                snapshot = await self._sync(client, snapshot)
+            except Exception as e:
+                if snapshot is None:
+                    raise
+                print(f"⚠️ Grocy unreachable, serving mirrored inventory: {e}")
+                return snapshot
+
+            self._snapshots[source] = snapshot
+            return snapshot
+
+    def _is_current(self, snapshot: MirrorSnapshot, client) -> bool:
+        return (
+            snapshot.generation == client.cache.stock_generation
+            and time.monotonic() - snapshot.checked_at < self.sync_interval
+        )
+
+    async def _load(self, source: str) -> Optional[MirrorSnapshot]:
+        """Load the persisted mirror, e.g. after a restart"""
+        mirror = await self.database.get_grocy_mirror(source)
+        if mirror is None:
+            return None
+        return MirrorSnapshot(
+            mirror["changed_time"], mirror["stock"], mirror["volatile"], mirror["products"]
+        )
+
+    async def _sync(self, client, snapshot: Optional[MirrorSnapshot]) -> MirrorSnapshot:
+        """Re-download stock only if Grocy changed since the snapshot was taken"""
+        from .grocy_client import fetch_concurrently, project
+
+        generation = client.cache.stock_generation
+        changed_time = await client.get_db_changed_time()
+
+        if snapshot is None or changed_time != snapshot.changed_time:
+            stock, volatile, products = await fetch_concurrently(
+                client.get_stock(), client.get_volatile_stock(), client.get_products()
+            )
+            stock = project(stock, STOCK_FIELDS)
+            products = project(products, PRODUCT_FIELDS)
+            changed = await self.database.save_grocy_mirror(
+                client.base_url, changed_time, stock, products, volatile
+            )
+            print(f"🔄 Synced Grocy mirror ({changed} rows changed)")
+            snapshot = MirrorSnapshot(changed_time, stock, volatile, products)
+
+        snapshot.checked_at = time.monotonic()
+        snapshot.generation = generation
+        return snapshot
+
+
+# Global stock mirror
+stock_mirror = StockMirror(db, sync_interval=settings.grocy_stock_sync_interval)
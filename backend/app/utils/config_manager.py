@@ -1,7 +1,32 @@
+from typing import Any, Dict, Optional
+
 from ..config import settings
 from ..database import db
 
-async def get_effective_config():
+# Process-local cache of the effective config. Settings only change through
+# this process (the settings router), so the cache is invalidated on write
+# instead of expiring on a timer. Clients built from the config don't need
+# to watch it: the Grocy and LLM pools and caches are keyed by URL and API
+# key, so they rebuild exactly when those change.
+_cached_config: Optional[Dict[str, Any]] = None
+# Bumped on every invalidation so a load that raced with a write isn't cached
+_config_version = 0
+
+
+def invalidate_config():
+    """Drop the cached config after a settings write"""
+    global _cached_config, _config_version
+    _cached_config = None
+    _config_version += 1
+
+
+async def refresh_config() -> Dict[str, Any]:
+    """Invalidate the cache and reload the effective config immediately"""
+    invalidate_config()
+    return await get_effective_config()
+
+
+async def get_effective_config() -> Dict[str, Any]:
     """
     Get the effective configuration by merging environment variables (defaults)
     with database settings (runtime overrides).
@@ -10,7 +35,25 @@ async def get_effective_config():
     - Environment variables (from .env or docker-compose) to set defaults
     - Database settings to override at runtime without restart
     - UI changes to take effect immediately
+    
+    The merged config is cached in memory; only the first call after a
+    settings write reads the database. Callers get their own copy.
     """
+    global _cached_config
+    if _cached_config is not None:
+        return dict(_cached_config)
+    
+    version = _config_version
+    config = await _load_effective_config()
+    
+    # Don't cache a result that raced with a settings write
+    if version == _config_version:
+        _cached_config = config
+    return dict(config)
+
+
+async def _load_effective_config() -> Dict[str, Any]:
+    """Merge env defaults with database overrides"""
     # Start with defaults from env vars
     config = {
         "grocy_url": settings.grocy_url,
@@ -19,6 +62,7 @@ async def get_effective_config():
         "llm_api_key": settings.llm_api_key,
         "llm_model": settings.llm_model,
         "max_recipe_history": settings.max_recipe_history,
+        "max_recipe_age_days": settings.max_recipe_age_days,
         "apprise_url": settings.apprise_url or "",
         "database_path": settings.database_path,
         "recipe_export_path": settings.recipe_export_path,
@@ -46,6 +90,11 @@ async def get_effective_config():
             config["max_recipe_history"] = int(db_settings["max_recipe_history"])
         except ValueError:
             pass
+    if "max_recipe_age_days" in db_settings:
+        try:
+            config["max_recipe_age_days"] = int(db_settings["max_recipe_age_days"])
+        except ValueError:
+            pass
     if "apprise_url" in db_settings:
         config["apprise_url"] = db_settings["apprise_url"]
     if "unit_preference" in db_settings:
@@ -0,0 +1,139 @@
+import re
+import struct
+import time
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+# zlib can only reference the last 32 KB of a preset dictionary
+MAX_DICTIONARY_SIZE = 32 * 1024
+
+# Blob layout: 4-byte big-endian dictionary ID (0 = no dictionary) + zlib data
+_HEADER = struct.Struct(">I")
+
+
+def train_dictionary(samples: List[str], max_size: int = MAX_DICTIONARY_SIZE) -> bytes:
+    """
+    Build a zlib preset dictionary from past recipe texts
+
+    Collects lines and words that recur across recipes (section headings,
+    the METADATA block, common ingredients and instructions) and packs the
+    most frequent ones into the dictionary. zlib finds matches more cheaply
+    near the end of the dictionary, so the most frequent content goes last.
+    """
+    line_counts: Counter = Counter()
+    word_counts: Counter = Counter()
+
+    for text in samples:
+        lines = {line.strip() for line in text.splitlines()}
+        line_counts.update(line for line in lines if 4 <= len(line) <= 200)
+        word_counts.update(set(re.findall(r"[A-Za-z][A-Za-z'-]{3,}", text)))
+
+    # Only content shared by at least two recipes is worth a dictionary slot
+    candidates = [line + "\n" for line, n in line_counts.most_common() if n >= 2]
+    candidates += [word + " " for word, n in word_counts.most_common() if n >= 2]
+
+    picked = []
+    size = 0
+    for chunk in candidates:
+        chunk_size = len(chunk.encode("utf-8"))
+        if size + chunk_size > max_size:
+            continue
+        picked.append(chunk)
+        size += chunk_size
+
+    return "".join(reversed(picked)).encode("utf-8")
+
+
+def compress_recipe_text(
+    text: str,
+    dictionary_id: int = 0,
+    dictionary: Optional[bytes] = None
+) -> bytes:
+    """Compress recipe text, optionally with a preset dictionary"""
+    if dictionary:
+        compressor = zlib.compressobj(9, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(9)
+        dictionary_id = 0
+
+    data = compressor.compress(text.encode("utf-8")) + compressor.flush()
+    return _HEADER.pack(dictionary_id) + data
+
+
+def decompress_recipe_text(blob: bytes, dictionaries: Dict[int, bytes]) -> str:
+    """
+    Decompress a blob produced by compress_recipe_text
+
+    Raises KeyError if the blob references a dictionary that is not loaded.
+    """
+    (dictionary_id,) = _HEADER.unpack_from(blob)
+    if dictionary_id:
+        decompressor = zlib.decompressobj(zdict=dictionaries[dictionary_id])
+    else:
+        decompressor = zlib.decompressobj()
+
+    data = decompressor.decompress(blob[_HEADER.size:]) + decompressor.flush()
+    return data.decode("utf-8")
+
+
+async def _measure_read_latency(database, recipe_ids: List[int]) -> float:
+    """Average get_recipe() latency in milliseconds over the given IDs"""
+    if not recipe_ids:
+        return 0.0
+    start = time.perf_counter()
+    for recipe_id in recipe_ids:
+        await database.get_recipe(recipe_id)
+    return (time.perf_counter() - start) * 1000 / len(recipe_ids)
+
+
+async def migrate(sample_size: int = 500):
+    """
+    Train a dictionary on the recipe history and compress all plain bodies
+
+    Prints the recipe text size, the whole database file size (both
+    measured after a VACUUM, so free pages don't count) and get_recipe()
+    latency before and after.
+    """
+    from ..database import db
+
+    await db.init_db()
+    try:
+        recent = await db.get_recipes(limit=100, summary=True)
+        recipe_ids = [recipe["id"] for recipe in recent]
+
+        await db.vacuum()
+        file_before = await db.database_size()
+        latency_before = await _measure_read_latency(db, recipe_ids)
+        dictionary_id = await db.train_compression_dictionary(sample_size)
+        stats = await db.compress_recipe_texts()
+        await db.vacuum()
+        file_after = await db.database_size()
+        latency_after = await _measure_read_latency(db, recipe_ids)
+
+        print(f"📚 Dictionary: {dictionary_id if dictionary_id else 'none (not enough history)'}")
+        print(f"🗜️  Compressed {stats['recipes']} recipes")
+        if stats["recipes"]:
+            ratio = stats["bytes_after"] / stats["bytes_before"] if stats["bytes_before"] else 0
+            print(f"   Text:     {stats['bytes_before']:,} → {stats['bytes_after']:,} bytes ({ratio:.0%})")
+        ratio = file_after / file_before if file_before else 0
+        print(f"   Database: {file_before:,} → {file_after:,} bytes ({ratio:.0%})")
+        print(f"   Latency:  {latency_before:.3f} → {latency_after:.3f} ms per get_recipe")
+        print("Set RECIPE_COMPRESSION=true to store new recipes compressed.")
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(
+        description="Compress stored recipe bodies with a dictionary trained on history"
+    )
+    parser.add_argument("--sample-size", type=int, default=500,
+                        help="Number of recent recipes to train the dictionary on")
+    args = parser.parse_args()
+
+    asyncio.run(migrate(args.sample_size))
@@ -0,0 +1,164 @@
+"""
+Benchmark local candidate pre-filtering for InventoryMatcher prompts
+
+Builds the recipe-extraction prompt for a 40-ingredient recipe against a
+2,000-product fixture catalog (100 grocery names, each with 19 variants
+such as "Organic Milk" or "Milk Family Pack"), once listing every product
+and once with the trigram pre-filter. Reports products listed, prompt
+tokens (estimated as characters / 4) and build time, plus how often each
+line's gold product is among the candidates and is the trigram top match.
+No LLM is called. Run from backend/:
+
+    python -m benchmarks.bench_candidate_prefilter
+"""
+import re
+
+from app.config import settings
+from app.services import product_catalog
+from app.services.inventory_matcher import InventoryMatcher
+from app.services.product_catalog import CandidateIndex
+
+from .common import Timer
+
+
+BASE_PRODUCTS = [
+    "All-Purpose Flour", "Bread Flour", "Granulated Sugar", "Brown Sugar", "Powdered Sugar",
+    "Baking Powder", "Baking Soda", "Salt", "Black Pepper", "Olive Oil",
+    "Vegetable Oil", "Sesame Oil", "Butter", "Milk", "Heavy Cream",
+    "Sour Cream", "Greek Yogurt", "Cheddar Cheese", "Parmesan Cheese", "Mozzarella",
+    "Cream Cheese", "Eggs", "Chicken Breast", "Chicken Thighs", "Ground Beef",
+    "Bacon", "Pork Shoulder", "Salmon Fillet", "Shrimp", "Tofu",
+    "Garlic", "Yellow Onion", "Red Onion", "Shallots", "Ginger",
+    "Carrots", "Celery", "Potatoes", "Sweet Potatoes", "Tomatoes",
+    "Cherry Tomatoes", "Tomato Paste", "Canned Tomatoes", "Spinach", "Kale",
+    "Broccoli", "Cauliflower", "Zucchini", "Bell Pepper", "Jalapeno",
+    "Mushrooms", "Green Beans", "Peas", "Corn", "Avocado",
+    "Lemon", "Lime", "Orange", "Apple", "Banana",
+    "Blueberries", "Strawberries", "Raisins", "Walnuts", "Almonds",
+    "Peanut Butter", "Honey", "Maple Syrup", "Soy Sauce", "Fish Sauce",
+    "Rice Vinegar", "Balsamic Vinegar", "Dijon Mustard", "Mayonnaise", "Ketchup",
+    "Chicken Stock", "Vegetable Stock", "Coconut Milk", "Basmati Rice", "Jasmine Rice",
+    "Spaghetti", "Penne", "Egg Noodles", "Rolled Oats", "Quinoa",
+    "Black Beans", "Chickpeas", "Lentils", "Cumin", "Paprika",
+    "Chili Flakes", "Cinnamon", "Nutmeg", "Oregano", "Thyme",
+    "Rosemary", "Basil", "Cilantro", "Parsley", "Vanilla Extract",
+]
+
+VARIANTS = [
+    "Organic {}", "Frozen {}", "{} Family Pack", "Store Brand {}", "Premium {}",
+    "{} Value Size", "Imported {}", "{} (Bulk)", "Fresh {}", "Reduced Sodium {}",
+    "{} Refill", "Local {}", "{} Multipack", "Gourmet {}", "{} Travel Size",
+    "Fair Trade {}", "{} Club Size", "Budget {}", "{} Deluxe",
+]
+
+# Recipe lines with the catalog product each should match
+RECIPE = [
+    ("2 cups all-purpose flour, sifted", "All-Purpose Flour"),
+    ("1 tsp baking soda", "Baking Soda"),
+    ("1 tsp baking powder", "Baking Powder"),
+    ("1/2 tsp kosher salt", "Salt"),
+    ("3/4 cup packed brown sugar", "Brown Sugar"),
+    ("1/2 cup unsalted butter", "Butter"),
+    ("2 large eggs", "Eggs"),
+    ("1 cup whole milk", "Milk"),
+    ("1/2 cup heavy cream", "Heavy Cream"),
+    ("1 cup shredded cheddar", "Cheddar Cheese"),
+    ("1/4 cup grated parmesan", "Parmesan Cheese"),
+    ("500 g chicken thighs, boneless", "Chicken Thighs"),
+    ("4 slices bacon", "Bacon"),
+    ("4 cloves garlic, minced", "Garlic"),
+    ("1 yellow onion, diced", "Yellow Onion"),
+    ("2 shallots", "Shallots"),
+    ("1 tbsp grated ginger", "Ginger"),
+    ("2 carrots, peeled", "Carrots"),
+    ("2 stalks celery", "Celery"),
+    ("3 potatoes, cubed", "Potatoes"),
+    ("1 can chopped tomatoes", "Canned Tomatoes"),
+    ("2 tbsp tomato paste", "Tomato Paste"),
+    ("2 handfuls baby spinach", "Spinach"),
+    ("1 red bell pepper", "Bell Pepper"),
+    ("200 g mushrooms, sliced", "Mushrooms"),
+    ("1 cup frozen peas", "Peas"),
+    ("juice of 1 lemon", "Lemon"),
+    ("2 tbsp honey", "Honey"),
+    ("3 tbsp soy sauce", "Soy Sauce"),
+    ("1 tbsp dijon mustard", "Dijon Mustard"),
+    ("1 l chicken stock", "Chicken Stock"),
+    ("1 can coconut milk", "Coconut Milk"),
+    ("1 cup basmati rice", "Basmati Rice"),
+    ("1 can chickpeas, drained", "Chickpeas"),
+    ("1 tsp ground cumin", "Cumin"),
+    ("1 tsp smoked paprika", "Paprika"),
+    ("1/2 tsp chili flakes", "Chili Flakes"),
+    ("a few sprigs of thyme", "Thyme"),
+    ("handful of fresh cilantro", "Cilantro"),
+    ("2 tbsp EVOO", "Olive Oil"),
+]
+
+
+def fixture_catalog():
+    names = BASE_PRODUCTS + [variant.format(base) for variant in VARIANTS for base in BASE_PRODUCTS]
+    return [{"id": i, "name": name} for i, name in enumerate(names, start=1)]
+
+
+def build_prompt(matcher: InventoryMatcher, recipe_text: str, products, per_line: int) -> tuple:
+    """Build the recipe-extraction prompt; returns (prompt, seconds)"""
+    settings.llm_candidates_per_line = per_line
+    with Timer() as timer:
+        prompt = matcher.build_recipe_extraction_prompt(recipe_text, products, {"available_items": []})
+    return prompt, timer.elapsed
+
+
+def listed_products(prompt: str) -> int:
+    return len(re.findall(r"^- ID: ", prompt, flags=re.MULTILINE))
+
+
+def main(per_line: int):
+    products = fixture_catalog()
+    gold_ids = {product["name"]: product["id"] for product in products}
+    recipe_text = "# Weeknight Pantry Bake\n\n## Ingredients\n" + "\n".join(f"- {line}" for line, _ in RECIPE)
+    matcher = InventoryMatcher("http://llm.bench", "", "bench-model")
+    configured = settings.llm_candidates_per_line
+
+    try:
+        full_prompt, full_time = build_prompt(matcher, recipe_text, products, 0)
+        product_catalog._candidate_index = None
+        _, cold_time = build_prompt(matcher, recipe_text, products, per_line)
+        filtered_prompt, filtered_time = build_prompt(matcher, recipe_text, products, per_line)
+    finally:
+        settings.llm_candidates_per_line = configured
+
+    index = CandidateIndex(products)
+    recalled = []
+    top1 = 0
+    for line, gold in RECIPE:
+        candidate_ids = {products[i]["id"] for i in index.top(line, per_line)}
+        if gold_ids[gold] in candidate_ids:
+            recalled.append(line)
+        top = index.top(line, 1)
+        top1 += bool(top) and products[top[0]]["id"] == gold_ids[gold]
+    missed = [line for line, _ in RECIPE if line not in recalled]
+
+    print(f"{len(products):,}-product catalog, {len(RECIPE)}-ingredient recipe, {per_line} candidates per line")
+    for name, prompt, elapsed in (
+        ("full list", full_prompt, full_time),
+        ("pre-filtered", filtered_prompt, filtered_time),
+    ):
+        print(
+            f"   {name:<13} {listed_products(prompt):>5,} products   "
+            f"~{len(prompt) // 4:>6,} tokens   {elapsed * 1000:6.1f} ms to build"
+        )
+    print(f"   First pre-filtered build (index built): {cold_time * 1000:.1f} ms")
+    print(f"   Gold product among candidates: {len(recalled)}/{len(RECIPE)}"
+          + (f" (missed: {', '.join(missed)})" if missed else ""))
+    print(f"   Trigram top match is the gold product: {top1}/{len(RECIPE)}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--per-line", type=int, default=5, help="Candidates per input line")
+    args = parser.parse_args()
+
+    main(args.per_line)
@@ -0,0 +1,141 @@
+"""
+Benchmark pooled SQLite connections against connect-per-call
+
+Simulates history page views (settings read, one 50-row page, total
+count) while a writer keeps inserting recipes, once with the pooled WAL
+Database and once with a connection opened for every call on a
+rollback-journal copy of the same file, as Database worked before
+pooling. Run from backend/:
+
+    python -m benchmarks.bench_database_pool
+"""
+import asyncio
+import shutil
+import sqlite3
+import tempfile
+from contextlib import asynccontextmanager, closing
+from pathlib import Path
+
+import aiosqlite
+
+from app.database import Database
+
+from .common import Timer, seed_recipes
+
+
+class ConnectPerCallDatabase(Database):
+    """Database with a new default-pragma connection for every call"""
+
+    async def _connect_once(self) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.db_path)
+        conn.row_factory = aiosqlite.Row
+        await conn.create_function("recipe_inflate", 1, self._inflate, deterministic=True)
+        return conn
+
+    @asynccontextmanager
+    async def _read(self):
+        conn = await self._connect_once()
+        try:
+            yield conn
+        finally:
+            await conn.close()
+
+    @asynccontextmanager
+    async def _write(self):
+        conn = await self._connect_once()
+        try:
+            yield conn
+            await conn.commit()
+        finally:
+            await conn.close()
+
+
+async def page_view(database: Database):
+    await database.get_all_settings()
+    await database.get_recipes(limit=50, summary=True)
+    await database.count_recipes()
+
+
+async def run_workload(database: Database, views: int, concurrency: int, write_interval: float) -> dict:
+    """Serve views page views, concurrency at a time, alongside a steady writer"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    writes = 0
+    done = asyncio.Event()
+
+    async def timed_view():
+        async with semaphore:
+            with Timer() as timer:
+                await page_view(database)
+            latencies.append(timer.elapsed)
+
+    async def writer():
+        nonlocal writes
+        while not done.is_set():
+            await seed_recipes(database, 1, seed=writes)
+            writes += 1
+            await asyncio.sleep(write_interval)
+
+    writer_task = asyncio.create_task(writer())
+    try:
+        with Timer() as total:
+            await asyncio.gather(*(timed_view() for _ in range(views)))
+    finally:
+        done.set()
+        await writer_task
+
+    latencies.sort()
+    return {
+        "throughput": views / total.elapsed,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p95": latencies[int(len(latencies) * 0.95)] * 1000,
+        "writes": writes,
+    }
+
+
+async def main(recipes: int, views: int, concurrency: int, write_interval: float):
+    with tempfile.TemporaryDirectory() as tmp:
+        pooled_path = str(Path(tmp) / "pooled.db")
+        database = Database(pooled_path)
+        await database.init_db()
+        await seed_recipes(database, recipes)
+        await database.close()
+
+        # Same data, but in the rollback journal mode the old code ran in
+        per_call_path = str(Path(tmp) / "per_call.db")
+        shutil.copy(pooled_path, per_call_path)
+        with closing(sqlite3.connect(per_call_path)) as conn:
+            conn.execute("PRAGMA journal_mode = DELETE")
+
+        results = {}
+        for name, database in (
+            ("connect-per-call", ConnectPerCallDatabase(per_call_path)),
+            ("pooled (WAL)", Database(pooled_path)),
+        ):
+            try:
+                await page_view(database)  # warm up
+                results[name] = await run_workload(database, views, concurrency, write_interval)
+            finally:
+                await database.close()
+
+    print(f"{views} page views, {concurrency} concurrent, {recipes} recipes, writer every {write_interval * 1000:.0f} ms")
+    for name, result in results.items():
+        print(
+            f"   {name:<17} {result['throughput']:8.1f} views/s   "
+            f"p50 {result['p50']:6.2f} ms   p95 {result['p95']:6.2f} ms   "
+            f"({result['writes']} writes)"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=500, help="Recipes in the history")
+    parser.add_argument("--views", type=int, default=300, help="Page views to serve")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent page views")
+    parser.add_argument("--write-interval", type=float, default=0.005,
+                        help="Seconds between the writer's inserts")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.recipes, args.views, args.concurrency, args.write_interval))
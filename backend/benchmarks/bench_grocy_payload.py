@@ -0,0 +1,157 @@
+"""
+Benchmark Grocy payload sizes with server-side filtering and projection
+
+Serves a synthetic catalog (5,000 products by default, every product in
+stock, rows shaped like Grocy's) through an httpx mock transport that
+implements Grocy's query[] conditions. Compares the full /api/stock
+download with stock filtered to the products a request needs, and the
+full stock and product rows with the trimmed rows the stock mirror keeps.
+Times are client-side (transfer and JSON parsing). Run from backend/:
+
+    python -m benchmarks.bench_grocy_payload
+"""
+import asyncio
+import json
+import re
+
+import httpx
+
+from app.services import grocy_client
+from app.services.grocy_client import GrocyClient, project
+from app.services.stock_mirror import PRODUCT_FIELDS, STOCK_FIELDS
+
+from .common import INGREDIENTS, Timer
+
+
+GROCY_URL = "http://grocy.bench"
+
+
+def synthetic_product(product_id: int) -> dict:
+    """A product row with the columns Grocy returns from /api/objects/products"""
+    name = f"{INGREDIENTS[product_id % len(INGREDIENTS)].title()} {product_id}"
+    return {
+        "id": product_id, "name": name, "description": f"<p>{name}, bought weekly</p>",
+        "product_group_id": 1 + product_id % 12, "active": 1, "location_id": 1 + product_id % 4,
+        "shopping_location_id": None, "qu_id_purchase": 1, "qu_id_stock": 1,
+        "qu_id_consume": 1, "qu_id_price": 1, "min_stock_amount": 0,
+        "default_best_before_days": 7, "default_best_before_days_after_open": 0,
+        "default_best_before_days_after_freezing": 0, "default_best_before_days_after_thawing": 0,
+        "picture_file_name": None, "enable_tare_weight_handling": 0, "tare_weight": 0,
+        "not_check_stock_fulfillment_for_recipes": 0, "parent_product_id": None,
+        "calories": 120, "cumulate_min_stock_amount_of_sub_products": 0, "due_type": 1,
+        "quick_consume_amount": 1, "quick_open_amount": 1, "hide_on_stock_overview": 0,
+        "default_stock_label_type": 0, "should_not_be_frozen": 0,
+        "treat_opened_as_out_of_stock": 1, "no_own_stock": 0,
+        "default_consume_location_id": None, "move_on_open": 0,
+        "auto_reprint_stock_label": 0, "row_created_timestamp": "2025-03-01 12:00:00",
+        "userfields": None,
+    }
+
+
+def synthetic_stock_row(product: dict) -> dict:
+    """A /api/stock row, which embeds the full product and its stock unit"""
+    return {
+        "product_id": product["id"], "amount": 3, "amount_aggregated": 3, "value": 4.5,
+        "best_before_date": "2026-11-02", "amount_opened": 0, "amount_opened_aggregated": 0,
+        "is_aggregated_amount": 0, "due_type": 1,
+        "product": product,
+        "quantity_unit_stock": {
+            "id": 1, "name": "Piece", "name_plural": "Pieces", "description": None,
+            "row_created_timestamp": "2025-03-01 12:00:00", "userfields": None,
+        },
+    }
+
+
+def matches(row: dict, condition: str) -> bool:
+    """Evaluate one Grocy query[] condition ("field=value" or "field§regex")"""
+    field, operator, value = re.match(r"([a-z_]+)(=|§)(.*)", condition).groups()
+    if operator == "=":
+        return str(row.get(field)) == value
+    return re.search(value, str(row.get(field))) is not None
+
+
+def grocy_stand_in(products: list, stock: list, served: list) -> httpx.MockTransport:
+    """Mock Grocy; appends the seconds spent serving each request to served"""
+    bodies = {
+        "/api/objects/products": json.dumps(products).encode(),
+        "/api/stock": json.dumps(stock).encode(),
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with Timer() as timer:
+            response = respond(request)
+        served.append(timer.elapsed)
+        return response
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        conditions = request.url.params.get_list("query[]")
+        path = request.url.path
+        if not conditions:
+            return httpx.Response(200, content=bodies[path], headers={"Content-Type": "application/json"})
+        rows = products if path == "/api/objects/products" else stock
+        return httpx.Response(200, json=[row for row in rows if all(matches(row, c) for c in conditions)])
+
+    return httpx.MockTransport(handler)
+
+
+async def fetch(client: GrocyClient, received: list, served: list, **kwargs) -> dict:
+    """
+    Fetch stock once and report the bytes received and the client-side time
+
+    The stand-in's own serving time (Grocy's work) is left out.
+    """
+    received.clear()
+    served.clear()
+    with Timer() as timer:
+        rows = await client.get_stock(**kwargs)
+    return {"rows": len(rows), "bytes": sum(received), "ms": (timer.elapsed - sum(served)) * 1000}
+
+
+async def main(products_count: int, requested: int):
+    products = [synthetic_product(i) for i in range(1, products_count + 1)]
+    stock = [synthetic_stock_row(product) for product in products]
+
+    received = []
+    served = []
+
+    async def count_bytes(response: httpx.Response):
+        await response.aread()
+        received.append(len(response.content))
+
+    http_client = httpx.AsyncClient(
+        transport=grocy_stand_in(products, stock, served), event_hooks={"response": [count_bytes]}
+    )
+    grocy_client.grocy_pool.get = lambda base_url, api_key: http_client
+    client = GrocyClient(GROCY_URL, "bench-key")
+
+    try:
+        product_ids = range(1, products_count + 1, products_count // requested)[:requested]
+        await client.get_stock(product_ids=product_ids)  # warm up
+        full = await fetch(client, received, served)
+        filtered = await fetch(client, received, served, product_ids=product_ids)
+    finally:
+        await http_client.aclose()
+
+    mirror_full = len(json.dumps(stock)) + len(json.dumps(products))
+    mirror_trimmed = (
+        len(json.dumps(project(stock, STOCK_FIELDS))) + len(json.dumps(project(products, PRODUCT_FIELDS)))
+    )
+
+    print(f"Synthetic catalog: {products_count:,} products, all in stock")
+    print(f"   Full /api/stock:      {full['bytes']:>12,} bytes  {full['ms']:8.1f} ms  ({full['rows']:,} rows)")
+    print(f"   Stock for {requested} products: {filtered['bytes']:>12,} bytes  {filtered['ms']:8.1f} ms  ({filtered['rows']} rows)")
+    print(
+        f"   Mirror rows:          {mirror_full:>12,} → {mirror_trimmed:,} bytes "
+        f"({mirror_trimmed / mirror_full:.1%})"
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=5000, help="Products in the synthetic catalog")
+    parser.add_argument("--requested", type=int, default=3, help="Products a filtered request asks for")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.products, args.requested))
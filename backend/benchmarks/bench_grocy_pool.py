@@ -0,0 +1,98 @@
+"""
+Benchmark the pooled Grocy HTTP client against a client per call
+
+Starts a local Grocy stand-in (uvicorn on 127.0.0.1) and issues
+sequential get_stock() calls, once through the shared keep-alive pool and
+once with a new httpx.AsyncClient opened and closed around every call, as
+GrocyClient worked before pooling. The stand-in is plain HTTP on
+loopback, so TLS setup, which the pool also saves, isn't included.
+Run from backend/:
+
+    python -m benchmarks.bench_grocy_pool
+"""
+import asyncio
+import socket
+import threading
+import time
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from app.services.grocy_client import GrocyClient, grocy_pool
+
+from .common import Timer
+
+
+def grocy_stand_in(stock_rows: int) -> FastAPI:
+    app = FastAPI()
+    stock = [
+        {"product_id": i, "amount": 2, "quantity_unit_stock": {"id": 1, "name": "Piece"}}
+        for i in range(1, stock_rows + 1)
+    ]
+
+    @app.get("/api/stock")
+    async def get_stock():
+        return stock
+
+    return app
+
+
+class ClientPerCallGrocyClient(GrocyClient):
+    """GrocyClient that opens a new HTTP client for every request"""
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._call_client
+
+    async def _request(self, method, path, json=None):
+        async with httpx.AsyncClient() as client:
+            self._call_client = client
+            return await super()._request(method, path, json=json)
+
+
+def start_server(app: FastAPI) -> tuple:
+    """Serve app on a free loopback port in a background thread"""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, thread, f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+async def measure(client: GrocyClient, calls: int) -> float:
+    """Average get_stock() latency in milliseconds"""
+    await client.get_stock()  # warm up
+    with Timer() as timer:
+        for _ in range(calls):
+            await client.get_stock()
+    return timer.elapsed * 1000 / calls
+
+
+async def main(calls: int, stock_rows: int):
+    server, thread, url = start_server(grocy_stand_in(stock_rows))
+    try:
+        per_call = await measure(ClientPerCallGrocyClient(url, "bench-key"), calls)
+        pooled = await measure(GrocyClient(url, "bench-key"), calls)
+        await grocy_pool.close()
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    print(f"{calls} sequential get_stock() calls, {stock_rows} stock rows, local stand-in")
+    print(f"   client per call {per_call:7.2f} ms/call")
+    print(f"   pooled client   {pooled:7.2f} ms/call   ({per_call - pooled:.2f} ms saved per call)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=300, help="get_stock() calls per client")
+    parser.add_argument("--stock-rows", type=int, default=20, help="Stock rows the stand-in returns")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.calls, args.stock_rows))
@@ -0,0 +1,73 @@
+"""
+Benchmark the history summary projection against full rows
+
+Loads 50-row history pages from a generated history with realistic
+recipe bodies and 200-item inventory snapshots, once selecting full rows
+(recipe_text plus the attached snapshot) and once with summary=True.
+Reports latency, peak Python allocation and the JSON size of a page.
+Run from backend/:
+
+    python -m benchmarks.bench_history_summary
+"""
+import asyncio
+import json
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from app.database import Database
+
+from .common import Timer, seed_recipes
+
+
+async def measure(database: Database, summary: bool, pages: int, page_size: int) -> dict:
+    """Average latency and peak allocation for loading history pages"""
+    with Timer() as timer:
+        for page in range(pages):
+            await database.get_recipes(limit=page_size, offset=page * page_size, summary=summary)
+
+    tracemalloc.start()
+    rows = await database.get_recipes(limit=page_size, summary=summary)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "latency": timer.elapsed * 1000 / pages,
+        "peak": peak,
+        "json": len(json.dumps(rows, default=str)),
+    }
+
+
+async def main(recipes: int, snapshot_items: int, body_size: int, page_size: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(str(Path(tmp) / "history.db"))
+        try:
+            await database.init_db()
+            await seed_recipes(database, recipes, body_size=body_size, snapshot_items=snapshot_items)
+            pages = recipes // page_size
+
+            await database.get_recipes(limit=page_size)  # warm up
+            full = await measure(database, False, pages, page_size)
+            summary = await measure(database, True, pages, page_size)
+        finally:
+            await database.close()
+
+    print(f"{recipes} recipes, {body_size:,}-char bodies, {snapshot_items}-item snapshots, {page_size} rows per page")
+    for name, result in (("full rows", full), ("summary", summary)):
+        print(
+            f"   {name:<10} {result['latency']:7.2f} ms/page   "
+            f"peak {result['peak'] / 2**20:6.2f} MiB   page JSON {result['json']:>10,} bytes"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=500, help="Recipes in the history")
+    parser.add_argument("--snapshot-items", type=int, default=200, help="Items per inventory snapshot")
+    parser.add_argument("--body-size", type=int, default=4000, help="Characters per recipe body")
+    parser.add_argument("--page-size", type=int, default=50, help="Rows per history page")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.recipes, args.snapshot_items, args.body_size, args.page_size))
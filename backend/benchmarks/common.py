@@ -0,0 +1,84 @@
+import random
+import time
+from typing import Any, Dict, List
+
+from app.database import Database
+
+
+CUISINES = ["Mexican", "Thai", "Italian", "Indian", "French", "American"]
+
+INGREDIENTS = [
+    "garlic", "onion", "olive oil", "butter", "flour", "eggs", "milk", "rice",
+    "chicken thighs", "lentils", "tomatoes", "spinach", "lemon", "ginger",
+    "coconut milk", "potatoes", "carrots", "cumin", "paprika", "basil",
+]
+
+
+def recipe_text(rng: random.Random, body_size: int = 4000) -> str:
+    """A markdown recipe of roughly body_size characters"""
+    lines = [f"# {rng.choice(CUISINES)} {rng.choice(INGREDIENTS).title()} Bowl", "", "## Ingredients"]
+    lines += [f"- {rng.randint(1, 500)} g {rng.choice(INGREDIENTS)}" for _ in range(12)]
+    lines += ["", "## Instructions"]
+    step = 1
+    while sum(len(line) + 1 for line in lines) < body_size:
+        lines.append(
+            f"{step}. Cook the {rng.choice(INGREDIENTS)} with the {rng.choice(INGREDIENTS)} "
+            f"for {rng.randint(2, 20)} minutes, stirring now and then."
+        )
+        step += 1
+    return "\n".join(lines)
+
+
+def inventory_snapshot(rng: random.Random, items: int = 200) -> Dict[str, Any]:
+    """An inventory snapshot shaped like GrocyClient.format_inventory_for_llm()"""
+    available = [
+        {
+            "name": f"{rng.choice(INGREDIENTS).title()} {i}",
+            "amount": rng.randint(1, 12),
+            "unit": "Piece",
+            "product_id": i,
+        }
+        for i in range(items)
+    ]
+    expiring = [
+        {**item, "expiry_date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}
+        for item in available[:10]
+    ]
+    return {"available_items": available, "expiring_soon": expiring}
+
+
+async def seed_recipes(
+    database: Database,
+    count: int,
+    body_size: int = 4000,
+    snapshot_items: int = 0,
+    seed: int = 1
+) -> List[int]:
+    """Insert count generated recipes and return their IDs"""
+    rng = random.Random(seed)
+    recipe_ids = []
+    for _ in range(count):
+        recipe = {
+            "recipe_text": recipe_text(rng, body_size),
+            "cuisine": rng.choice(CUISINES),
+            "time_minutes": rng.choice([15, 30, 45, 60]),
+            "effort_level": rng.choice(["Low", "Medium", "High"]),
+            "used_external_ingredients": False,
+            "prioritize_expiring": False,
+        }
+        if snapshot_items:
+            recipe["grocy_inventory_snapshot"] = inventory_snapshot(rng, snapshot_items)
+        recipe_ids.append(await database.create_recipe(recipe))
+    return recipe_ids
+
+
+class Timer:
+    """Wall-clock timer for a with-block; elapsed is in seconds"""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.start
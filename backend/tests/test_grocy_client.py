@@ -0,0 +1,91 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services import grocy_client
+from app.services.grocy_client import GrocyClient, GrocyUnavailableError
+
+
+GROCY_URL = "http://grocy.test"
+
+
+@pytest.fixture
+def failing_grocy(monkeypatch):
+    """Grocy that answers every request with 503; returns the list of requests"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(503)
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(grocy_client.grocy_pool, "get", lambda base_url, api_key: http_client)
+    monkeypatch.setattr(grocy_client, "_inflight", {})
+    monkeypatch.setattr(grocy_client, "_breakers", {})
+    monkeypatch.setattr(settings, "grocy_retry_attempts", 2)
+    monkeypatch.setattr(settings, "grocy_retry_backoff", 0)
+    monkeypatch.setattr(settings, "grocy_breaker_failure_threshold", 3)
+    return requests
+
+
+def test_retried_request_counts_as_one_breaker_failure(failing_grocy):
+    client = GrocyClient(GROCY_URL, "test-key")
+
+    async def get_stock_once():
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_stock()
+
+    asyncio.run(get_stock_once())
+
+    assert len(failing_grocy) == 3
+    assert grocy_client.get_breaker(GROCY_URL).status()["consecutive_failures"] == 1
+    assert grocy_client.get_breaker(GROCY_URL).state == "closed"
+
+
+def test_breaker_opens_after_threshold_requests(failing_grocy):
+    client = GrocyClient(GROCY_URL, "test-key")
+
+    async def get_stock_until_open():
+        for _ in range(3):
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get_stock()
+        with pytest.raises(GrocyUnavailableError):
+            await client.get_stock()
+
+    asyncio.run(get_stock_until_open())
+
+    assert len(failing_grocy) == 9
+    assert grocy_client.get_breaker(GROCY_URL).state == "open"
+
+
+def test_stock_writes_keep_master_data_cached(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.url.path == "/api/objects/products":
+            return httpx.Response(200, json=[{"id": 1, "name": "Milk"}])
+        return httpx.Response(200, json={})
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(grocy_client.grocy_pool, "get", lambda base_url, api_key: http_client)
+    monkeypatch.setattr(grocy_client, "_inflight", {})
+    monkeypatch.setattr(grocy_client, "_breakers", {})
+    monkeypatch.setattr(grocy_client, "_master_data_caches", {})
+    client = GrocyClient(GROCY_URL, "test-key")
+
+    async def purchase_and_consume():
+        await client.get_products()
+        stock_generation = client.cache.stock_generation
+        await client.purchase_product(1, 2)
+        await client.consume_product(1, 1)
+        await client.get_products()
+        return stock_generation
+
+    stock_generation = asyncio.run(purchase_and_consume())
+
+    assert len([r for r in requests if r.url.path == "/api/objects/products"]) == 1
+    # The stock mirror still sees both writes
+    assert client.cache.stock_generation == stock_generation + 2
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.database import Database
+from app.routers import history
+
+
+RECIPES = [
+    ("# Garlic Pasta\n\nBoil spaghetti, toss with garlic and olive oil.", "Italian"),
+    ("# Leek Soup\n\nSweat leeks and potatoes, then blend.", "French"),
+    ("# Fried Rice\n\nFry day-old rice with egg and scallions.", "Chinese"),
+]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = str(tmp_path / "elzar.db")
+
+    async def seed():
+        database = Database(path)
+        await database.init_db()
+        for text, cuisine in RECIPES:
+            await database.create_recipe({
+                "recipe_text": text,
+                "cuisine": cuisine,
+                "used_external_ingredients": False,
+                "prioritize_expiring": False,
+            })
+        await database.close()
+
+    asyncio.run(seed())
+    monkeypatch.setattr(history, "db", Database(path))
+
+    app = FastAPI()
+    app.include_router(history.router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_search_finds_matching_recipes(client):
+    response = client.get("/api/history/", params={"search_text": "garlic"})
+
+    assert response.status_code == 200
+    recipes = response.json()
+    assert [recipe["cuisine"] for recipe in recipes] == ["Italian"]
+    assert "<mark>garlic</mark>" in recipes[0]["search_snippet"]
+
+
+@pytest.mark.parametrize("search_text", ['"', '""', '" "', "!!!", "- * ?"])
+def test_search_without_words_is_ignored(client, search_text):
+    params = {"search_text": search_text}
+
+    listing = client.get("/api/history/", params=params)
+    page = client.get("/api/history/page", params=params)
+    count = client.get("/api/history/count", params=params)
+
+    assert listing.status_code == 200
+    assert page.status_code == 200
+    assert count.status_code == 200
+    assert len(listing.json()) == len(RECIPES)
+    assert len(page.json()["recipes"]) == len(RECIPES)
+    assert count.json()["count"] == len(RECIPES)
@@ -0,0 +1,35 @@
+import asyncio
+
+import httpx
+
+from app.services.http_pool import KeyedClientPool
+
+
+def test_client_is_shared_until_the_key_changes():
+    async def run():
+        pool = KeyedClientPool(httpx.AsyncClient, retire_delay=0.01)
+        first = pool.get("http://a.test", "key")
+        assert pool.get("http://a.test", "key") is first
+
+        second = pool.get("http://b.test", "key")
+        assert second is not first
+        assert not first.is_closed  # Still serving in-flight requests
+
+        await asyncio.sleep(0.05)
+        assert first.is_closed
+        await pool.close()
+        assert second.is_closed
+
+    asyncio.run(run())
+
+
+def test_close_also_closes_retiring_clients():
+    async def run():
+        pool = KeyedClientPool(httpx.AsyncClient, retire_delay=60)
+        first = pool.get("http://a.test")
+        pool.get("http://b.test")
+
+        await pool.close()
+        assert first.is_closed
+
+    asyncio.run(run())
@@ -0,0 +1,166 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import main
+from app.routers import inventory
+from app.services import grocy_client, product_catalog
+
+
+GROCY_URL = "http://grocy.test"
+
+PRODUCTS = [
+    {"id": 1, "name": "Milk", "location_id": 1, "qu_id_stock": 1},
+    {"id": 2, "name": "Eggs", "location_id": 1, "qu_id_stock": 1},
+    {"id": 3, "name": "Flour", "location_id": 1, "qu_id_stock": 1},
+    {"id": 4, "name": "Butter", "location_id": 1, "qu_id_stock": 1},
+]
+
+
+class FakeGrocy:
+    """
+    Grocy stand-in served through httpx.MockTransport
+
+    Records every request so tests can count calls per endpoint.
+    """
+
+    def __init__(self, stock: List[Dict[str, Any]]):
+        self.stock = stock
+        self.requests: List[httpx.Request] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path == "/api/objects/products":
+            return httpx.Response(200, json=PRODUCTS)
+        if path == "/api/objects/quantity_units":
+            return httpx.Response(200, json=[{"id": 1, "name": "Piece", "name_plural": "Pieces"}])
+        if path == "/api/objects/locations":
+            return httpx.Response(200, json=[{"id": 1, "name": "Fridge"}])
+        if path == "/api/system/db-changed-time":
+            return httpx.Response(200, json={"changed_time": "2026-01-01 00:00:00"})
+        if path == "/api/stock":
+            return httpx.Response(200, json=self.stock)
+        if path == "/api/stock/shoppinglist/add-product":
+            return httpx.Response(204)
+        return httpx.Response(404, json={"error_message": f"Unexpected {path}"})
+
+    def calls(self, path: str) -> List[httpx.Request]:
+        return [request for request in self.requests if request.url.path == path]
+
+
+@pytest.fixture
+def grocy(monkeypatch):
+    fake = FakeGrocy(stock=[{"product_id": 2, "amount": 12}])
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    monkeypatch.setattr(grocy_client.grocy_pool, "get", lambda base_url, api_key: http_client)
+
+    # Module-level caches would otherwise leak between tests
+    monkeypatch.setattr(grocy_client, "_inflight", {})
+    monkeypatch.setattr(grocy_client, "_breakers", {})
+    monkeypatch.setattr(grocy_client, "_master_data_caches", {})
+    monkeypatch.setattr(product_catalog, "_catalogs", {})
+
+    async def effective_config():
+        return {"grocy_url": GROCY_URL, "grocy_api_key": "test-key"}
+
+    monkeypatch.setattr(inventory, "get_effective_config", effective_config)
+    return fake
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(inventory.router)
+    return TestClient(app)
+
+
+def _item(product_id, name, amount, **extra):
+    return {
+        "product_id": product_id,
+        "product_name": name,
+        "amount": amount,
+        "unit": "piece",
+        "action": "purchase",
+        **extra,
+    }
+
+
+def test_add_to_shopping_list_fetches_stock_once(client, grocy):
+    items = [_item(1, "Milk", 1), _item(2, "Eggs", 6), _item(3, "Flour", 1), _item(4, "Butter", 2)]
+
+    response = client.post("/api/inventory/add-to-shopping-list", json={"items": items})
+
+    assert response.status_code == 200
+    stock_calls = grocy.calls("/api/stock")
+    assert len(stock_calls) == 1
+    # Only the requested products' stock is asked for
+    assert stock_calls[0].url.params["query[]"] == "product_id§^(1|2|3|4)$"
+
+    result = response.json()
+    assert [entry["product_name"] for entry in result["success"]] == ["Milk", "Flour", "Butter"]
+    assert [entry["item"] for entry in result["failed"]] == ["Eggs"]
+
+    added = [json.loads(request.content)["product_id"]
+             for request in grocy.calls("/api/stock/shoppinglist/add-product")]
+    assert sorted(added) == [1, 3, 4]
+
+
+def test_add_to_shopping_list_fetches_full_stock_when_creating(client, grocy, monkeypatch):
+    async def create_product(self, name, location_id, qu_id_stock, **kwargs):
+        return {"created_object_id": 5}
+
+    monkeypatch.setattr(grocy_client.GrocyClient, "create_product", create_product)
+    items = [_item(1, "Milk", 1), _item(None, "Cream", 1, create_if_missing=True)]
+
+    response = client.post("/api/inventory/add-to-shopping-list", json={"items": items})
+
+    assert response.status_code == 200
+    stock_calls = grocy.calls("/api/stock")
+    assert len(stock_calls) == 1
+    assert "query[]" not in stock_calls[0].url.params
+    assert response.json()["created_products"] == [{"name": "Cream", "id": 5}]
+
+
+def test_grocy_unavailable_is_reported_as_503(grocy):
+    breaker = grocy_client.get_breaker(GROCY_URL)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    response = TestClient(main.app).post(
+        "/api/inventory/add-to-shopping-list", json={"items": [_item(1, "Milk", 1)]}
+    )
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert grocy.requests == []
+
+
+def test_add_to_shopping_list_creates_products_concurrently_in_request_order(client, grocy, monkeypatch):
+    names = ["Cream", "Basil", "Leeks"]
+    running = []
+    overlap = []
+
+    async def create_product(self, name, location_id, qu_id_stock, **kwargs):
+        running.append(name)
+        overlap.append(len(running))
+        # Earlier items finish last
+        await asyncio.sleep(0.01 * (len(names) - names.index(name)))
+        running.remove(name)
+        return {"created_object_id": 10 + names.index(name)}
+
+    monkeypatch.setattr(grocy_client.GrocyClient, "create_product", create_product)
+    items = [_item(None, name, 1, create_if_missing=True) for name in names]
+
+    response = client.post("/api/inventory/add-to-shopping-list", json={"items": items})
+
+    assert response.status_code == 200
+    assert max(overlap) == len(names)
+    result = response.json()
+    assert result["created_products"] == [{"name": name, "id": 10 + i} for i, name in enumerate(names)]
+    assert [entry["product_name"] for entry in result["success"]] == names
@@ -0,0 +1,37 @@
+import pytest
+
+from app.services.local_matcher import match_locally
+from app.services.product_catalog import ProductCatalog
+
+
+def _catalog(*names):
+    products = [{"id": i, "name": name, "location_id": 1} for i, name in enumerate(names, 1)]
+    return ProductCatalog(products, [{"id": 1, "name": "Piece"}], [{"id": 1, "name": "Pantry"}])
+
+
+@pytest.mark.parametrize("line, name, quantity, unit", [
+    ("1 lb ground beef", "Ground Beef", 453.6, "g"),
+    ("2 pounds ground beef", "Ground Beef", 907.2, "g"),
+    ("500g flour", "Flour", 500, "g"),
+    ("2 cans of tomatoes", "Tomatoes", 2, "can"),
+    ("3 x eggs", "Eggs", 3, "count"),
+    ("pound cake", "Pound Cake", 1, "count"),
+])
+def test_resolves_unambiguous_lines(line, name, quantity, unit):
+    catalog = _catalog("Ground Beef", "Flour", "Tomatoes", "Eggs", "Pound Cake")
+
+    items, unresolved = match_locally(line, catalog)
+
+    assert unresolved == []
+    assert [(item["item_name"], item["quantity"], item["unit"]) for item in items] == [
+        (name, quantity, unit)
+    ]
+
+
+@pytest.mark.parametrize("products", [("Cake",), ("Cake", "Pound Cake")])
+def test_leaves_unit_word_that_may_be_a_name_to_llm(products):
+    items, unresolved = match_locally("1 pound cake", _catalog(*products))
+
+    assert items == []
+    assert unresolved == ["1 pound cake"]
+
@@ -0,0 +1,95 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.database import Database
+
+
+TEXTS = [
+    "# Garlic Pasta\n\nBoil spaghetti, toss with garlic and olive oil.",
+    "# Leek Soup\n\nSweat leeks and potatoes, then blend.",
+    "# Garlic Bread\n\nSpread garlic butter on a baguette and bake.",
+]
+
+
+def _recipe(text):
+    return {"recipe_text": text, "used_external_ingredients": False, "prioritize_expiring": False}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Database with TEXTS compressed by the migration plus one recipe stored compressed"""
+    path = str(tmp_path / "elzar.db")
+
+    async def build():
+        database = Database(path, compress_recipes=False)
+        await database.init_db()
+        for text in TEXTS:
+            await database.create_recipe(_recipe(text))
+        await database.train_compression_dictionary()
+        await database.compress_recipe_texts()
+        database.compress_recipes = True
+        await database.create_recipe(_recipe("# Zucchini Fritters\n\nGrate zucchini, fry in butter."))
+        await database.close()
+
+    asyncio.run(build())
+    return path
+
+
+def _run(path, operation):
+    async def run():
+        database = Database(path)
+        await database.init_db()
+        try:
+            return await operation(database)
+        finally:
+            await database.close()
+
+    return asyncio.run(run())
+
+
+def test_compressed_recipes_are_searchable_with_snippets(db_path):
+    async def search(database):
+        return await database.get_recipes(filters={"search_text": "garlic"}, summary=True)
+
+    rows = _run(db_path, search)
+
+    assert sorted(row["id"] for row in rows) == [1, 3]
+    assert all("<mark>garlic</mark>" in row["search_snippet"].lower() for row in rows)
+
+
+def test_deleting_compressed_recipes_removes_them_from_search(db_path):
+    async def delete_and_search(database):
+        await database.delete_recipe(4)
+        await database.cleanup_old_recipes(max_count=2)
+        return (
+            await database.count_recipes({"search_text": "zucchini"}),
+            await database.count_recipes({"search_text": "garlic"}),
+        )
+
+    assert _run(db_path, delete_and_search) == (0, 1)
+
+
+def test_recipe_text_is_not_stored_twice(db_path):
+    conn = sqlite3.connect(db_path)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    blobs = conn.execute("SELECT COUNT(*) FROM recipes WHERE recipe_blob IS NOT NULL").fetchone()[0]
+    conn.close()
+
+    assert "recipes_fts_content" not in tables
+    assert blobs == 4
+
+
+def test_plain_sqlite_clients_can_write_recipes(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO recipes (recipe_text) VALUES ('# Quinoa Salad')")
+    conn.execute("DELETE FROM recipes WHERE recipe_text = '# Quinoa Salad'")
+    conn.execute("DELETE FROM recipes WHERE id = 2")
+    conn.commit()
+    conn.close()
+
+    async def search(database):
+        return await database.count_recipes({"search_text": "quinoa"})
+
+    assert _run(db_path, search) == 0
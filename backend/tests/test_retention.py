@@ -0,0 +1,40 @@
+import asyncio
+
+from app.services import retention as retention_module
+from app.services.retention import RetentionService
+
+
+class FakeDatabase:
+    """Records which policies each cleanup applied"""
+
+    def __init__(self):
+        self.cleanups = []
+
+    async def count_recipes(self):
+        return 0
+
+    async def cleanup_old_recipes(self, max_count=None, max_age_days=None, batch_size=200):
+        self.cleanups.append(max_age_days)
+        return 0
+
+
+def test_frequent_wakeups_do_not_postpone_scheduled_runs(monkeypatch):
+    async def effective_config():
+        return {"max_recipe_history": 100, "max_recipe_age_days": 30}
+
+    monkeypatch.setattr(retention_module, "get_effective_config", effective_config)
+    database = FakeDatabase()
+    service = RetentionService(database, interval_seconds=0.2, batch_size=50)
+
+    async def generate_recipes():
+        service.start()
+        # A recipe every 50 ms, well inside the 200 ms interval
+        for _ in range(20):
+            await asyncio.sleep(0.05)
+            service.notify_recipe_created()
+        await service.stop()
+
+    asyncio.run(generate_recipes())
+
+    # The startup run plus at least three more over the second of wakeups
+    assert database.cleanups.count(30) >= 4
@@ -65,6 +65,11 @@ export const getRecipeHistory = async (params = {}) => {
   return response.data;
 };
 
+export const getRecipeHistoryPage = async (params = {}) => {
+  const response = await api.get('/api/history/page', { params });
+  return response.data;
+};
+
 export const deleteRecipe = async (recipeId) => {
   const response = await api.delete(`/api/history/${recipeId}`);
   return response.data;
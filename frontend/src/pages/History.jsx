@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import ReactMarkdown from 'react-markdown';
-import { getRecipeHistory, deleteRecipe, downloadRecipe } from '../api';
+import { getRecipeHistoryPage, getRecipe, deleteRecipe, downloadRecipe } from '../api';
 
 function History() {
   const [recipes, setRecipes] = useState([]);
@@ -14,8 +14,10 @@ function History() {
   const [maxTime, setMaxTime] = useState('');
   const [effortFilter, setEffortFilter] = useState('');
   
-  // Pagination
+  // Pagination: cursors[n] fetches page n (page 0 needs none)
   const [page, setPage] = useState(0);
+  const [cursors, setCursors] = useState([null]);
+  const [nextCursor, setNextCursor] = useState(null);
   const pageSize = 50;
 
   useEffect(() => {
@@ -27,17 +29,19 @@ function History() {
     try {
       const params = {
         limit: pageSize,
-        offset: page * pageSize,
       };
 
+      if (cursors[page]) params.cursor = cursors[page];
+
       if (searchText) params.search_text = searchText;
       if (cuisineFilter) params.cuisine = cuisineFilter;
       if (minTime) params.min_time = parseInt(minTime);
       if (maxTime) params.max_time = parseInt(maxTime);
       if (effortFilter) params.effort_level = effortFilter;
 
-      const data = await getRecipeHistory(params);
-      setRecipes(data);
+      const data = await getRecipeHistoryPage(params);
+      setRecipes(data.recipes);
+      setNextCursor(data.next_cursor);
     } catch (err) {
       console.error('Failed to load recipe history:', err);
       alert('Failed to load recipe history');
@@ -46,6 +50,17 @@ function History() {
     }
   };
 
+  const handleSelect = async (recipeId) => {
+    // History rows are summaries; load the full recipe for the detail view
+    try {
+      const recipe = await getRecipe(recipeId);
+      setSelectedRecipe(recipe);
+    } catch (err) {
+      console.error('Failed to load recipe:', err);
+      alert('Failed to load recipe');
+    }
+  };
+
   const handleDelete = async (recipeId) => {
     if (!confirm('Are you sure you want to delete this recipe?')) return;
 
@@ -78,6 +93,11 @@ function History() {
     }
   };
 
+  const goToNextPage = () => {
+    setCursors([...cursors.slice(0, page + 1), nextCursor]);
+    setPage(page + 1);
+  };
+
   const clearFilters = () => {
     setSearchText('');
     setCuisineFilter('');
@@ -212,7 +232,7 @@ function History() {
             {recipes.map((recipe) => (
               <div
                 key={recipe.id}
-                onClick={() => setSelectedRecipe(recipe)}
+                onClick={() => handleSelect(recipe.id)}
                 className={`p-3 rounded cursor-pointer transition-colors ${
                   selectedRecipe?.id === recipe.id
                     ? 'bg-elzar-red'
@@ -222,7 +242,7 @@ function History() {
                 <div className="flex justify-between items-start">
                   <div className="flex-1">
                     <p className="font-medium text-sm line-clamp-2">
-                      {recipe.recipe_text.split('\n')[0].replace(/^#\s*/, '')}
+                      {recipe.recipe_preview.split('\n')[0].replace(/^#\s*/, '')}
                     </p>
                     <div className="flex flex-wrap gap-2 mt-2 text-xs text-gray-400">
                       {recipe.cuisine && (
@@ -251,7 +271,7 @@ function History() {
           </div>
 
           {/* Pagination */}
-          {recipes.length === pageSize && (
+          {(page > 0 || nextCursor) && (
             <div className="flex justify-between mt-4">
               <button
                 onClick={() => setPage(Math.max(0, page - 1))}
@@ -264,8 +284,9 @@ function History() {
                 Page {page + 1}
               </span>
               <button
-                onClick={() => setPage(page + 1)}
-                className="bg-gray-700 hover:bg-gray-600 text-white px-4 py-2 rounded text-sm transition-colors"
+                onClick={goToNextPage}
+                disabled={!nextCursor}
+                className="bg-gray-700 hover:bg-gray-600 disabled:bg-gray-800 disabled:text-gray-600 text-white px-4 py-2 rounded text-sm transition-colors"
               >
                 Next
               </button>